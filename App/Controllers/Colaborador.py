@@ -3,6 +3,7 @@ from datetime import datetime
 from flask import jsonify
 from ..Models import Usuario, Colaborador
 from .. import db
+from ..services.api_service import AuvoApiService
 
 
 class ColaboradorController:
@@ -52,17 +53,17 @@ class ColaboradorController:
         
         
         # URL da API de colaboradores
-        url = "https://api.auvo.com.br/v2/users/?pageSize=999999999"
+        url = AuvoApiService.build_url('users/?pageSize=999999999')
         
         # Headers da requisição
         headers = {
             'Content-Type': 'application/json',
-            'Authorization': f'Bearer {usuario.token_bearer}'
+            'Authorization': f'Bearer {token_validation["access_token"]}'
         }
         
         try:
             # Faz a requisição para a API
-            response = requests.get(url, headers=headers, timeout=30)
+            response = AuvoApiService.get(url, headers=headers, timeout=30)
             
             # Verifica se a resposta foi bem-sucedida
             if response.status_code == 200:
@@ -3,6 +3,8 @@ from datetime import datetime
 from flask import jsonify
 from ..Models import Usuario
 from .. import db
+from ..services.api_service import AuvoApiService
+from ..services.token_cache import TokenCacheService
 
 
 class AuthController:
@@ -30,7 +32,7 @@ class AuthController:
             }
         
         # URL da API de autenticação
-        url = f"https://api.auvo.com.br/v2/login/?apiKey={api_key}&apiToken={api_token}"
+        url = AuvoApiService.build_url(f'login/?apiKey={api_key}&apiToken={api_token}')
         
         # Headers da requisição
         headers = {
@@ -39,7 +41,7 @@ class AuthController:
         
         try:
             # Faz a requisição para a API
-            response = requests.get(url, headers=headers, timeout=30)
+            response = AuvoApiService.get(url, headers=headers, timeout=30)
             
             # Verifica se a resposta foi bem-sucedida
             if response.status_code == 200:
@@ -147,6 +149,9 @@ class AuthController:
             # Salva as alterações
             db.session.commit()
             
+            # Próximas validações usam o novo token sem consultar o banco
+            TokenCacheService.armazenar(usuario.id, api_key, api_token, access_token, token_obtido_em)
+            
             return {
                 'user_id': usuario.id,
                 'api_key': usuario.chave_app,
@@ -203,7 +208,11 @@ class AuthController:
     @staticmethod
     def validate_token(api_key):
         """
-        Valida se o token do usuário ainda está válido
+        Valida se o token do usuário ainda está válido, renovando-o se preciso
+        
+        O token vem do cache em memória (TokenCacheService). Perto de expirar
+        ele é renovado em segundo plano; já expirado, é renovado antes de
+        responder.
         
         Args:
             api_key (str): Chave da API
@@ -212,38 +221,20 @@ class AuthController:
             dict: Status de validação do token
         """
         try:
-            usuario = Usuario.query.filter_by(chave_app=api_key).first()
-            
-            if not usuario:
-                print(f"DEBUG: Usuário não encontrado para api_key: {api_key}")
-                return {
-                    'success': False,
-                    'message': 'Usuário não encontrado',
-                    'valid': False
-                }
-            
-            print(f"DEBUG: Usuário encontrado. Token obtido em: {usuario.token_obtido_em}")
-            print(f"DEBUG: Hora atual: {datetime.now()}")
-            
-            # verificar se passou mais de 28 minutos desde token_obtido_em
-            time_diff = datetime.now() - usuario.token_obtido_em
-            print(f"DEBUG: Diferença de tempo: {time_diff.total_seconds()} segundos")
+            entrada = TokenCacheService.obter(api_key)
             
-            # Considerando que o token expira em 30 minutos (1680 segundos mantendo 2 min de margem de erro)
-            if time_diff.total_seconds() > 1680:
-                print(f"DEBUG: Token expirado - diferença: {time_diff.total_seconds()} > 1680")
+            if not entrada:
                 return {
                     'success': True,
                     'message': 'Token expirado',
                     'valid': False
                 }
             
-            print(f"DEBUG: Token válido - diferença: {time_diff.total_seconds()} <= 1680")
             return {
                 'success': True,
                 'message': 'Token válido',
                 'valid': True,
-                'access_token': usuario.token_bearer
+                'access_token': entrada['access_token']
             }
             
         except Exception as e:
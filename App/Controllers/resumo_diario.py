@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, delete, Date
+from ..Models import Tarefa, ResumoDiario
+from ..services.calculos import CalculosService
+from .. import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Quantidade de dias por instrução DELETE/INSERT ao atualizar o resumo
+ROLLUP_DAYS_CHUNK_SIZE = 200
+
+
+class ResumoDiarioController:
+    """Controller do resumo diário de faturamento e custo das tarefas
+
+    Cada linha soma as tarefas de um usuário em um dia, por tipo de tarefa e
+    colaborador. Os totais do dashboard para qualquer período saem da soma
+    dessas linhas, sem percorrer as tarefas.
+    """
+
+    @staticmethod
+    def refresh_days(usuario_id, days):
+        """
+        Recalcula o resumo dos dias informados a partir das tarefas gravadas
+
+        Deve ser chamado na mesma transação que gravou ou removeu as tarefas;
+        o commit fica a cargo do chamador.
+
+        Args:
+            usuario_id (int): ID do usuário
+            days (iterable): Dias (date) cujas tarefas mudaram
+        """
+        days = sorted(set(days))
+        if not days:
+            return
+
+        for offset in range(0, len(days), ROLLUP_DAYS_CHUNK_SIZE):
+            chunk = days[offset:offset + ROLLUP_DAYS_CHUNK_SIZE]
+            dia = func.date(Tarefa.data, type_=Date)
+
+            db.session.execute(
+                delete(ResumoDiario).where(
+                    ResumoDiario.usuario_id == usuario_id,
+                    ResumoDiario.dia.in_(chunk)
+                )
+            )
+
+            # O intervalo em data usa o índice (usuario_id, data); o IN separa os dias do lote
+            select_stmt = db.select(
+                Tarefa.usuario_id,
+                dia,
+                Tarefa.tipo_tarefa_id,
+                Tarefa.colaborador_id,
+                func.count(Tarefa.id),
+                func.coalesce(func.sum(Tarefa.valor_produtos), 0),
+                func.coalesce(func.sum(Tarefa.valor_servicos), 0),
+                func.coalesce(func.sum(Tarefa.custo_total), 0)
+            ).where(
+                Tarefa.usuario_id == usuario_id,
+                Tarefa.data >= datetime.combine(chunk[0], datetime.min.time()),
+                Tarefa.data < datetime.combine(chunk[-1] + timedelta(days=1), datetime.min.time()),
+                dia.in_(chunk)
+            ).group_by(
+                Tarefa.usuario_id, dia, Tarefa.tipo_tarefa_id, Tarefa.colaborador_id
+            )
+
+            db.session.execute(
+                insert(ResumoDiario).from_select(
+                    [
+                        'usuario_id', 'dia', 'tipo_tarefa_id', 'colaborador_id', 'quantidade_tarefas',
+                        'faturamento_produto', 'faturamento_servico', 'custo_produto'
+                    ],
+                    select_stmt
+                )
+            )
+
+        logger.debug(f"📅 Resumo diário atualizado para {len(days)} dia(s) do usuário {usuario_id}")
+
+    @staticmethod
+    def rebuild(usuario_id):
+        """
+        Refaz todo o resumo diário do usuário (sem commit)
+
+        Args:
+            usuario_id (int): ID do usuário
+        """
+        ResumoDiarioController.delete_for_user(usuario_id)
+
+        days = [
+            row[0] for row in
+            db.session.query(func.date(Tarefa.data, type_=Date)).filter(Tarefa.usuario_id == usuario_id).distinct()
+        ]
+        ResumoDiarioController.refresh_days(usuario_id, days)
+
+    @staticmethod
+    def delete_for_user(usuario_id):
+        """
+        Remove todas as linhas do resumo do usuário (sem commit)
+
+        Args:
+            usuario_id (int): ID do usuário
+        """
+        ResumoDiario.query.filter_by(usuario_id=usuario_id).delete()
+
+    @staticmethod
+    def aggregate_totals(usuario_id, start_date=None, end_date=None, filters=None):
+        """
+        Soma faturamento, custo e lucro de um período a partir do resumo diário
+
+        Aceita apenas os filtros que fazem parte da chave do resumo
+        (tipo_tarefa e colaborador).
+
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): tipo_tarefa e colaborador
+
+        Returns:
+            dict: Mesmas chaves de TarefaController.aggregate_financial_totals
+        """
+        filters = filters or {}
+
+        query = db.session.query(
+            func.coalesce(func.sum(ResumoDiario.quantidade_tarefas), 0),
+            func.coalesce(func.sum(ResumoDiario.faturamento_produto), 0),
+            func.coalesce(func.sum(ResumoDiario.faturamento_servico), 0),
+            func.coalesce(func.sum(ResumoDiario.custo_produto), 0)
+        ).filter(ResumoDiario.usuario_id == usuario_id)
+
+        if start_date:
+            query = query.filter(ResumoDiario.dia >= datetime.strptime(start_date, '%Y-%m-%d').date())
+
+        if end_date:
+            query = query.filter(ResumoDiario.dia <= datetime.strptime(end_date, '%Y-%m-%d').date())
+
+        if filters.get('tipo_tarefa'):
+            query = query.filter(ResumoDiario.tipo_tarefa_id == int(filters['tipo_tarefa']))
+
+        if filters.get('colaborador'):
+            query = query.filter(ResumoDiario.colaborador_id == int(filters['colaborador']))
+
+        quantidade, faturamento_produto, faturamento_servico, custo_produto = query.one()
+
+        totais = CalculosService.calcular_todos_os_valores(faturamento_produto, faturamento_servico, custo_produto)
+        return dict(totais['valores'], quantidade_tarefas=quantidade)
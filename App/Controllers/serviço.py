@@ -3,6 +3,7 @@ from datetime import datetime
 from flask import jsonify
 from ..Models import Usuario, Servico
 from .. import db
+from ..services.api_service import AuvoApiService
 
 
 class ServicoController:
@@ -51,17 +52,17 @@ class ServicoController:
         
         
         # URL da API de serviços
-        url = "https://api.auvo.com.br/v2/services/?pageSize=999999999"
+        url = AuvoApiService.build_url('services/?pageSize=999999999')
         
         # Headers da requisição
         headers = {
             'Content-Type': 'application/json',
-            'Authorization': f'Bearer {usuario.token_bearer}'
+            'Authorization': f'Bearer {token_validation["access_token"]}'
         }
         
         try:
             # Faz a requisição para a API
-            response = requests.get(url, headers=headers, timeout=30)
+            response = AuvoApiService.get(url, headers=headers, timeout=30)
             
             # Verifica se a resposta foi bem-sucedida
             if response.status_code == 200:
@@ -1,25 +1,61 @@
 import requests
 import json
+import math
+import base64
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import jsonify
+from decimal import InvalidOperation
+from flask import jsonify, current_app, has_app_context
+from sqlalchemy import func, select, insert, update, delete, tuple_, case
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from sqlalchemy.dialects import sqlite, postgresql, mysql
 from ..Models import (
-    Usuario, Tarefa, Produto, Servico, TipoTarefa, Colaborador,
+    Usuario, Tarefa, TarefaDetalhes, TarefaItem, Produto, Servico, TipoTarefa, Colaborador,
     FaturamentoTotal, FaturamentoProduto, FaturamentoServico,
-    LucroTotal, LucroProduto, LucroServico
+    LucroTotal, LucroProduto, LucroServico, PaginacaoTarefas
 )
 from .. import db
+from ..services.api_service import AuvoApiService
+from ..services.calculos import CalculosService, CHAVES_VALORES
+from .resumo_diario import ResumoDiarioController
 import logging
 
 # Configurar logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Paginação de tarefas
+TASKS_PAGE_SIZE = 100
+TASKS_MAX_WORKERS = 4  # Padrão para AUVO_TASKS_MAX_WORKERS (páginas buscadas em paralelo)
+
+# Gravação de tarefas em lote
+TASKS_UPSERT_CHUNK_SIZE = 500
+TASK_UPSERT_COLUMNS = (
+    'data', 'cliente', 'tipo_tarefa_id', 'colaborador_id',
+    'valor_total', 'custo_total', 'lucro_bruto', 'valor_produtos', 'valor_servicos'
+)
+
+# Relatório detalhado: páginas por cursor e colunas aceitas na ordenação
+REPORT_PAGE_SIZE = 100
+REPORT_MAX_PAGE_SIZE = 500
+REPORT_SORT_COLUMNS = ('data', 'cliente', 'valor_total', 'custo_total', 'lucro_bruto')
+REPORT_STREAM_BATCH_SIZE = 500
+
+# INSERT ... ON CONFLICT DO UPDATE por dialeto (mesma API nos dois); o MySQL
+# usa INSERT ... ON DUPLICATE KEY UPDATE (ver TarefaController._upsert)
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
 
 class TarefaController:
     """Controller para gerenciar tarefas da API da Auvo e cálculos financeiros"""
     
     @staticmethod
-    def fetch_and_process_tasks(user_id, start_date=None, end_date=None):
+    def fetch_and_process_tasks(user_id, start_date=None, end_date=None, progress_callback=None):
         """
         Busca tarefas da API da Auvo, processa e salva dados financeiros
         
@@ -27,6 +63,7 @@ class TarefaController:
             user_id (int): ID do usuário no banco de dados
             start_date (str, optional): Data inicial (YYYY-MM-DD). Default: ontem
             end_date (str, optional): Data final (YYYY-MM-DD). Default: hoje
+            progress_callback (callable, optional): Recebe (páginas concluídas, total de páginas)
             
         Returns:
             dict: Resultado da operação com todos os cálculos
@@ -76,38 +113,259 @@ class TarefaController:
         
         logger.debug(f"📅 Período: {start_date} até {end_date}")
         
-        # Busca todas as tarefas do período
-        tasks_result = TarefaController._fetch_all_tasks_from_api(usuario, start_date, end_date)
+        # Busca e grava as tarefas página a página
+        stream_result = TarefaController._stream_tasks_to_db(
+            usuario, token_validation['access_token'], start_date, end_date, progress_callback=progress_callback
+        )
+        
+        if not stream_result['success']:
+            return stream_result
         
-        if not tasks_result['success']:
-            return tasks_result
+        stored = stream_result['data']
+        totals = stored['totals']
         
-        tasks_list = tasks_result['data']
-        logger.debug(f"📊 Total de tarefas encontradas: {len(tasks_list)}")
+        if stored['resumed']:
+            # As páginas das tentativas anteriores já estão no banco: os totais do período saem dele
+            totals = TarefaController.aggregate_financial_totals(usuario.id, start_date, end_date)
+            totals = {chave: totals[chave] for chave in CHAVES_VALORES}
         
-        # Processa e salva as tarefas
-        processing_result = TarefaController._process_and_save_tasks(tasks_list, usuario.id, start_date, end_date)
+        # Calcula e salva dados financeiros gerais
+        financial_result = TarefaController._calculate_and_save_financial_data(
+            usuario.id, start_date, end_date,
+            totals['faturamento_total'], totals['faturamento_produto'], totals['faturamento_servico'],
+            totals['custo_produto'], totals['lucro_produto'], totals['lucro_servico'], totals['lucro_total']
+        )
         
-        return processing_result
+        return {
+            'success': True,
+            'message': f'Processamento concluído com sucesso. {stored["saved"]} tarefas salvas, {stored["updated"]} atualizadas.',
+            'data': {
+                'tasks_processed': stored['processed'],
+                'tasks_saved': stored['saved'],
+                'tasks_updated': stored['updated'],
+                'tasks_errors': stored['errors'],
+                'financial_data': financial_result,
+                'calculations': totals
+            }
+        }
     
     @staticmethod
-    def _fetch_all_tasks_from_api(usuario, start_date, end_date):
+    def _stream_tasks_to_db(usuario, access_token, start_date, end_date, progress_callback=None, collect_ids=False):
         """
-        Busca todas as tarefas da API com paginação
+        Busca as tarefas do período e grava cada página assim que ela chega
+        
+        Cada página é convertida, gravada e confirmada (commit) antes da
+        próxima ser consumida, enquanto as páginas seguintes são buscadas em
+        paralelo (ver _iter_task_pages). A memória usada depende do tamanho da
+        página, não do período.
+        
+        O commit de cada página também grava o checkpoint da paginação
+        (PaginacaoTarefas). Se uma página falhar, as anteriores continuam
+        gravadas e a próxima chamada para o mesmo período continua da página
+        que falhou; se o totalItems da API mudou desde então, a paginação
+        recomeça da primeira página. O checkpoint é removido ao final.
         
         Args:
             usuario: Objeto Usuario
+            access_token (str): Token bearer devolvido por AuthController.validate_token
+            start_date (str): Data inicial (YYYY-MM-DD)
+            end_date (str): Data final (YYYY-MM-DD)
+            progress_callback (callable, optional): Recebe (páginas concluídas, total de páginas)
+            collect_ids (bool): Se True, devolve os IDs recebidos da API (para
+                _remove_missing_tasks)
+            
+        Returns:
+            dict: Resultado com processed, saved, updated, errors, totals (em
+                reais, só das páginas desta chamada), resumed (True se
+                continuou de um checkpoint) e task_ids (set, ou None se
+                collect_ids for False ou a chamada continuou de um checkpoint)
+        """
+        lookups = TarefaController._load_sync_lookups(usuario.id)
+        stored = {'processed': 0, 'saved': 0, 'updated': 0, 'errors': 0}
+        totals = dict.fromkeys(CHAVES_VALORES, 0)
+        task_ids = set() if collect_ids else None
+        
+        checkpoint = TarefaController._get_page_checkpoint(usuario.id, start_date, end_date)
+        start_page = checkpoint.ultima_pagina + 1 if checkpoint else 1
+        
+        try:
+            while True:
+                restart = False
+                
+                with closing(TarefaController._iter_task_pages(
+                    access_token, start_date, end_date, progress_callback=progress_callback, start_page=start_page
+                )) as pages:
+                    for page, page_result in enumerate(pages, start_page):
+                        if not page_result['success']:
+                            return page_result
+                        
+                        page_tasks = page_result['data']['tasks']
+                        total_items = page_result['data']['total_items']
+                        
+                        if checkpoint is None:
+                            checkpoint = PaginacaoTarefas(
+                                usuario_id=usuario.id, data_inicial=start_date, data_final=end_date
+                            )
+                            db.session.add(checkpoint)
+                        elif page == start_page and total_items != checkpoint.total_itens:
+                            # As páginas mudaram de posição na API: a continuação pularia tarefas
+                            logger.warning(
+                                f"⚠️ Total de tarefas mudou de {checkpoint.total_itens} para {total_items}; "
+                                f"paginação recomeça da página 1"
+                            )
+                            restart = True
+                            break
+                        
+                        checkpoint.ultima_pagina = page
+                        checkpoint.total_itens = total_items
+                        checkpoint.atualizado_em = datetime.now()
+                        
+                        # Grava a página e o checkpoint no mesmo commit
+                        store_result = TarefaController._store_tasks(page_tasks, usuario.id, lookups)
+                        
+                        stored['processed'] += len(page_tasks)
+                        stored['saved'] += store_result['saved']
+                        stored['updated'] += store_result['updated']
+                        stored['errors'] += store_result['errors']
+                        
+                        # Totais acumulados em centavos (exatos)
+                        for chave in CHAVES_VALORES:
+                            totals[chave] += CalculosService.para_centavos(store_result['totals'][chave])
+                        
+                        if collect_ids:
+                            task_ids.update(store_result['task_ids'])
+                
+                if not restart:
+                    break
+                
+                db.session.delete(checkpoint)
+                db.session.commit()
+                checkpoint = None
+                start_page = 1
+            
+            if checkpoint is not None:
+                db.session.delete(checkpoint)
+                db.session.commit()
+            
+        except requests.exceptions.RequestException as e:
+            db.session.rollback()
+            return TarefaController._request_error_result(e)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"❌ Erro crítico ao processar tarefas: {str(e)}")
+            return {
+                'success': False,
+                'message': f'Erro crítico: {str(e)}',
+                'data': None
+            }
+        
+        resumed = start_page > 1
+        if resumed:
+            logger.debug(f"⏯️ Paginação retomada da página {start_page}")
+            # Os IDs das páginas gravadas nas tentativas anteriores não são conhecidos
+            task_ids = None
+        
+        logger.debug(f"✅ {stored['processed']} tarefas gravadas página a página")
+        
+        return {
+            'success': True,
+            'message': 'Tarefas gravadas com sucesso',
+            'data': dict(
+                stored, totals=CalculosService.valores_em_reais(totals), resumed=resumed, task_ids=task_ids
+            )
+        }
+    
+    @staticmethod
+    def _get_page_checkpoint(usuario_id, start_date, end_date):
+        """
+        Busca o checkpoint de paginação de tarefas de um período
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str): Data inicial enviada à API
+            end_date (str): Data final enviada à API
+            
+        Returns:
+            PaginacaoTarefas: Checkpoint ou None
+        """
+        return PaginacaoTarefas.query.filter_by(
+            usuario_id=usuario_id, data_inicial=start_date, data_final=end_date
+        ).first()
+    
+    @staticmethod
+    def _fetch_all_tasks_from_api(access_token, start_date, end_date, max_workers=None, progress_callback=None):
+        """
+        Busca todas as tarefas da API com paginação e as reúne em uma lista
+        
+        Usa _iter_task_pages; a lista final mantém a ordem das páginas.
+        
+        Args:
+            access_token (str): Token bearer devolvido por AuthController.validate_token
             start_date (str): Data inicial
             end_date (str): Data final
+            max_workers (int, optional): Limite de páginas buscadas em paralelo.
+                Default: config AUVO_TASKS_MAX_WORKERS ou TASKS_MAX_WORKERS
+            progress_callback (callable, optional): Chamado a cada página com
+                (páginas concluídas, total de páginas)
             
         Returns:
             dict: Resultado com lista de tarefas
         """
+        all_tasks = []
+        
+        try:
+            with closing(TarefaController._iter_task_pages(
+                access_token, start_date, end_date, max_workers=max_workers, progress_callback=progress_callback
+            )) as pages:
+                for page_result in pages:
+                    if not page_result['success']:
+                        return page_result
+                    all_tasks.extend(page_result['data']['tasks'])
+            
+        except requests.exceptions.RequestException as e:
+            return TarefaController._request_error_result(e)
+        
+        logger.debug(f"✅ Total de tarefas coletadas: {len(all_tasks)}")
+        
+        return {
+            'success': True,
+            'message': f'Tarefas coletadas com sucesso',
+            'data': all_tasks
+        }
+    
+    @staticmethod
+    def _iter_task_pages(access_token, start_date, end_date, max_workers=None, progress_callback=None, start_page=1):
+        """
+        Gera as páginas de tarefas da API na ordem, buscando as seguintes em paralelo
+        
+        A primeira página (start_page) é buscada sozinha para descobrir o total
+        de itens (pagedSearchReturnData.totalItems). Das páginas restantes, no máximo
+        max_workers ficam em andamento ou prontas à espera do consumidor:
+        enquanto ele grava uma página as próximas já estão sendo buscadas, e a
+        memória não cresce com o total de páginas.
+        
+        Cada item gerado é o resultado de _fetch_tasks_page; depois de um
+        resultado sem sucesso nada mais é gerado. Exceções de rede
+        (requests.exceptions) são propagadas para o consumidor.
+        
+        Args:
+            access_token (str): Token bearer devolvido por AuthController.validate_token
+            start_date (str): Data inicial
+            end_date (str): Data final
+            max_workers (int, optional): Limite de páginas buscadas à frente.
+                Default: config AUVO_TASKS_MAX_WORKERS ou TASKS_MAX_WORKERS
+            progress_callback (callable, optional): Chamado a cada página com
+                (páginas concluídas, total de páginas)
+            start_page (int): Página por onde começar (continuação de um checkpoint)
+            
+        Yields:
+            dict: Resultado de cada página ({'tasks', 'total_items'} em data)
+        """
         
         # Headers da requisição
         headers = {
             'Content-Type': 'application/json',
-            'Authorization': f'Bearer {usuario.token_bearer}'
+            'Authorization': f'Bearer {access_token}'
         }
         
         # Parâmetros do filtro
@@ -117,113 +375,185 @@ class TarefaController:
             "status": 3  # Tarefas finalizadas automaticamente ou manualmente
         }
         
-        all_tasks = []
-        page = 1
-        page_size = 100
+        page_size = TASKS_PAGE_SIZE
         
+        if max_workers is None:
+            max_workers = TarefaController._get_max_workers()
+        
+        # Primeira página: também informa o total de itens do período
+        first_page = TarefaController._fetch_tasks_page(headers, param_filter, start_page, page_size)
+        
+        if not first_page['success']:
+            yield first_page
+            return
+        
+        first_count = len(first_page['data']['tasks'])
+        total_items = first_page['data']['total_items']
+        
+        # Se a primeira página veio incompleta não há mais páginas
+        if first_count < page_size or start_page * page_size >= total_items:
+            total_pages = start_page
+        else:
+            total_pages = math.ceil(total_items / page_size)
+        
+        logger.debug(f"📋 Paginação: {total_items} itens em {total_pages} página(s), até {max_workers} em paralelo")
+        
+        if progress_callback:
+            progress_callback(start_page, total_pages)
+        
+        yield first_page
+        
+        if total_pages == start_page:
+            return
+        
+        window = max(1, min(max_workers, total_pages - start_page))
+        executor = ThreadPoolExecutor(max_workers=window)
         try:
-            while True:
-                # Monta a URL com parâmetros - Importante: Tasks com T maiúsculo
-                url = f"https://api.auvo.com.br/v2/Tasks/?ParamFilter={json.dumps(param_filter)}&Page={page}&PageSize={page_size}"
+            pending = deque()
+            next_page = start_page + 1
+            
+            for page in range(start_page + 1, total_pages + 1):
+                # Mantém a janela de páginas à frente da que será entregue
+                while next_page <= total_pages and len(pending) < window:
+                    pending.append(executor.submit(
+                        TarefaController._fetch_tasks_page, headers, param_filter, next_page, page_size
+                    ))
+                    next_page += 1
                 
-                logger.debug(f"🌐 Buscando página {page}: {url}")
+                # Entrega na ordem das páginas, independente da ordem de conclusão
+                page_result = pending.popleft().result()
                 
-                # Faz a requisição para a API
-                response = requests.get(url, headers=headers, timeout=30)
+                if not page_result['success']:
+                    yield page_result
+                    return
                 
-                logger.debug(f"📡 Status da resposta página {page}: {response.status_code}")
+                if progress_callback:
+                    progress_callback(page, total_pages)
                 
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        logger.debug(f"📄 Resposta da API recebida com sucesso")
-                        logger.debug(f"📋 Estrutura da resposta: {list(data.keys())}")
-                        
-                        # Verifica estrutura da resposta
-                        if 'result' in data and 'entityList' in data['result']:
-                            tasks_page = data['result']['entityList']
-                            logger.debug(f"📊 Encontradas {len(tasks_page)} tarefas na página {page}")
-                            
-                            all_tasks.extend(tasks_page)
-                            
-                            # Verifica se há mais páginas
-                            paged_data = data['result'].get('pagedSearchReturnData', {})
-                            total_items = paged_data.get('totalItems', 0)
-                            current_page = paged_data.get('page', page)
-                            
-                            logger.debug(f"📋 Paginação: página {current_page}, total de itens: {total_items}")
-                            
-                            # Se não há mais tarefas ou chegou ao final
-                            if len(tasks_page) < page_size or len(all_tasks) >= total_items:
-                                break
-                            
-                            page += 1
-                        else:
-                            logger.error(f"❌ Formato de resposta inválido da API. Estrutura: {list(data.keys())}")
-                            return {
-                                'success': False,
-                                'message': 'Formato de resposta inválido da API',
-                                'data': None
-                            }
-                            
-                    except ValueError as e:
-                        logger.error(f"❌ Erro ao processar resposta da API: {str(e)}")
-                        return {
-                            'success': False,
-                            'message': 'Erro ao processar resposta da API',
-                            'data': None
-                        }
-                        
-                elif response.status_code == 401:
-                    logger.error(f"❌ Token de autorização inválido ou expirado")
-                    return {
-                        'success': False,
-                        'message': 'Token de autorização inválido ou expirado',
-                        'data': None
-                    }
-                elif response.status_code == 400:
-                    logger.error(f"❌ Erro na API: {response.status_code}")
-                    logger.error(f"📄 Conteúdo da resposta: {response.text}")
-                    return {
-                        'success': False,
-                        'message': f'Erro na requisição: {response.text}',
-                        'data': None
-                    }
-                else:
-                    logger.error(f"❌ Erro inesperado da API: {response.status_code}")
-                    return {
-                        'success': False,
-                        'message': f'Erro inesperado: {response.status_code}',
-                        'data': None
-                    }
+                yield page_result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    @staticmethod
+    def _request_error_result(error):
+        """
+        Converte uma exceção de rede da busca de tarefas no resultado de erro padrão
+        
+        Args:
+            error (requests.exceptions.RequestException): Exceção levantada
             
-            logger.debug(f"✅ Total de tarefas coletadas: {len(all_tasks)}")
+        Returns:
+            dict: Resultado sem sucesso com a mensagem do tipo de erro
+        """
+        if isinstance(error, requests.exceptions.Timeout):
+            logger.error(f"⏱️ Timeout na conexão com a API")
+            message = 'Timeout na conexão com a API'
+        elif isinstance(error, requests.exceptions.ConnectionError):
+            logger.error(f"🔌 Erro de conexão com a API")
+            message = 'Erro de conexão com a API'
+        else:
+            logger.error(f"🚫 Erro na requisição para a API: {str(error)}")
+            message = 'Erro na requisição para a API'
+        
+        return {
+            'success': False,
+            'message': message,
+            'data': None
+        }
+    
+    @staticmethod
+    def _get_max_workers():
+        """
+        Retorna o limite de páginas de tarefas buscadas em paralelo
+        
+        Returns:
+            int: Valor de AUVO_TASKS_MAX_WORKERS na config da aplicação ou TASKS_MAX_WORKERS
+        """
+        if has_app_context():
+            return int(current_app.config.get('AUVO_TASKS_MAX_WORKERS', TASKS_MAX_WORKERS))
+        return TASKS_MAX_WORKERS
+    
+    @staticmethod
+    def _fetch_tasks_page(headers, param_filter, page, page_size):
+        """
+        Busca uma única página de tarefas na API
+        
+        Exceções de rede (requests.exceptions) são propagadas para o chamador.
+        
+        Args:
+            headers (dict): Headers da requisição
+            param_filter (dict): Filtro enviado em ParamFilter
+            page (int): Número da página
+            page_size (int): Tamanho da página
             
+        Returns:
+            dict: Resultado com as tarefas da página e o total de itens do período
+        """
+        
+        # Monta a URL com parâmetros - Importante: Tasks com T maiúsculo
+        url = AuvoApiService.build_url(f'Tasks/?ParamFilter={json.dumps(param_filter)}&Page={page}&PageSize={page_size}')
+        
+        logger.debug(f"🌐 Buscando página {page}: {url}")
+        
+        # Faz a requisição para a API
+        response = AuvoApiService.get(url, headers=headers, timeout=30)
+        
+        logger.debug(f"📡 Status da resposta página {page}: {response.status_code}")
+        
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError as e:
+                logger.error(f"❌ Erro ao processar resposta da API: {str(e)}")
+                return {
+                    'success': False,
+                    'message': 'Erro ao processar resposta da API',
+                    'data': None
+                }
+            
+            # Verifica estrutura da resposta
+            if 'result' in data and 'entityList' in data['result']:
+                tasks_page = data['result']['entityList']
+                paged_data = data['result'].get('pagedSearchReturnData', {})
+                
+                logger.debug(f"📊 Encontradas {len(tasks_page)} tarefas na página {page}")
+                
+                return {
+                    'success': True,
+                    'message': f'Página {page} coletada com sucesso',
+                    'data': {
+                        'tasks': tasks_page,
+                        'total_items': paged_data.get('totalItems', 0)
+                    }
+                }
+            
+            logger.error(f"❌ Formato de resposta inválido da API. Estrutura: {list(data.keys())}")
             return {
-                'success': True,
-                'message': f'Tarefas coletadas com sucesso',
-                'data': all_tasks
+                'success': False,
+                'message': 'Formato de resposta inválido da API',
+                'data': None
             }
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"⏱️ Timeout na conexão com a API")
+        
+        elif response.status_code == 401:
+            logger.error(f"❌ Token de autorização inválido ou expirado")
             return {
                 'success': False,
-                'message': 'Timeout na conexão com a API',
+                'message': 'Token de autorização inválido ou expirado',
                 'data': None
             }
-        except requests.exceptions.ConnectionError:
-            logger.error(f"🔌 Erro de conexão com a API")
+        elif response.status_code == 400:
+            logger.error(f"❌ Erro na API: {response.status_code}")
+            logger.error(f"📄 Conteúdo da resposta: {response.text}")
             return {
                 'success': False,
-                'message': 'Erro de conexão com a API',
+                'message': f'Erro na requisição: {response.text}',
                 'data': None
             }
-        except requests.exceptions.RequestException as e:
-            logger.error(f"🚫 Erro na requisição para a API: {str(e)}")
+        else:
+            logger.error(f"❌ Erro inesperado da API: {response.status_code}")
             return {
                 'success': False,
-                'message': 'Erro na requisição para a API',
+                'message': f'Erro inesperado: {response.status_code}',
                 'data': None
             }
     
@@ -232,6 +562,10 @@ class TarefaController:
         """
         Processa e salva as tarefas com todos os cálculos financeiros
         
+        Tipos de tarefa, colaboradores e produtos do usuário são carregados uma
+        única vez em dicionários; as tarefas são gravadas em lotes com
+        INSERT ... ON CONFLICT DO UPDATE.
+        
         Args:
             tasks_list (list): Lista de tarefas da API
             usuario_id (int): ID do usuário
@@ -244,222 +578,19 @@ class TarefaController:
         
         logger.debug(f"💾 Processando {len(tasks_list)} tarefas para usuário {usuario_id}")
         
-        # Contadores
-        saved_tasks = 0
-        updated_tasks = 0
-        error_tasks = 0
-        errors = []
-        
-        # Acumuladores para cálculos gerais
-        faturamento_total_geral = 0.0
-        faturamento_produto_geral = 0.0
-        faturamento_servico_geral = 0.0
-        custo_produto_geral = 0.0
-        lucro_produto_geral = 0.0
-        lucro_servico_geral = 0.0
-        lucro_total_geral = 0.0
-        
         try:
-            for i, task_data in enumerate(tasks_list):
-                try:
-                    logger.debug(f"🔄 Processando tarefa {i+1}/{len(tasks_list)}")
-                    
-                    # Debug: Mostra a estrutura da primeira tarefa para análise
-                    if i == 0:
-                        logger.debug(f"🔍 Estrutura da primeira tarefa: {list(task_data.keys())}")
-                        logger.debug(f"🔍 Dados completos da primeira tarefa: {task_data}")
-                    
-                    # Extrai dados da tarefa - tenta diferentes possíveis nomes para o ID
-                    task_id = task_data.get('taskId') or task_data.get('id') or task_data.get('taskID') or task_data.get('ID')
-                    user_to_id = task_data.get('idUserTo') or task_data.get('userToId') or task_data.get('userId')
-                    customer_description = task_data.get('customerDescription', '') or task_data.get('customer', '') or task_data.get('customerName', '')
-                    task_type_id = task_data.get('taskType') or task_data.get('taskTypeId') or task_data.get('typeId')
-                    task_date_str = task_data.get('taskDate', '') or task_data.get('date', '') or task_data.get('dateTime', '')
-                    
-                    if not task_id:
-                        logger.warning(f"⚠️ Tarefa sem ID ignorada. Chaves disponíveis: {list(task_data.keys())}")
-                        error_tasks += 1
-                        continue
-                    
-                    # Valida e corrige IDs de relacionamentos
-                    # Verifica se tipo de tarefa existe no banco
-                    if task_type_id is not None:
-                        tipo_tarefa_existe = TipoTarefa.query.filter_by(
-                            id=task_type_id,
-                            usuario_id=usuario_id
-                        ).first()
-                        if not tipo_tarefa_existe:
-                            # Se taskType é 0, cria um tipo padrão
-                            if task_type_id == 0:
-                                tipo_padrao = TipoTarefa.query.filter_by(
-                                    id=0,
-                                    usuario_id=usuario_id
-                                ).first()
-                                
-                                if not tipo_padrao:
-                                    # Cria tipo de tarefa padrão
-                                    tipo_padrao = TipoTarefa(
-                                        id=0,
-                                        usuario_id=usuario_id,
-                                        descricao="Tarefa Geral"
-                                    )
-                                    db.session.add(tipo_padrao)
-                                    db.session.flush()  # Para obter o ID
-                                    logger.debug(f"✅ Tipo de tarefa padrão criado: ID=0, Descrição='Tarefa Geral'")
-                                
-                                task_type_id = 0
-                            else:
-                                logger.warning(f"⚠️ Tipo de tarefa {task_type_id} não encontrado no banco. Usando tipo padrão.")
-                                task_type_id = 0
-                    else:
-                        # Se task_type_id é None, usa tipo padrão
-                        task_type_id = 0
-                    
-                    # Verifica se colaborador existe no banco
-                    if user_to_id:
-                        colaborador_existe = Colaborador.query.filter_by(
-                            id=user_to_id,
-                            usuario_id=usuario_id
-                        ).first()
-                        if not colaborador_existe:
-                            logger.warning(f"⚠️ Colaborador {user_to_id} não encontrado no banco. Tarefa será ignorada.")
-                            error_tasks += 1
-                            errors.append(f"Tarefa {task_id}: colaborador {user_to_id} não encontrado")
-                            continue
-                    else:
-                        logger.warning(f"⚠️ Tarefa {task_id} sem colaborador definido. Tarefa será ignorada.")
-                        error_tasks += 1
-                        errors.append(f"Tarefa {task_id}: sem colaborador definido")
-                        continue
-                    
-                    # Parse da data
-                    task_date = None
-                    if task_date_str:
-                        try:
-                            task_date = datetime.fromisoformat(task_date_str.replace('Z', '+00:00'))
-                        except ValueError:
-                            logger.warning(f"⚠️ Data inválida na tarefa {task_id}: {task_date_str}")
-                            task_date = datetime.now()
-                    
-                    # Processa produtos da tarefa
-                    produtos = task_data.get('products', [])
-                    faturamento_produto_tarefa = 0.0
-                    custo_produto_tarefa = 0.0
-                    
-                    for produto_data in produtos:
-                        produto_id = produto_data.get('productId')
-                        quantidade = float(produto_data.get('quantity', 0))
-                        valor_total_produto = float(produto_data.get('totalValue', 0))
-                        
-                        # Busca produto no banco para obter custo
-                        produto_banco = Produto.query.filter_by(
-                            id=produto_id,
-                            usuario_id=usuario_id
-                        ).first()
-                        
-                        if produto_banco:
-                            custo_unitario = produto_banco.custo_unitario or 0.0
-                            custo_total_produto = custo_unitario * quantidade
-                            
-                            faturamento_produto_tarefa += valor_total_produto
-                            custo_produto_tarefa += custo_total_produto
-                            
-                            logger.debug(f"📦 Produto {produto_id}: Qtd={quantidade}, Faturamento={valor_total_produto}, Custo={custo_total_produto}")
-                        else:
-                            logger.warning(f"⚠️ Produto {produto_id} não encontrado no banco")
-                    
-                    # Processa serviços da tarefa
-                    servicos = task_data.get('services', [])
-                    faturamento_servico_tarefa = 0.0
-                    
-                    for servico_data in servicos:
-                        valor_total_servico = float(servico_data.get('totalValue', 0))
-                        faturamento_servico_tarefa += valor_total_servico
-                        
-                        logger.debug(f"🔧 Serviço: Faturamento={valor_total_servico}")
-                    
-                    # Cálculos da tarefa
-                    faturamento_total_tarefa = faturamento_produto_tarefa + faturamento_servico_tarefa
-                    lucro_produto_tarefa = faturamento_produto_tarefa - custo_produto_tarefa
-                    lucro_servico_tarefa = faturamento_servico_tarefa  # Lucro serviço = faturamento serviço
-                    lucro_total_tarefa = lucro_produto_tarefa + lucro_servico_tarefa
-                    
-                    # Verifica se a tarefa já existe
-                    tarefa_existente = Tarefa.query.filter_by(
-                        id=task_id,
-                        usuario_id=usuario_id
-                    ).first()
-                    
-                    # Monta JSON com detalhes completos
-                    detalhes_json = {
-                        'task_original': task_data,
-                        'calculos': {
-                            'faturamento_produto': faturamento_produto_tarefa,
-                            'faturamento_servico': faturamento_servico_tarefa,
-                            'faturamento_total': faturamento_total_tarefa,
-                            'custo_produto': custo_produto_tarefa,
-                            'lucro_produto': lucro_produto_tarefa,
-                            'lucro_servico': lucro_servico_tarefa,
-                            'lucro_total': lucro_total_tarefa
-                        }
-                    }
-                    
-                    if tarefa_existente:
-                        # Atualiza tarefa existente
-                        tarefa_existente.data = task_date
-                        tarefa_existente.cliente = customer_description
-                        tarefa_existente.tipo_tarefa_id = task_type_id
-                        tarefa_existente.colaborador_id = user_to_id
-                        tarefa_existente.valor_total = faturamento_total_tarefa
-                        tarefa_existente.custo_total = custo_produto_tarefa
-                        tarefa_existente.lucro_bruto = lucro_total_tarefa
-                        tarefa_existente.detalhes_json = detalhes_json
-                        
-                        updated_tasks += 1
-                        logger.debug(f"📝 Tarefa atualizada - ID: {task_id}")
-                    else:
-                        # Cria nova tarefa
-                        nova_tarefa = Tarefa(
-                            id=task_id,
-                            usuario_id=usuario_id,
-                            data=task_date,
-                            cliente=customer_description,
-                            tipo_tarefa_id=task_type_id,
-                            colaborador_id=user_to_id,
-                            valor_total=faturamento_total_tarefa,
-                            custo_total=custo_produto_tarefa,
-                            lucro_bruto=lucro_total_tarefa,
-                            detalhes_json=detalhes_json
-                        )
-                        
-                        db.session.add(nova_tarefa)
-                        saved_tasks += 1
-                        logger.debug(f"➕ Nova tarefa criada - ID: {task_id}")
-                    
-                    # Acumula valores gerais
-                    faturamento_total_geral += faturamento_total_tarefa
-                    faturamento_produto_geral += faturamento_produto_tarefa
-                    faturamento_servico_geral += faturamento_servico_tarefa
-                    custo_produto_geral += custo_produto_tarefa
-                    lucro_produto_geral += lucro_produto_tarefa
-                    lucro_servico_geral += lucro_servico_tarefa
-                    lucro_total_geral += lucro_total_tarefa
-                    
-                except Exception as e:
-                    logger.error(f"❌ Erro ao processar tarefa {i+1}: {str(e)}")
-                    error_tasks += 1
-                    errors.append(f"Tarefa {i+1}: {str(e)}")
-                    continue
+            store_result = TarefaController._store_tasks(tasks_list, usuario_id)
             
-            # Commit das tarefas
-            db.session.commit()
-            logger.debug(f"💾 Tarefas salvas - {saved_tasks} novas, {updated_tasks} atualizadas, {error_tasks} erros")
+            saved_tasks = store_result['saved']
+            updated_tasks = store_result['updated']
+            error_tasks = store_result['errors']
+            totals = store_result['totals']
             
             # Calcula e salva dados financeiros gerais
             financial_result = TarefaController._calculate_and_save_financial_data(
                 usuario_id, start_date, end_date,
-                faturamento_total_geral, faturamento_produto_geral, faturamento_servico_geral,
-                custo_produto_geral, lucro_produto_geral, lucro_servico_geral, lucro_total_geral
+                totals['faturamento_total'], totals['faturamento_produto'], totals['faturamento_servico'],
+                totals['custo_produto'], totals['lucro_produto'], totals['lucro_servico'], totals['lucro_total']
             )
             
             return {
@@ -471,15 +602,7 @@ class TarefaController:
                     'tasks_updated': updated_tasks,
                     'tasks_errors': error_tasks,
                     'financial_data': financial_result,
-                    'calculations': {
-                        'faturamento_total': faturamento_total_geral,
-                        'faturamento_produto': faturamento_produto_geral,
-                        'faturamento_servico': faturamento_servico_geral,
-                        'custo_produto': custo_produto_geral,
-                        'lucro_produto': lucro_produto_geral,
-                        'lucro_servico': lucro_servico_geral,
-                        'lucro_total': lucro_total_geral
-                    }
+                    'calculations': totals
                 }
             }
             
@@ -492,6 +615,908 @@ class TarefaController:
                 'data': None
             }
     
+    @staticmethod
+    def _store_tasks(tasks_list, usuario_id, lookups=None):
+        """
+        Calcula e grava as tarefas em lote e faz o commit
+        
+        Exceções de banco são propagadas para o chamador.
+        
+        Args:
+            tasks_list (list): Lista de tarefas da API
+            usuario_id (int): ID do usuário
+            lookups (dict, optional): Cadastros de _load_sync_lookups, para
+                reaproveitá-los entre páginas. Default: carregados na chamada
+            
+        Returns:
+            dict: Contadores, totais gerais e IDs das tarefas gravadas
+        """
+        # Carrega os cadastros do usuário uma única vez
+        if lookups is None:
+            lookups = TarefaController._load_sync_lookups(usuario_id)
+        
+        # Monta as linhas da tabela tarefa
+        build_result = TarefaController._build_task_rows(tasks_list, usuario_id, lookups)
+        
+        # Grava as tarefas em lotes
+        upsert_result = TarefaController._bulk_upsert_tasks(build_result['rows'], usuario_id)
+        
+        # Grava o JSON comprimido das tarefas gravadas em tarefa_detalhes
+        TarefaController._upsert_task_details(build_result['details'], upsert_result['ids'])
+        
+        # Grava os itens de produto e serviço das tarefas gravadas
+        TarefaController._replace_task_items(build_result['items'], upsert_result['ids'])
+        
+        # Atualiza o resumo diário dos dias afetados na mesma transação
+        ResumoDiarioController.refresh_days(usuario_id, upsert_result['days'])
+        
+        # Commit das tarefas
+        db.session.commit()
+        
+        logger.debug(f"💾 Tarefas salvas - {upsert_result['saved']} novas, {upsert_result['updated']} atualizadas")
+        
+        return {
+            'saved': upsert_result['saved'],
+            'updated': upsert_result['updated'],
+            'errors': build_result['errors'] + upsert_result['errors'],
+            'totals': build_result['totals'],
+            'task_ids': {row['id'] for row in build_result['rows']}
+        }
+    
+    @staticmethod
+    def _remove_missing_tasks(usuario_id, inicio, fim, task_ids):
+        """
+        Remove tarefas do período que não vieram mais na resposta da API
+        
+        Usado ao re-sincronizar um período: tarefas excluídas ou reabertas na
+        Auvo deixam de aparecer e não devem continuar no relatório.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            inicio (date): Primeiro dia do período
+            fim (date): Último dia do período (inclusivo)
+            task_ids (set): IDs retornados pela API para o período
+            
+        Returns:
+            int: Quantidade de tarefas removidas
+        """
+        periodo_inicio = datetime.combine(inicio, datetime.min.time())
+        periodo_fim = datetime.combine(fim + timedelta(days=1), datetime.min.time())
+        
+        existing = {
+            row.id: row.data for row in db.session.query(Tarefa.id, Tarefa.data).filter(
+                Tarefa.usuario_id == usuario_id,
+                Tarefa.data >= periodo_inicio,
+                Tarefa.data < periodo_fim
+            )
+        }
+        task_ids = set(task_ids)
+        missing_ids = [task_id for task_id in existing if task_id not in task_ids]
+        
+        for offset in range(0, len(missing_ids), TASKS_UPSERT_CHUNK_SIZE):
+            chunk = missing_ids[offset:offset + TASKS_UPSERT_CHUNK_SIZE]
+            TarefaItem.query.filter(TarefaItem.tarefa_id.in_(chunk)).delete(synchronize_session=False)
+            TarefaDetalhes.query.filter(TarefaDetalhes.tarefa_id.in_(chunk)).delete(synchronize_session=False)
+            # Só IDs do usuário (lidos acima): sem o filtro por usuario_id o SQLite usa a chave primária
+            Tarefa.query.filter(Tarefa.id.in_(chunk)).delete(synchronize_session=False)
+        
+        ResumoDiarioController.refresh_days(usuario_id, {existing[task_id].date() for task_id in missing_ids})
+        
+        db.session.commit()
+        
+        if missing_ids:
+            logger.debug(f"🗑️ {len(missing_ids)} tarefas removidas entre {inicio} e {fim}")
+        
+        return len(missing_ids)
+    
+    @staticmethod
+    def recalculate_financial_data(usuario_id, start_date, end_date):
+        """
+        Recalcula os dados financeiros do período a partir das tarefas já gravadas
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str): Data inicial (YYYY-MM-DD)
+            end_date (str): Data final (YYYY-MM-DD), inclusiva
+            
+        Returns:
+            dict: Dados financeiros salvos (ver _calculate_and_save_financial_data)
+        """
+        totals = TarefaController.aggregate_financial_totals(usuario_id, start_date, end_date)
+        
+        return TarefaController._calculate_and_save_financial_data(
+            usuario_id, start_date, end_date,
+            totals['faturamento_total'], totals['faturamento_produto'], totals['faturamento_servico'],
+            totals['custo_produto'], totals['lucro_produto'], totals['lucro_servico'], totals['lucro_total']
+        )
+    
+    @staticmethod
+    def apply_task_filters(query, usuario_id, start_date=None, end_date=None, filters=None):
+        """
+        Restringe uma consulta sobre Tarefa ao usuário, ao período e aos filtros
+        
+        O período usa [início, fim + 1 dia), então a data final inclui o dia
+        inteiro e a consulta aproveita o índice (usuario_id, data).
+        
+        Args:
+            query: Consulta SQLAlchemy que tem Tarefa no FROM
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): tipo_tarefa, colaborador, produto e servico;
+                valores vazios são ignorados
+            
+        Returns:
+            Consulta com os filtros aplicados
+        """
+        filters = filters or {}
+        query = query.filter(Tarefa.usuario_id == usuario_id)
+        
+        if start_date:
+            query = query.filter(Tarefa.data >= datetime.strptime(start_date, '%Y-%m-%d'))
+        
+        if end_date:
+            query = query.filter(Tarefa.data < datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1))
+        
+        if filters.get('tipo_tarefa'):
+            query = query.filter(Tarefa.tipo_tarefa_id == int(filters['tipo_tarefa']))
+        
+        if filters.get('colaborador'):
+            query = query.filter(Tarefa.colaborador_id == int(filters['colaborador']))
+        
+        # Produtos e serviços vêm de tarefa_item pelo índice (usuario_id, item_id)
+        for tipo in ('produto', 'servico'):
+            if filters.get(tipo):
+                query = query.filter(Tarefa.id.in_(
+                    select(TarefaItem.tarefa_id).where(
+                        TarefaItem.usuario_id == usuario_id,
+                        TarefaItem.item_id == str(filters[tipo]),
+                        TarefaItem.tipo == tipo
+                    )
+                ))
+        
+        return query
+    
+    @staticmethod
+    def _report_sort_column(sort):
+        """Retorna a expressão SQL da coluna de ordenação do relatório"""
+        if sort == 'cliente':
+            # Cliente é opcional; NULL quebraria a comparação do cursor
+            return func.coalesce(Tarefa.cliente, '')
+        return getattr(Tarefa, sort)
+    
+    @staticmethod
+    def _encode_report_cursor(sort, tarefa):
+        """Gera o cursor opaco (valor da coluna de ordenação, id) da última tarefa da página"""
+        value = (tarefa.cliente or '') if sort == 'cliente' else getattr(tarefa, sort)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([value, tarefa.id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+    
+    @staticmethod
+    def _decode_report_cursor(sort, cursor):
+        """Lê um cursor gerado por _encode_report_cursor; ValueError se for inválido"""
+        try:
+            value, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if sort == 'data':
+                value = datetime.fromisoformat(value)
+            elif sort == 'cliente':
+                if not isinstance(value, str):
+                    raise TypeError(value)
+            else:
+                # Colunas em dinheiro: o valor vai para o bind em centavos
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise TypeError(value)
+                CalculosService.para_centavos(value)
+            if isinstance(task_id, bool) or not isinstance(task_id, int):
+                raise TypeError(task_id)
+            return value, task_id
+        except (TypeError, ValueError, UnicodeError, InvalidOperation):
+            raise ValueError('Cursor inválido')
+    
+    @staticmethod
+    def _report_query(usuario_id, start_date, end_date, filters, sort, order, cursor=None):
+        """
+        Monta a consulta ordenada do relatório detalhado (ver list_tasks_page)
+        
+        Raises:
+            ValueError: Ordenação, direção ou cursor inválidos
+        """
+        if sort not in REPORT_SORT_COLUMNS:
+            raise ValueError(f'Ordenação inválida: {sort}')
+        
+        if order not in ('asc', 'desc'):
+            raise ValueError(f'Direção inválida: {order}')
+        
+        column = TarefaController._report_sort_column(sort)
+        
+        # Nomes de tipo e colaborador no mesmo SELECT, itens em um SELECT por lote;
+        # o JSON completo da tarefa não é lido (e acessá-lo levanta erro)
+        query = Tarefa.query.options(
+            joinedload(Tarefa.tipo_tarefa),
+            joinedload(Tarefa.colaborador),
+            selectinload(Tarefa.itens),
+            raiseload(Tarefa.detalhes)
+        )
+        
+        if cursor:
+            value, task_id = TarefaController._decode_report_cursor(sort, cursor)
+            key = tuple_(column, Tarefa.id)
+            query = query.filter(key > (value, task_id) if order == 'asc' else key < (value, task_id))
+            
+            # O SQLite não usa a comparação de tupla como limite do índice: ordenando
+            # por data, o próprio cursor vira o início (ou fim) do intervalo lido
+            if sort == 'data' and order == 'asc':
+                if not start_date or value >= datetime.strptime(start_date, '%Y-%m-%d'):
+                    query = query.filter(Tarefa.data >= value)
+                    start_date = None
+            elif sort == 'data':
+                if not end_date or value < datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1):
+                    query = query.filter(Tarefa.data <= value)
+                    end_date = None
+        
+        query = TarefaController.apply_task_filters(query, usuario_id, start_date, end_date, filters)
+        
+        if order == 'asc':
+            query = query.order_by(column.asc(), Tarefa.id.asc())
+        else:
+            query = query.order_by(column.desc(), Tarefa.id.desc())
+        
+        return query
+    
+    @staticmethod
+    def list_tasks_page(usuario_id, start_date=None, end_date=None, filters=None,
+                        sort='data', order='asc', cursor=None, limit=REPORT_PAGE_SIZE):
+        """
+        Retorna uma página de tarefas do relatório detalhado, paginada por cursor
+        
+        A página seguinte começa depois da chave (coluna de ordenação, id) da
+        última tarefa devolvida, então o custo de cada página não cresce com a
+        posição. Ordenando por data, a consulta percorre o índice
+        (usuario_id, data) sem ordenar em memória.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): Filtros aceitos por apply_task_filters
+            sort (str): Uma das colunas de REPORT_SORT_COLUMNS
+            order (str): 'asc' ou 'desc'
+            cursor (str, optional): next_cursor da página anterior
+            limit (int): Tarefas por página (até REPORT_MAX_PAGE_SIZE)
+            
+        Returns:
+            dict: tasks (objetos Tarefa com tipo, colaborador e itens carregados),
+                next_cursor e has_more
+                
+        Raises:
+            ValueError: Ordenação, direção ou cursor inválidos
+        """
+        limit = max(1, min(int(limit), REPORT_MAX_PAGE_SIZE))
+        query = TarefaController._report_query(usuario_id, start_date, end_date, filters, sort, order, cursor)
+        
+        # Uma tarefa a mais indica se existe próxima página
+        tarefas = query.limit(limit + 1).all()
+        has_more = len(tarefas) > limit
+        tarefas = tarefas[:limit]
+        
+        return {
+            'tasks': tarefas,
+            'next_cursor': TarefaController._encode_report_cursor(sort, tarefas[-1]) if has_more else None,
+            'has_more': has_more
+        }
+    
+    @staticmethod
+    def iter_tasks(usuario_id, start_date=None, end_date=None, filters=None,
+                   sort='data', order='asc', batch_size=REPORT_STREAM_BATCH_SIZE):
+        """
+        Percorre todas as tarefas do relatório buscando-as em lotes do banco
+        
+        A consulta é validada e montada na chamada; as linhas chegam do cursor
+        do banco em lotes de batch_size (yield_per), então a memória não cresce
+        com o tamanho do período.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): Filtros aceitos por apply_task_filters
+            sort (str): Uma das colunas de REPORT_SORT_COLUMNS
+            order (str): 'asc' ou 'desc'
+            batch_size (int): Tarefas lidas por lote
+            
+        Returns:
+            Iterável de objetos Tarefa com tipo, colaborador e itens carregados
+            
+        Raises:
+            ValueError: Ordenação ou direção inválidas
+        """
+        query = TarefaController._report_query(usuario_id, start_date, end_date, filters, sort, order)
+        return query.yield_per(batch_size)
+    
+    @staticmethod
+    def load_item_names(usuario_id):
+        """
+        Carrega os nomes de produtos e serviços do usuário para descrever as tarefas
+        
+        Args:
+            usuario_id (int): ID do usuário
+            
+        Returns:
+            dict: Nome por (tipo, item_id), com tipo 'produto' ou 'servico'
+        """
+        nomes = {
+            ('produto', row.id): row.nome
+            for row in db.session.query(Produto.id, Produto.nome).filter_by(usuario_id=usuario_id)
+        }
+        nomes.update({
+            ('servico', row.id): row.nome
+            for row in db.session.query(Servico.id, Servico.nome).filter_by(usuario_id=usuario_id)
+        })
+        
+        return nomes
+    
+    @staticmethod
+    def describe_task_items(tarefa, nomes):
+        """
+        Descreve os produtos e serviços da tarefa em uma linha de texto
+        
+        Usa as linhas de tarefa_item (carregadas com a tarefa pelo relatório),
+        sem decodificar o JSON da tarefa original.
+        
+        Args:
+            tarefa (Tarefa): Tarefa gravada
+            nomes (dict): Nomes por (tipo, item_id), de load_item_names
+            
+        Returns:
+            str: "Produtos: ... | Serviços: ..." ou string vazia se não houver itens
+        """
+        itens = sorted(tarefa.itens, key=lambda item: item.id)
+        produto_nomes = [
+            nomes.get(('produto', item.item_id)) or f"Produto {item.item_id}"
+            for item in itens if item.tipo == 'produto'
+        ]
+        servico_nomes = [
+            nomes.get(('servico', item.item_id)) or f"Serviço {item.item_id}"
+            for item in itens if item.tipo == 'servico'
+        ]
+        
+        partes = []
+        if produto_nomes:
+            partes.append("Produtos: " + ", ".join(produto_nomes))
+        
+        if servico_nomes:
+            partes.append("Serviços: " + ", ".join(servico_nomes))
+        
+        return " | ".join(partes)
+    
+    @staticmethod
+    def count_tasks(usuario_id, start_date=None, end_date=None, filters=None):
+        """
+        Conta as tarefas do período com os filtros do relatório
+        
+        Sem filtro de produto ou serviço a contagem vem do resumo diário;
+        caso contrário, de um COUNT coberto pelos índices de tarefa e tarefa_item.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): Filtros aceitos por apply_task_filters
+            
+        Returns:
+            int: Quantidade de tarefas
+        """
+        filters = filters or {}
+        if not filters.get('produto') and not filters.get('servico'):
+            return ResumoDiarioController.aggregate_totals(usuario_id, start_date, end_date, filters)['quantidade_tarefas']
+        
+        query = db.session.query(func.count(Tarefa.id))
+        return TarefaController.apply_task_filters(query, usuario_id, start_date, end_date, filters).scalar()
+    
+    @staticmethod
+    def aggregate_financial_totals(usuario_id, start_date=None, end_date=None, filters=None):
+        """
+        Soma faturamento, custo e lucro das tarefas com uma única consulta agregada
+        
+        Sem filtro de produto ou serviço a soma sai do resumo diário
+        (ResumoDiario), que já tem os totais por dia, tipo e colaborador. Os
+        filtros de produto e serviço dependem dos itens de cada tarefa e por
+        isso consultam a tabela de tarefas.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD), inclusiva
+            filters (dict, optional): Filtros aceitos por apply_task_filters
+            
+        Returns:
+            dict: quantidade_tarefas e os totais faturamento_total, faturamento_produto,
+                faturamento_servico, custo_produto, lucro_produto, lucro_servico e lucro_total
+        """
+        filters = filters or {}
+        if not filters.get('produto') and not filters.get('servico'):
+            return ResumoDiarioController.aggregate_totals(usuario_id, start_date, end_date, filters)
+        
+        # Somas em centavos das colunas de cada tarefa (convertidas para reais pelo tipo Dinheiro)
+        query = db.session.query(
+            func.count(Tarefa.id),
+            func.coalesce(func.sum(Tarefa.valor_produtos), 0),
+            func.coalesce(func.sum(Tarefa.valor_servicos), 0),
+            func.coalesce(func.sum(Tarefa.custo_total), 0)
+        )
+        quantidade, faturamento_produto, faturamento_servico, custo_produto = TarefaController.apply_task_filters(
+            query, usuario_id, start_date, end_date, filters
+        ).one()
+        
+        totais = CalculosService.calcular_todos_os_valores(faturamento_produto, faturamento_servico, custo_produto)
+        return dict(totais['valores'], quantidade_tarefas=quantidade)
+    
+    @staticmethod
+    def _calculate_percentages(faturamento_total, faturamento_produto, faturamento_servico,
+                               lucro_total, lucro_produto, lucro_servico):
+        """
+        Calcula as porcentagens de produto/serviço e a margem de lucro
+        
+        Returns:
+            dict: faturamento_produto, faturamento_servico, lucro_produto,
+                lucro_servico e lucro_faturamento, em porcentagem
+        """
+        return CalculosService.calcular_porcentagens({
+            'faturamento_total': faturamento_total,
+            'faturamento_produto': faturamento_produto,
+            'faturamento_servico': faturamento_servico,
+            'lucro_total': lucro_total,
+            'lucro_produto': lucro_produto,
+            'lucro_servico': lucro_servico
+        })
+    
+    @staticmethod
+    def _load_sync_lookups(usuario_id):
+        """
+        Carrega os cadastros do usuário usados no processamento das tarefas
+        
+        Args:
+            usuario_id (int): ID do usuário
+            
+        Returns:
+            dict: IDs de tipos de tarefa, IDs de colaboradores e custo unitário por produto
+        """
+        tipos_tarefa = {
+            row.id for row in db.session.query(TipoTarefa.id).filter_by(usuario_id=usuario_id)
+        }
+        colaboradores = {
+            row.id for row in db.session.query(Colaborador.id).filter_by(usuario_id=usuario_id)
+        }
+        produtos = {
+            row.id: row.custo_unitario
+            for row in db.session.query(Produto.id, Produto.custo_unitario).filter_by(usuario_id=usuario_id)
+        }
+        
+        logger.debug(f"📚 Cadastros carregados: {len(tipos_tarefa)} tipos, {len(colaboradores)} colaboradores, {len(produtos)} produtos")
+        
+        return {
+            'tipos_tarefa': tipos_tarefa,
+            'colaboradores': colaboradores,
+            'produtos': produtos
+        }
+    
+    @staticmethod
+    def _ensure_default_task_type(usuario_id, lookups):
+        """
+        Garante que o tipo de tarefa padrão (ID 0) exista para o usuário
+        
+        Args:
+            usuario_id (int): ID do usuário
+            lookups (dict): Cadastros carregados por _load_sync_lookups
+        """
+        if 0 in lookups['tipos_tarefa']:
+            return
+        
+        tipo_padrao = TipoTarefa(
+            id=0,
+            usuario_id=usuario_id,
+            descricao="Tarefa Geral"
+        )
+        db.session.add(tipo_padrao)
+        db.session.flush()
+        lookups['tipos_tarefa'].add(0)
+        logger.debug(f"✅ Tipo de tarefa padrão criado: ID=0, Descrição='Tarefa Geral'")
+    
+    @staticmethod
+    def _build_task_rows(tasks_list, usuario_id, lookups):
+        """
+        Converte as tarefas da API em linhas da tabela tarefa, sem consultar o banco
+        
+        Args:
+            tasks_list (list): Lista de tarefas da API
+            usuario_id (int): ID do usuário
+            lookups (dict): Cadastros carregados por _load_sync_lookups
+            
+        Returns:
+            dict: Linhas prontas para gravação, itens e detalhes (tarefa original
+                e cálculos) de cada tarefa por ID, contadores de erro e totais gerais
+        """
+        rows = {}
+        items = {}
+        details = {}
+        sums = {}
+        error_tasks = 0
+        errors = []
+        
+        produtos_custo = lookups['produtos']
+        para_centavos = CalculosService.para_centavos
+        
+        for i, task_data in enumerate(tasks_list):
+            try:
+                # Debug: Mostra a estrutura da primeira tarefa para análise
+                if i == 0:
+                    logger.debug(f"🔍 Estrutura da primeira tarefa: {list(task_data.keys())}")
+                
+                # Extrai dados da tarefa - tenta diferentes possíveis nomes para o ID
+                task_id = task_data.get('taskId') or task_data.get('id') or task_data.get('taskID') or task_data.get('ID')
+                user_to_id = task_data.get('idUserTo') or task_data.get('userToId') or task_data.get('userId')
+                customer_description = task_data.get('customerDescription', '') or task_data.get('customer', '') or task_data.get('customerName', '')
+                task_type_id = task_data.get('taskType') or task_data.get('taskTypeId') or task_data.get('typeId')
+                task_date_str = task_data.get('taskDate', '') or task_data.get('date', '') or task_data.get('dateTime', '')
+                
+                if not task_id:
+                    logger.warning(f"⚠️ Tarefa sem ID ignorada. Chaves disponíveis: {list(task_data.keys())}")
+                    error_tasks += 1
+                    continue
+                
+                # Tipo de tarefa desconhecido ou ausente usa o tipo padrão (ID 0)
+                if task_type_id is None or task_type_id not in lookups['tipos_tarefa']:
+                    if task_type_id:
+                        logger.warning(f"⚠️ Tipo de tarefa {task_type_id} não encontrado no banco. Usando tipo padrão.")
+                    task_type_id = 0
+                    TarefaController._ensure_default_task_type(usuario_id, lookups)
+                
+                # Verifica se colaborador existe no banco
+                if not user_to_id:
+                    logger.warning(f"⚠️ Tarefa {task_id} sem colaborador definido. Tarefa será ignorada.")
+                    error_tasks += 1
+                    errors.append(f"Tarefa {task_id}: sem colaborador definido")
+                    continue
+                
+                if user_to_id not in lookups['colaboradores']:
+                    logger.warning(f"⚠️ Colaborador {user_to_id} não encontrado no banco. Tarefa será ignorada.")
+                    error_tasks += 1
+                    errors.append(f"Tarefa {task_id}: colaborador {user_to_id} não encontrado")
+                    continue
+                
+                # Parse da data
+                try:
+                    task_date = datetime.fromisoformat(task_date_str.replace('Z', '+00:00'))
+                except ValueError:
+                    logger.warning(f"⚠️ Data inválida na tarefa {task_id}: {task_date_str}")
+                    task_date = datetime.now()
+                
+                # Linhas de produto e serviço da tarefa
+                task_items = TarefaController._build_task_items(task_id, usuario_id, task_data, produtos_custo)
+                
+                # Somas de faturamento e custo da tarefa em centavos; o restante sai do cálculo em lote
+                faturamento_produto_tarefa = 0
+                custo_produto_tarefa = 0
+                faturamento_servico_tarefa = 0
+                
+                for item in task_items:
+                    if item['tipo'] == 'produto':
+                        faturamento_produto_tarefa += para_centavos(item['faturamento'])
+                        custo_produto_tarefa += para_centavos(item['custo'])
+                    else:
+                        faturamento_servico_tarefa += para_centavos(item['faturamento'])
+                
+                # Tarefas repetidas na lista: prevalece a última ocorrência
+                rows.pop(task_id, None)
+                sums.pop(task_id, None)
+                items[task_id] = task_items
+                details[task_id] = {'task_original': task_data}
+                sums[task_id] = (faturamento_produto_tarefa, faturamento_servico_tarefa, custo_produto_tarefa)
+                
+                rows[task_id] = {
+                    'id': task_id,
+                    'usuario_id': usuario_id,
+                    'data': task_date,
+                    'cliente': customer_description,
+                    'tipo_tarefa_id': task_type_id,
+                    'colaborador_id': user_to_id
+                }
+                
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar tarefa {i+1}: {str(e)}")
+                error_tasks += 1
+                errors.append(f"Tarefa {i+1}: {str(e)}")
+                continue
+        
+        # Valores de cada tarefa e totais gerais em uma única chamada, somados em centavos
+        faturamento_produto, faturamento_servico, custo_produto = zip(*sums.values()) if sums else ((), (), ())
+        lote = CalculosService.calcular_lote_centavos(faturamento_produto, faturamento_servico, custo_produto)
+        
+        for row, calculos in zip(rows.values(), lote['tarefas']):
+            calculos = CalculosService.valores_em_reais(calculos)
+            row['valor_total'] = calculos['faturamento_total']
+            row['custo_total'] = calculos['custo_produto']
+            row['lucro_bruto'] = calculos['lucro_total']
+            row['valor_produtos'] = calculos['faturamento_produto']
+            row['valor_servicos'] = calculos['faturamento_servico']
+            details[row['id']]['calculos'] = calculos
+        
+        return {
+            'rows': list(rows.values()),
+            'items': items,
+            'details': details,
+            'errors': error_tasks,
+            'error_details': errors,
+            'totals': CalculosService.valores_em_reais(lote['total']['valores'])
+        }
+    
+    @staticmethod
+    def _build_task_items(task_id, usuario_id, task_data, produtos_custo):
+        """
+        Converte as listas de produtos e serviços da tarefa em linhas de tarefa_item
+        
+        Produtos fora do cadastro do usuário são ignorados, como no cálculo da
+        tarefa. O custo do produto é o custo unitário no momento da sincronização.
+        
+        Args:
+            task_id (int): ID da tarefa
+            usuario_id (int): ID do usuário
+            task_data (dict): Tarefa no formato da API
+            produtos_custo (dict): Custo unitário por ID de produto
+            
+        Returns:
+            list: Linhas de tarefa_item
+        """
+        task_items = []
+        
+        for produto_data in task_data.get('products', []):
+            produto_id = produto_data.get('productId')
+            
+            if produto_id not in produtos_custo:
+                logger.warning(f"⚠️ Produto {produto_id} não encontrado no banco")
+                continue
+            
+            quantidade = float(produto_data.get('quantity', 0))
+            task_items.append({
+                'tarefa_id': task_id,
+                'usuario_id': usuario_id,
+                'tipo': 'produto',
+                'item_id': str(produto_id),
+                'quantidade': quantidade,
+                'faturamento': float(produto_data.get('totalValue', 0)),
+                'custo': (produtos_custo[produto_id] or 0.0) * quantidade
+            })
+        
+        for servico_data in task_data.get('services', []):
+            task_items.append({
+                'tarefa_id': task_id,
+                'usuario_id': usuario_id,
+                'tipo': 'servico',
+                'item_id': str(servico_data.get('id')),
+                'quantidade': float(servico_data.get('quantity', 1) or 1),
+                'faturamento': float(servico_data.get('totalValue', 0)),
+                'custo': 0.0
+            })
+        
+        return task_items
+    
+    @staticmethod
+    def _replace_task_items(items, task_ids, chunk_size=TASKS_UPSERT_CHUNK_SIZE):
+        """
+        Substitui os itens das tarefas gravadas (DELETE + INSERT em lote, sem commit)
+        
+        Args:
+            items (dict): Itens por ID de tarefa, como em _build_task_rows
+            task_ids (list): IDs das tarefas efetivamente gravadas
+            chunk_size (int): Quantidade de tarefas por instrução
+        """
+        for offset in range(0, len(task_ids), chunk_size):
+            chunk = task_ids[offset:offset + chunk_size]
+            
+            db.session.execute(delete(TarefaItem).where(TarefaItem.tarefa_id.in_(chunk)))
+            
+            chunk_items = [item for task_id in chunk for item in items.get(task_id, [])]
+            if chunk_items:
+                db.session.execute(insert(TarefaItem), chunk_items)
+    
+    @staticmethod
+    def rebuild_task_items(usuario_id, chunk_size=TASKS_UPSERT_CHUNK_SIZE):
+        """
+        Recria tarefa_item a partir da tarefa original guardada em tarefa_detalhes (sem commit)
+        
+        Usado para preencher os itens de tarefas gravadas antes da tabela
+        existir; o custo dos produtos é o do cadastro atual.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            chunk_size (int): Quantidade de tarefas por lote
+            
+        Returns:
+            int: Quantidade de tarefas processadas
+        """
+        produtos_custo = TarefaController._load_sync_lookups(usuario_id)['produtos']
+        task_ids = [row.id for row in db.session.query(Tarefa.id).filter_by(usuario_id=usuario_id)]
+        
+        for offset in range(0, len(task_ids), chunk_size):
+            chunk = task_ids[offset:offset + chunk_size]
+            items = {
+                row.tarefa_id: TarefaController._build_task_items(
+                    row.tarefa_id, usuario_id, (row.dados or {}).get('task_original', {}), produtos_custo
+                )
+                for row in db.session.query(TarefaDetalhes.tarefa_id, TarefaDetalhes.dados)
+                .filter(TarefaDetalhes.tarefa_id.in_(chunk))
+            }
+            TarefaController._replace_task_items(items, chunk, chunk_size)
+        
+        return len(task_ids)
+    
+    @staticmethod
+    def backfill_task_totals(usuario_id, chunk_size=TASKS_UPSERT_CHUNK_SIZE):
+        """
+        Preenche valor_produtos e valor_servicos a partir dos cálculos guardados em tarefa_detalhes (sem commit)
+        
+        Usado para tarefas gravadas antes das colunas existirem.
+        
+        Args:
+            usuario_id (int): ID do usuário
+            chunk_size (int): Quantidade de tarefas por lote
+            
+        Returns:
+            int: Quantidade de tarefas atualizadas
+        """
+        task_ids = [row.id for row in db.session.query(Tarefa.id).filter_by(usuario_id=usuario_id)]
+        total = 0
+        
+        for offset in range(0, len(task_ids), chunk_size):
+            chunk = task_ids[offset:offset + chunk_size]
+            values = [
+                {
+                    'id': row.tarefa_id,
+                    'valor_produtos': row.dados['calculos'].get('faturamento_produto', 0.0),
+                    'valor_servicos': row.dados['calculos'].get('faturamento_servico', 0.0)
+                }
+                for row in db.session.query(TarefaDetalhes.tarefa_id, TarefaDetalhes.dados)
+                .filter(TarefaDetalhes.tarefa_id.in_(chunk))
+                if (row.dados or {}).get('calculos')
+            ]
+            
+            # UPDATE em lote pela chave primária
+            if values:
+                db.session.execute(update(Tarefa), values)
+            total += len(values)
+        
+        return total
+    
+    @staticmethod
+    def _upsert(table, key, columns, where=None, dialect=None):
+        """
+        Monta o INSERT que atualiza as linhas já existentes, no dialeto do banco atual
+        
+        SQLite e PostgreSQL usam ON CONFLICT (key) DO UPDATE ... WHERE. O
+        MySQL usa ON DUPLICATE KEY UPDATE, que não aceita WHERE: cada coluna
+        recebe CASE WHEN where THEN novo valor ELSE valor atual (where não
+        pode ler colunas atualizadas, que o MySQL atribui em ordem).
+        
+        Args:
+            table (Table): Tabela a inserir
+            key (Column): Chave primária usada para detectar o conflito
+            columns (iterable): Nomes das colunas atualizadas no conflito
+            where (ColumnElement, optional): Condição para atualizar a linha existente
+            dialect (str, optional): Dialeto; por padrão, o do banco da sessão
+            
+        Raises:
+            NotImplementedError: Banco sem upsert suportado
+        """
+        dialect = dialect or db.session.get_bind().dialect.name
+        
+        if dialect == 'mysql':
+            stmt = mysql.insert(table)
+            return stmt.on_duplicate_key_update({
+                column: stmt.inserted[column] if where is None
+                else case((where, stmt.inserted[column]), else_=table.c[column])
+                for column in columns
+            })
+        
+        if dialect not in UPSERT_INSERTS:
+            raise NotImplementedError(f'Upsert de tarefas não suportado no banco {dialect}')
+        
+        stmt = UPSERT_INSERTS[dialect](table)
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={column: stmt.excluded[column] for column in columns},
+            where=where
+        )
+    
+    @staticmethod
+    def _upsert_task_details(details, task_ids, chunk_size=TASKS_UPSERT_CHUNK_SIZE):
+        """
+        Grava o JSON comprimido das tarefas em tarefa_detalhes (INSERT ... ON CONFLICT, sem commit)
+        
+        Args:
+            details (dict): Detalhes por ID de tarefa, como em _build_task_rows
+            task_ids (list): IDs das tarefas efetivamente gravadas
+            chunk_size (int): Quantidade de tarefas por instrução
+        """
+        for offset in range(0, len(task_ids), chunk_size):
+            chunk = [
+                {'tarefa_id': task_id, 'dados': details[task_id]}
+                for task_id in task_ids[offset:offset + chunk_size]
+            ]
+            
+            stmt = TarefaController._upsert(TarefaDetalhes.__table__, TarefaDetalhes.tarefa_id, ['dados'])
+            db.session.execute(stmt, chunk)
+    
+    @staticmethod
+    def _bulk_upsert_tasks(rows, usuario_id, chunk_size=TASKS_UPSERT_CHUNK_SIZE):
+        """
+        Grava as tarefas em lotes com INSERT ... ON CONFLICT DO UPDATE
+        
+        Tarefas cujo ID já pertence a outro usuário não são sobrescritas.
+        O commit fica a cargo do chamador.
+        
+        Args:
+            rows (list): Linhas montadas por _build_task_rows
+            usuario_id (int): ID do usuário
+            chunk_size (int): Quantidade de tarefas por instrução INSERT
+            
+        Returns:
+            dict: Quantidade de tarefas novas, atualizadas e com erro, os dias
+                (antigos e novos) e os IDs das tarefas gravadas
+        """
+        saved = 0
+        updated = 0
+        errors = 0
+        days = set()
+        written_ids = []
+        
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset:offset + chunk_size]
+            
+            # Uma única consulta por lote para separar novas de atualizadas
+            existing = {
+                row.id: row for row in
+                db.session.query(Tarefa.id, Tarefa.usuario_id, Tarefa.data)
+                .filter(Tarefa.id.in_([row['id'] for row in chunk]))
+            }
+            owners = {task_id: row.usuario_id for task_id, row in existing.items()}
+            
+            foreign = [row for row in chunk if owners.get(row['id'], usuario_id) != usuario_id]
+            if foreign:
+                logger.warning(f"⚠️ {len(foreign)} tarefa(s) pertencem a outro usuário e foram ignoradas")
+                errors += len(foreign)
+                chunk = [row for row in chunk if owners.get(row['id'], usuario_id) == usuario_id]
+            
+            if not chunk:
+                continue
+            
+            # Uma tarefa atualizada pode ter mudado de dia: os dois dias mudam no resumo
+            for row in chunk:
+                days.add(row['data'].date())
+                if row['id'] in existing:
+                    days.add(existing[row['id']].data.date())
+            
+            # Instrução única executada para todas as linhas do lote (executemany):
+            # compilada uma vez e reaproveitada do cache nos lotes seguintes
+            stmt = TarefaController._upsert(
+                Tarefa.__table__, Tarefa.id, TASK_UPSERT_COLUMNS, where=(Tarefa.usuario_id == usuario_id)
+            )
+            db.session.execute(stmt, chunk)
+            
+            chunk_updated = sum(1 for row in chunk if row['id'] in owners)
+            updated += chunk_updated
+            saved += len(chunk) - chunk_updated
+            written_ids.extend(row['id'] for row in chunk)
+        
+        return {
+            'saved': saved,
+            'updated': updated,
+            'errors': errors,
+            'days': days,
+            'ids': written_ids
+        }
+    
     @staticmethod
     def _calculate_and_save_financial_data(usuario_id, start_date, end_date, 
                                          faturamento_total, faturamento_produto, faturamento_servico,
@@ -506,11 +1531,15 @@ class TarefaController:
             agora = datetime.now()
             
             # Calcula porcentagens
-            porc_faturamento_produto = (faturamento_produto / faturamento_total * 100) if faturamento_total > 0 else 0
-            porc_faturamento_servico = (faturamento_servico / faturamento_total * 100) if faturamento_total > 0 else 0
-            porc_lucro_produto = (lucro_produto / lucro_total * 100) if lucro_total > 0 else 0
-            porc_lucro_servico = (lucro_servico / lucro_total * 100) if lucro_total > 0 else 0
-            porc_lucro_faturamento = (lucro_total / faturamento_total * 100) if faturamento_total > 0 else 0
+            porcentagens = TarefaController._calculate_percentages(
+                faturamento_total, faturamento_produto, faturamento_servico,
+                lucro_total, lucro_produto, lucro_servico
+            )
+            porc_faturamento_produto = porcentagens['faturamento_produto']
+            porc_faturamento_servico = porcentagens['faturamento_servico']
+            porc_lucro_produto = porcentagens['lucro_produto']
+            porc_lucro_servico = porcentagens['lucro_servico']
+            porc_lucro_faturamento = porcentagens['lucro_faturamento']
             
             logger.debug(f"📊 Calculando porcentagens:")
             logger.debug(f"   Faturamento Produto: {porc_faturamento_produto:.2f}%")
@@ -665,14 +1694,18 @@ class TarefaController:
             return {'error': str(e)}
     
     @staticmethod
-    def get_financial_summary(user_id, start_date=None, end_date=None):
+    def get_financial_summary(user_id, start_date=None, end_date=None, filters=None):
         """
         Busca resumo financeiro do usuário para um período
         
+        Os totais são calculados direto das tarefas gravadas, então qualquer
+        período e combinação de filtros é respondido sem nova sincronização.
+        
         Args:
             user_id (int): ID do usuário
             start_date (str, optional): Data inicial
             end_date (str, optional): Data final
+            filters (dict, optional): tipo_tarefa, colaborador, produto e servico
             
         Returns:
             dict: Resumo financeiro completo
@@ -686,45 +1719,13 @@ class TarefaController:
             if not end_date:
                 end_date = datetime.now().strftime('%Y-%m-%d')
             
-            periodo_inicio = datetime.strptime(start_date, '%Y-%m-%d')
-            periodo_fim = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            # Busca dados financeiros
-            faturamento_total = FaturamentoTotal.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
-            
-            faturamento_produto = FaturamentoProduto.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
+            # Soma os valores das tarefas em uma única consulta
+            totals = TarefaController.aggregate_financial_totals(user_id, start_date, end_date, filters)
             
-            faturamento_servico = FaturamentoServico.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
-            
-            lucro_total = LucroTotal.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
-            
-            lucro_produto = LucroProduto.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
-            
-            lucro_servico = LucroServico.query.filter_by(
-                usuario_id=user_id,
-                periodo_inicio=periodo_inicio,
-                periodo_fim=periodo_fim
-            ).first()
+            porcentagens = TarefaController._calculate_percentages(
+                totals['faturamento_total'], totals['faturamento_produto'], totals['faturamento_servico'],
+                totals['lucro_total'], totals['lucro_produto'], totals['lucro_servico']
+            )
             
             # Monta resumo
             summary = {
@@ -732,20 +1733,21 @@ class TarefaController:
                     'inicio': start_date,
                     'fim': end_date
                 },
+                'quantidade_tarefas': totals['quantidade_tarefas'],
                 'faturamento': {
-                    'total': faturamento_total.valor_total if faturamento_total else 0,
-                    'produto': faturamento_produto.valor_produtos if faturamento_produto else 0,
-                    'servico': faturamento_servico.valor_servicos if faturamento_servico else 0,
-                    'porcentagem_produto': faturamento_produto.perc_relacao_total if faturamento_produto else 0,
-                    'porcentagem_servico': faturamento_servico.perc_relacao_total if faturamento_servico else 0
+                    'total': totals['faturamento_total'],
+                    'produto': totals['faturamento_produto'],
+                    'servico': totals['faturamento_servico'],
+                    'porcentagem_produto': porcentagens['faturamento_produto'],
+                    'porcentagem_servico': porcentagens['faturamento_servico']
                 },
                 'lucro': {
-                    'total': lucro_total.lucro_total if lucro_total else 0,
-                    'produto': lucro_produto.lucro_produtos if lucro_produto else 0,
-                    'servico': lucro_servico.lucro_servicos if lucro_servico else 0,
-                    'porcentagem_produto': lucro_produto.perc_relacao_lucro if lucro_produto else 0,
-                    'porcentagem_servico': lucro_servico.perc_relacao_lucro if lucro_servico else 0,
-                    'margem_lucro': lucro_total.margem_lucro if lucro_total else 0
+                    'total': totals['lucro_total'],
+                    'produto': totals['lucro_produto'],
+                    'servico': totals['lucro_servico'],
+                    'porcentagem_produto': porcentagens['lucro_produto'],
+                    'porcentagem_servico': porcentagens['lucro_servico'],
+                    'margem_lucro': porcentagens['lucro_faturamento']
                 }
             }
             
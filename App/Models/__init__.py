@@ -2,9 +2,12 @@
 
 from .user import Usuario
 from .itens import TipoTarefa, Colaborador, Produto, Servico
-from .tarefa import Tarefa
+from .tarefa import Tarefa, TarefaDetalhes, TarefaItem
 from .faturamento import FaturamentoTotal, FaturamentoProduto, FaturamentoServico
 from .lucro import LucroTotal, LucroProduto, LucroServico
+from .sincronizacao import CheckpointSincronizacao, CoberturaTarefas, PaginacaoTarefas
+from .resumo_diario import ResumoDiario
+from .tipos import Dinheiro, JsonComprimido
 
 __all__ = [
     # User models
@@ -16,8 +19,10 @@ __all__ = [
     'Produto',
     'Servico',
     
-    # Tarefa model
+    # Tarefa models
     'Tarefa',
+    'TarefaDetalhes',
+    'TarefaItem',
     
     # Faturamento models
     'FaturamentoTotal',
@@ -28,4 +33,16 @@ __all__ = [
     'LucroTotal',
     'LucroProduto',
     'LucroServico',
+    
+    # Sincronização models
+    'CheckpointSincronizacao',
+    'CoberturaTarefas',
+    'PaginacaoTarefas',
+    
+    # Resumo diário model
+    'ResumoDiario',
+    
+    # Tipos de coluna
+    'Dinheiro',
+    'JsonComprimido',
 ]
@@ -3,6 +3,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from .. import db
+from .tipos import Dinheiro
 
 
 class FaturamentoTotal(db.Model):
@@ -11,7 +12,7 @@ class FaturamentoTotal(db.Model):
     usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio   = Column(DateTime, nullable=False)
     periodo_fim      = Column(DateTime, nullable=False)
-    valor_total      = Column(Float, nullable=False)
+    valor_total      = Column(Dinheiro, nullable=False)
     atualizado_em    = Column(DateTime, nullable=False)
 
     usuario          = relationship("Usuario", backref="faturamentos_totais")
@@ -26,7 +27,7 @@ class FaturamentoProduto(db.Model):
     usuario_id            = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio        = Column(DateTime, nullable=False)
     periodo_fim           = Column(DateTime, nullable=False)
-    valor_produtos        = Column(Float, nullable=False)
+    valor_produtos        = Column(Dinheiro, nullable=False)
     perc_relacao_total    = Column(Float, nullable=False)  # % do faturamento total
 
     usuario               = relationship("Usuario", backref="faturamentos_produto")
@@ -41,7 +42,7 @@ class FaturamentoServico(db.Model):
     usuario_id            = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio        = Column(DateTime, nullable=False)
     periodo_fim           = Column(DateTime, nullable=False)
-    valor_servicos        = Column(Float, nullable=False)
+    valor_servicos        = Column(Dinheiro, nullable=False)
     perc_relacao_total    = Column(Float, nullable=False)
 
     usuario               = relationship("Usuario", backref="faturamentos_servico")
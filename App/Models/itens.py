@@ -1,8 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, ForeignKey
+    Column, Integer, String, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from .. import db
+from .tipos import Dinheiro
+from ..services.calculos import ESCALA_PRECO_UNITARIO
 
 
 class TipoTarefa(db.Model):
@@ -13,6 +15,10 @@ class TipoTarefa(db.Model):
     
     usuario    = relationship("Usuario", backref="tipos_tarefa")
 
+    __table_args__ = (
+        Index('ix_tipo_tarefa_usuario', 'usuario_id'),    # catálogo do usuário
+    )
+
     def __repr__(self):
         return f"<TipoTarefa(id={self.id}, usuario_id={self.usuario_id}, descricao={self.descricao})>"
 
@@ -25,6 +31,10 @@ class Colaborador(db.Model):
     
     usuario    = relationship("Usuario", backref="colaboradores")
 
+    __table_args__ = (
+        Index('ix_colaborador_usuario', 'usuario_id'),    # catálogo do usuário
+    )
+
     def __repr__(self):
         return f"<Colaborador(id={self.id}, usuario_id={self.usuario_id}, nome={self.nome})>"
 
@@ -34,11 +44,15 @@ class Produto(db.Model):
     id               = Column(String, primary_key=True)  # productId (UUID) da API
     usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     nome             = Column(String, nullable=False)
-    custo_unitario   = Column(Float, nullable=False)     # unitaryCost
-    preco_unitario   = Column(Float, nullable=True)      # se disponível
+    custo_unitario   = Column(Dinheiro(ESCALA_PRECO_UNITARIO), nullable=False)  # unitaryCost
+    preco_unitario   = Column(Dinheiro(ESCALA_PRECO_UNITARIO), nullable=True)   # se disponível
     
     usuario          = relationship("Usuario", backref="produtos")
 
+    __table_args__ = (
+        Index('ix_produto_usuario', 'usuario_id'),    # catálogo do usuário
+    )
+
     def __repr__(self):
         return f"<Produto(id={self.id}, usuario_id={self.usuario_id}, nome={self.nome})>"
 
@@ -48,9 +62,13 @@ class Servico(db.Model):
     id               = Column(String, primary_key=True)  # serviceId (UUID) da API
     usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     nome             = Column(String, nullable=False)
-    custo_unitario   = Column(Float, nullable=True)      # se a API fornecer custo de serviço
+    custo_unitario   = Column(Dinheiro(ESCALA_PRECO_UNITARIO), nullable=True)   # se a API fornecer custo de serviço
     
     usuario          = relationship("Usuario", backref="servicos")
 
+    __table_args__ = (
+        Index('ix_servico_usuario', 'usuario_id'),    # catálogo do usuário
+    )
+
     def __repr__(self):
         return f"<Servico(id={self.id}, usuario_id={self.usuario_id}, nome={self.nome})>"
@@ -3,6 +3,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from .. import db
+from .tipos import Dinheiro
 
 
 class LucroTotal(db.Model):
@@ -11,7 +12,7 @@ class LucroTotal(db.Model):
     usuario_id         = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio     = Column(DateTime, nullable=False)
     periodo_fim        = Column(DateTime, nullable=False)
-    lucro_total        = Column(Float, nullable=False)
+    lucro_total        = Column(Dinheiro, nullable=False)
     margem_lucro       = Column(Float, nullable=False)  # % de lucro sobre faturamento_total
 
     usuario            = relationship("Usuario", backref="lucros_totais")
@@ -26,7 +27,7 @@ class LucroProduto(db.Model):
     usuario_id              = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio          = Column(DateTime, nullable=False)
     periodo_fim             = Column(DateTime, nullable=False)
-    lucro_produtos          = Column(Float, nullable=False)
+    lucro_produtos          = Column(Dinheiro, nullable=False)
     perc_relacao_lucro      = Column(Float, nullable=False)  # % do lucro total
 
     usuario                 = relationship("Usuario", backref="lucros_produto")
@@ -41,7 +42,7 @@ class LucroServico(db.Model):
     usuario_id              = Column(Integer, ForeignKey('usuario.id'), nullable=False)
     periodo_inicio          = Column(DateTime, nullable=False)
     periodo_fim             = Column(DateTime, nullable=False)
-    lucro_servicos          = Column(Float, nullable=False)
+    lucro_servicos          = Column(Dinheiro, nullable=False)
     perc_relacao_lucro      = Column(Float, nullable=False)
 
     usuario                 = relationship("Usuario", backref="lucros_servico")
@@ -0,0 +1,23 @@
+from sqlalchemy import (
+    Column, Integer, Date, ForeignKey
+)
+from sqlalchemy.orm import relationship
+from .. import db
+from .tipos import Dinheiro
+
+
+class ResumoDiario(db.Model):
+    __tablename__ = 'resumo_diario'
+    usuario_id           = Column(Integer, ForeignKey('usuario.id'), primary_key=True)
+    dia                  = Column(Date, primary_key=True)
+    tipo_tarefa_id       = Column(Integer, primary_key=True)
+    colaborador_id       = Column(Integer, primary_key=True)
+    quantidade_tarefas   = Column(Integer, nullable=False)
+    faturamento_produto  = Column(Dinheiro, nullable=False)
+    faturamento_servico  = Column(Dinheiro, nullable=False)
+    custo_produto        = Column(Dinheiro, nullable=False)
+
+    usuario              = relationship("Usuario", backref="resumos_diarios")
+
+    def __repr__(self):
+        return f"<ResumoDiario(user={self.usuario_id}, dia={self.dia}, tipo={self.tipo_tarefa_id}, colaborador={self.colaborador_id}, tarefas={self.quantidade_tarefas})>"
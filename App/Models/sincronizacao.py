@@ -0,0 +1,60 @@
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, Index
+)
+from sqlalchemy.orm import relationship
+from .. import db
+
+
+class CheckpointSincronizacao(db.Model):
+    __tablename__ = 'checkpoint_sincronizacao'
+    id               = Column(Integer, primary_key=True, autoincrement=True)
+    usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
+    entidade         = Column(String, nullable=False)     # produtos, servicos, colaboradores, tipos_tarefa
+    sincronizado_em  = Column(DateTime, nullable=False)
+
+    usuario          = relationship("Usuario", backref="checkpoints_sincronizacao")
+
+    __table_args__ = (
+        UniqueConstraint('usuario_id', 'entidade', name='uq_checkpoint_sincronizacao_usuario_entidade'),
+    )
+
+    def __repr__(self):
+        return f"<CheckpointSincronizacao(user={self.usuario_id}, entidade={self.entidade}, sincronizado_em={self.sincronizado_em})>"
+
+
+class CoberturaTarefas(db.Model):
+    __tablename__ = 'cobertura_tarefas'
+    id               = Column(Integer, primary_key=True, autoincrement=True)
+    usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
+    cobertura_inicio = Column(Date, nullable=False)       # primeiro dia coberto
+    cobertura_fim    = Column(Date, nullable=False)       # último dia coberto (inclusivo)
+    sincronizado_em  = Column(DateTime, nullable=False)
+
+    usuario          = relationship("Usuario", backref="coberturas_tarefas")
+
+    __table_args__ = (
+        Index('ix_cobertura_tarefas_usuario_inicio', 'usuario_id', 'cobertura_inicio'),
+    )
+
+    def __repr__(self):
+        return f"<CoberturaTarefas(user={self.usuario_id}, {self.cobertura_inicio} a {self.cobertura_fim}, sincronizado_em={self.sincronizado_em})>"
+
+
+class PaginacaoTarefas(db.Model):
+    __tablename__ = 'paginacao_tarefas'
+    id               = Column(Integer, primary_key=True, autoincrement=True)
+    usuario_id       = Column(Integer, ForeignKey('usuario.id'), nullable=False)
+    data_inicial     = Column(String, nullable=False)     # startDate enviado à API
+    data_final       = Column(String, nullable=False)     # endDate enviado à API
+    ultima_pagina    = Column(Integer, nullable=False)    # última página gravada
+    total_itens      = Column(Integer, nullable=False)    # totalItems informado pela API
+    atualizado_em    = Column(DateTime, nullable=False)
+
+    usuario          = relationship("Usuario", backref="paginacoes_tarefas")
+
+    __table_args__ = (
+        UniqueConstraint('usuario_id', 'data_inicial', 'data_final', name='uq_paginacao_tarefas_usuario_periodo'),
+    )
+
+    def __repr__(self):
+        return f"<PaginacaoTarefas(user={self.usuario_id}, {self.data_inicial} a {self.data_final}, pagina={self.ultima_pagina}/{self.total_itens} itens)>"
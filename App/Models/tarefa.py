@@ -1,9 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Float, ForeignKey
+    Column, Integer, String, DateTime, Float, ForeignKey, Index
 )
-from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from .. import db
+from .tipos import Dinheiro, JsonComprimido
 
 
 class Tarefa(db.Model):
@@ -14,14 +15,56 @@ class Tarefa(db.Model):
     cliente            = Column(String, nullable=True)               # customerDescription
     tipo_tarefa_id     = Column(Integer, ForeignKey('tipo_tarefa.id'), nullable=False)
     colaborador_id     = Column(Integer, ForeignKey('colaborador.id'), nullable=False)
-    valor_total        = Column(Float, nullable=False)               # soma de produtos + serviços
-    custo_total        = Column(Float, nullable=False)               # calculado a partir dos custos unitários
-    lucro_bruto        = Column(Float, nullable=False)               # valor_total - custo_total
-    detalhes_json      = Column(JSON, nullable=False)                # JSON com detalhes completos da tarefa
+    valor_total        = Column(Dinheiro, nullable=False)            # soma de produtos + serviços
+    custo_total        = Column(Dinheiro, nullable=False)            # custo dos produtos pelos custos unitários (serviços não têm custo)
+    lucro_bruto        = Column(Dinheiro, nullable=False)            # valor_total - custo_total
+    valor_produtos     = Column(Dinheiro, nullable=False, default=0) # parte de valor_total vinda de produtos
+    valor_servicos     = Column(Dinheiro, nullable=False, default=0) # parte de valor_total vinda de serviços
 
     usuario            = relationship("Usuario", backref="tarefas")
     tipo_tarefa        = relationship("TipoTarefa", backref="tarefas")
     colaborador        = relationship("Colaborador", backref="tarefas")
+    detalhes           = relationship("TarefaDetalhes", uselist=False, cascade="all, delete-orphan")  # carregado só quando acessado
+
+    # JSON com detalhes completos da tarefa (tarefa original e cálculos), lido de tarefa_detalhes
+    detalhes_json      = association_proxy('detalhes', 'dados', creator=lambda dados: TarefaDetalhes(dados=dados))
+
+    __table_args__ = (
+        Index('ix_tarefa_usuario_data', 'usuario_id', 'data'),    # consultas por usuário e período
+        Index('ix_tarefa_usuario_tipo_data', 'usuario_id', 'tipo_tarefa_id', 'data'),          # filtro por tipo
+        Index('ix_tarefa_usuario_colaborador_data', 'usuario_id', 'colaborador_id', 'data'),   # filtro por colaborador
+    )
 
     def __repr__(self):
         return f"<Tarefa(id={self.id}, usuario_id={self.usuario_id}, data={self.data.date()}, cliente={self.cliente})>"
+
+
+class TarefaDetalhes(db.Model):
+    __tablename__ = 'tarefa_detalhes'
+    tarefa_id          = Column(Integer, ForeignKey('tarefa.id'), primary_key=True)
+    dados              = Column(JsonComprimido, nullable=False)      # tarefa original da API e cálculos, comprimidos
+
+    def __repr__(self):
+        return f"<TarefaDetalhes(tarefa_id={self.tarefa_id})>"
+
+
+class TarefaItem(db.Model):
+    __tablename__ = 'tarefa_item'
+    id                 = Column(Integer, primary_key=True, autoincrement=True)
+    tarefa_id          = Column(Integer, ForeignKey('tarefa.id'), nullable=False)
+    usuario_id         = Column(Integer, ForeignKey('usuario.id'), nullable=False)
+    tipo               = Column(String, nullable=False)              # 'produto' ou 'servico'
+    item_id            = Column(String, nullable=False)              # productId ou id do serviço
+    quantidade         = Column(Float, nullable=False)
+    faturamento        = Column(Dinheiro, nullable=False)            # totalValue da linha
+    custo              = Column(Dinheiro, nullable=False)            # custo unitário na sincronização * quantidade
+
+    tarefa             = relationship("Tarefa", backref="itens")
+
+    __table_args__ = (
+        Index('ix_tarefa_item_usuario_item', 'usuario_id', 'item_id', 'tipo', 'tarefa_id'),    # filtro por produto/serviço
+        Index('ix_tarefa_item_tarefa', 'tarefa_id'),                                           # substituição dos itens da tarefa
+    )
+
+    def __repr__(self):
+        return f"<TarefaItem(tarefa_id={self.tarefa_id}, tipo={self.tipo}, item_id={self.item_id}, faturamento={self.faturamento})>"
@@ -0,0 +1,62 @@
+import json
+import zlib
+from sqlalchemy import BigInteger, LargeBinary
+from sqlalchemy.types import TypeDecorator
+from ..services.calculos import CalculosService, CENTAVOS_POR_REAL
+
+# Nível do zlib para o JSON das tarefas: quase a mesma taxa do nível 9, bem mais rápido
+ZLIB_LEVEL = 6
+
+
+class Dinheiro(TypeDecorator):
+    """Valor em reais gravado no banco como centavos inteiros
+
+    No Python o atributo continua em reais (float); no banco a coluna é
+    BIGINT, então SUM e comparações em SQL trabalham com inteiros exatos e o
+    resultado de SUM volta convertido para reais.
+
+    Preços e custos unitários usam Dinheiro(ESCALA_PRECO_UNITARIO): são
+    multiplicados pela quantidade, e um custo de 0,125 arredondado para
+    0,13 erraria o custo de cada linha.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, escala=CENTAVOS_POR_REAL):
+        super().__init__()
+        self.escala = escala
+
+    def process_bind_param(self, value, dialect):
+        return CalculosService.para_centavos(value, self.escala)
+
+    def process_literal_param(self, value, dialect):
+        return str(CalculosService.para_centavos(value, self.escala))
+
+    def process_result_value(self, value, dialect):
+        return CalculosService.para_reais(value, self.escala)
+
+
+def comprimir_json(dados):
+    """Serializa dados em JSON compacto (UTF-8) comprimido com zlib"""
+    return zlib.compress(json.dumps(dados, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), ZLIB_LEVEL)
+
+
+def descomprimir_json(blob):
+    """Lê um valor gravado por comprimir_json"""
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class JsonComprimido(TypeDecorator):
+    """Documento JSON gravado como BLOB comprimido com zlib
+
+    Ocupa uma fração do JSON em texto; em troca o banco não consegue ler
+    campos do documento em SQL.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else comprimir_json(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else descomprimir_json(value)
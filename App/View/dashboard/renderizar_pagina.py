@@ -1,10 +1,11 @@
-from flask import Blueprint, render_template, session, redirect, url_for, request
+from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify
 from datetime import datetime, timedelta
 from ...Controllers.tarefas import TarefaController
 from ...Controllers.produtos import ProdutoController
 from ...Controllers.serviço import ServicoController
 from ...Controllers.Colaborador import ColaboradorController
 from ...Controllers.tipo_de_tarefas import TipoTarefaController
+from ...services.exportacao import ExportacaoService
 from ...Models import (
     Usuario, Produto, Servico, TipoTarefa, Colaborador,
     FaturamentoTotal, FaturamentoProduto, FaturamentoServico,
@@ -41,14 +42,26 @@ def dashboard():
     if not data_final:
         data_final = datetime.now().strftime('%Y-%m-%d')
     
+    # Filtros opcionais aplicados sobre as tarefas já sincronizadas
+    filters = {
+        'produto': request.args.get('produto'),
+        'servico': request.args.get('servico'),
+        'tipo_tarefa': request.args.get('tipo_tarefa'),
+        'colaborador': request.args.get('colaborador')
+    }
+    
     # Buscar dados financeiros do período
     try:
         financial_summary = TarefaController.get_financial_summary(
             user_id, 
             data_inicial, 
-            data_final
+            data_final,
+            filters
         )
     except Exception as e:
+        financial_summary = None
+    
+    if not financial_summary:
         # Se houver erro, usar dados zerados
         financial_summary = {
             'faturamento': {
@@ -180,13 +193,32 @@ def refresh_dashboard():
 @renderizar_pagina_bp.route('/dashboard/export')
 def export_dashboard():
     """
-    Rota para exportar dados do dashboard
+    Rota para exportar o dashboard: aba de resumo financeiro e as tarefas
+    do período com os filtros aplicados (XLSX; formato=csv exporta só as tarefas)
     """
     
     # Verificar autenticação
     if not session.get('authenticated') or not session.get('user_id'):
         return redirect(url_for('renderizar_página.index'))
     
-    # Por enquanto, redireciona de volta para o dashboard
-    # A funcionalidade de exportação será implementada posteriormente
-    return redirect(url_for('renderizar_pagina.dashboard'))
+    filters = {
+        'data_inicial': request.args.get('data_inicial') or (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+        'data_final': request.args.get('data_final') or datetime.now().strftime('%Y-%m-%d'),
+        'produto': request.args.get('produto'),
+        'servico': request.args.get('servico'),
+        'tipo_tarefa': request.args.get('tipo_tarefa'),
+        'colaborador': request.args.get('colaborador')
+    }
+    
+    try:
+        return ExportacaoService.resposta_download(
+            session.get('user_id'),
+            request.args.get('formato', 'xlsx'),
+            filters,
+            incluir_resumo=True,
+            prefixo='dashboard'
+        )
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
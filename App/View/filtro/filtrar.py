@@ -1,13 +1,11 @@
 from flask import Blueprint, request, session, redirect, url_for, jsonify
 from datetime import datetime, timedelta
 from ...Controllers.auth_api import AuthController
-from ...Controllers.produtos import ProdutoController
-from ...Controllers.serviço import ServicoController
-from ...Controllers.Colaborador import ColaboradorController
-from ...Controllers.tipo_de_tarefas import TipoTarefaController
-from ...Controllers.tarefas import TarefaController
+from ...services.sincronizacao import SincronizacaoService
+from ...services.jobs import SyncJobService
+from ...Controllers.resumo_diario import ResumoDiarioController
 from ...Models import (
-    Usuario, Produto, Servico, TipoTarefa, Colaborador, Tarefa,
+    Usuario, Produto, Servico, TipoTarefa, Colaborador, Tarefa, TarefaDetalhes, TarefaItem,
     FaturamentoTotal, FaturamentoProduto, FaturamentoServico,
     LucroTotal, LucroProduto, LucroServico
 )
@@ -22,13 +20,18 @@ def consulta_filtros():
     
     Fluxo:
     1. Extrai user_id do usuário logado
-    2. Deleta todos os dados do banco vinculados ao usuário (exceto tabela user)
+    2. Apenas no modo completo ({"incremental": false}): deleta todos os dados
+       do banco vinculados ao usuário (exceto tabela user). Por padrão os
+       dados já sincronizados são mantidos e reaproveitados
     3. Captura filtros (data_inicial, data_final, etc.) do request
     4. Valida token_bearer do usuário
     5. Se válido: usa token atual para sincronizações
     6. Se inválido: re-autentica com api_key e token_api
-    7. Realiza todas as sincronizações (produtos, serviços, colaboradores, tipos_tarefa, tarefas)
+    7. Enfileira as sincronizações (produtos, serviços, colaboradores, tipos_tarefa, tarefas)
+       em segundo plano e responde na hora com o ID do job (progresso em /sync/jobs/<id>)
        - Para tarefas: passa data_inicial e data_final dos filtros
+       - No modo incremental: cadastros ainda válidos não são baixados e só as
+         lacunas entre os intervalos de tarefas já cobertos são buscadas na API
     8. Redireciona para /dashboard/refresh com filtros aplicados
     """
     
@@ -49,32 +52,44 @@ def consulta_filtros():
             'message': 'Usuário não encontrado'
         }), 404
     
-    # ========== ETAPA 3: DELETAR DADOS DO BANCO (EXCETO TABELA USER) ==========
-    try:
-        # Deletar dados financeiros
-        FaturamentoTotal.query.filter_by(usuario_id=user_id).delete()
-        FaturamentoProduto.query.filter_by(usuario_id=user_id).delete()
-        FaturamentoServico.query.filter_by(usuario_id=user_id).delete()
-        LucroTotal.query.filter_by(usuario_id=user_id).delete()
-        LucroProduto.query.filter_by(usuario_id=user_id).delete()
-        LucroServico.query.filter_by(usuario_id=user_id).delete()
-        
-        # Deletar dados operacionais
-        Tarefa.query.filter_by(usuario_id=user_id).delete()
-        Produto.query.filter_by(usuario_id=user_id).delete()
-        Servico.query.filter_by(usuario_id=user_id).delete()
-        TipoTarefa.query.filter_by(usuario_id=user_id).delete()
-        Colaborador.query.filter_by(usuario_id=user_id).delete()
-        
-        # Commit das exclusões
-        db.session.commit()
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'message': f'Erro ao limpar dados do banco: {str(e)}'
-        }), 500
+    data = request.get_json() or {}
+    incremental = bool(data.get('incremental', True))
+    
+    # ========== ETAPA 3: DELETAR DADOS DO BANCO (APENAS NO MODO COMPLETO) ==========
+    if not incremental:
+        try:
+            # Deletar dados financeiros
+            FaturamentoTotal.query.filter_by(usuario_id=user_id).delete()
+            FaturamentoProduto.query.filter_by(usuario_id=user_id).delete()
+            FaturamentoServico.query.filter_by(usuario_id=user_id).delete()
+            LucroTotal.query.filter_by(usuario_id=user_id).delete()
+            LucroProduto.query.filter_by(usuario_id=user_id).delete()
+            LucroServico.query.filter_by(usuario_id=user_id).delete()
+            
+            # Deletar dados operacionais
+            ResumoDiarioController.delete_for_user(user_id)
+            TarefaItem.query.filter_by(usuario_id=user_id).delete()
+            TarefaDetalhes.query.filter(
+                TarefaDetalhes.tarefa_id.in_(db.select(Tarefa.id).where(Tarefa.usuario_id == user_id))
+            ).delete(synchronize_session=False)
+            Tarefa.query.filter_by(usuario_id=user_id).delete()
+            Produto.query.filter_by(usuario_id=user_id).delete()
+            Servico.query.filter_by(usuario_id=user_id).delete()
+            TipoTarefa.query.filter_by(usuario_id=user_id).delete()
+            Colaborador.query.filter_by(usuario_id=user_id).delete()
+            
+            # Deletar checkpoints e intervalos cobertos
+            SincronizacaoService.limpar_checkpoints(user_id)
+            
+            # Commit das exclusões
+            db.session.commit()
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': f'Erro ao limpar dados do banco: {str(e)}'
+            }), 500
     
     # ========== ETAPA 4: VALIDAR TOKEN_BEARER ==========
     token_validation = AuthController.validate_token(usuario.chave_app)
@@ -111,7 +126,6 @@ def consulta_filtros():
         print(f"✅ Re-autenticação bem-sucedida para usuário {user_id}")
     
     # ========== ETAPA 6: CAPTURAR FILTROS PARA SINCRONIZAÇÃO ==========
-    data = request.get_json() or {}
     filters = {
         'data_inicial': data.get('data_inicial'),
         'data_final': data.get('data_final'),
@@ -121,65 +135,31 @@ def consulta_filtros():
         'colaborador': data.get('colaborador')
     }
     
-    # ========== ETAPA 7: REALIZAR TODAS AS SINCRONIZAÇÕES ==========
-    sync_results = {}
-    
-    try:
-        # Sincronizar produtos
-        print("🔄 Sincronizando produtos...")
-        produtos_result = ProdutoController.fetch_and_save_products(user_id)
-        sync_results['produtos'] = produtos_result
-        
-        # Sincronizar serviços
-        print("🔄 Sincronizando serviços...")
-        servicos_result = ServicoController.fetch_and_save_services(user_id)
-        sync_results['servicos'] = servicos_result
-        
-        # Sincronizar colaboradores
-        print("🔄 Sincronizando colaboradores...")
-        colaboradores_result = ColaboradorController.fetch_and_save_collaborators(user_id)
-        sync_results['colaboradores'] = colaboradores_result
-        
-        # Sincronizar tipos de tarefa
-        print("🔄 Sincronizando tipos de tarefa...")
-        tipos_result = TipoTarefaController.fetch_and_save_task_types(user_id)
-        sync_results['tipos_tarefa'] = tipos_result
-        
-        # Sincronizar tarefas
-        print("🔄 Sincronizando tarefas...")
-        # Passar data_inicial e data_final dos filtros para a sincronização
-        tarefas_result = TarefaController.fetch_and_process_tasks(
-            user_id, 
-            start_date=filters.get('data_inicial'),
-            end_date=filters.get('data_final')
-        )
-        sync_results['tarefas'] = tarefas_result
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Erro durante sincronização: {str(e)}',
-            'sync_results': sync_results
-        }), 500
+    # ========== ETAPA 7: ENFILEIRAR AS SINCRONIZAÇÕES ==========
+    # Produtos, serviços, colaboradores, tipos de tarefa e tarefas (com as
+    # datas dos filtros) são sincronizados em segundo plano
+    job_id = SyncJobService.enfileirar(
+        user_id,
+        start_date=filters.get('data_inicial'),
+        end_date=filters.get('data_final'),
+        incremental=incremental
+    )
+    print(f"📨 Sincronização enfileirada para usuário {user_id} (job {job_id})")
     
     # ========== ETAPA 8: CAPTURAR FILTROS PARA REDIRECIONAMENTO ==========
     # Remover filtros vazios
     filters_clean = {k: v for k, v in filters.items() if v}
     
-    # ========== ETAPA 9: RETORNAR SUCESSO E DADOS PARA REDIRECIONAMENTO ==========
+    # ========== ETAPA 9: RETORNAR JOB E DADOS PARA REDIRECIONAMENTO ==========
     return jsonify({
         'success': True,
-        'message': 'Sincronização completa realizada com sucesso',
-        'sync_results': {
-            'produtos': sync_results.get('produtos', {}).get('message', 'Erro'),
-            'servicos': sync_results.get('servicos', {}).get('message', 'Erro'),
-            'colaboradores': sync_results.get('colaboradores', {}).get('message', 'Erro'),
-            'tipos_tarefa': sync_results.get('tipos_tarefa', {}).get('message', 'Erro'),
-            'tarefas': sync_results.get('tarefas', {}).get('message', 'Erro')
-        },
+        'message': 'Sincronização iniciada',
+        'job_id': job_id,
+        'status_url': url_for('sync_jobs.status_job', job_id=job_id),
         'redirect_url': url_for('renderizar_pagina.dashboard', **filters_clean) if filters_clean else url_for('renderizar_pagina.dashboard'),
-        'token_was_renewed': not token_valido
-    })
+        'token_was_renewed': not token_valido,
+        'incremental': incremental
+    }), 202
 
 
 @filtrar_bp.route('/filtros/status', methods=['GET'])
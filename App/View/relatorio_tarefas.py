@@ -1,7 +1,16 @@
-from flask import Blueprint, render_template, jsonify, request, session
+from flask import (
+    Blueprint, render_template, jsonify, request, session, url_for,
+    Response, stream_with_context, send_file
+)
 from datetime import datetime, timedelta
-from ..Controllers.tarefas import TarefaController
+from ..Controllers.tarefas import TarefaController, REPORT_PAGE_SIZE, REPORT_STREAM_BATCH_SIZE
+from ..services.exportacao import ExportacaoService, ExportJobService, MIMETYPES
 from ..Models import Tarefa, Produto, Servico, TipoTarefa, Colaborador
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
 
 relatorio_tarefas_bp = Blueprint('relatorio_tarefas', __name__)
 
@@ -10,9 +19,67 @@ def relatorio_tarefas():
     """Renderiza a página de relatório detalhado de tarefas"""
     return render_template('relatorio_tarefas.html')
 
+def _get_report_filters(source=None):
+    """
+    Lê os filtros do relatório, com período padrão de ontem até hoje
+    
+    Args:
+        source (dict, optional): Origem dos filtros; por padrão, a query string
+    """
+    source = request.args if source is None else source
+    filters = {
+        'data_inicial': source.get('data_inicial'),
+        'data_final': source.get('data_final'),
+        'produto': source.get('produto'),
+        'servico': source.get('servico'),
+        'tipo_tarefa': source.get('tipo_tarefa'),
+        'colaborador': source.get('colaborador')
+    }
+    
+    if not filters['data_inicial']:
+        filters['data_inicial'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    
+    if not filters['data_final']:
+        filters['data_final'] = datetime.now().strftime('%Y-%m-%d')
+    
+    return filters
+
+def _format_task_row(tarefa, nomes):
+    """
+    Formata uma tarefa como linha da tabela do relatório
+    
+    Args:
+        tarefa (Tarefa): Tarefa de TarefaController.list_tasks_page ou iter_tasks
+        nomes (dict): Nomes de produtos e serviços (TarefaController.load_item_names)
+    """
+    # Busca nomes relacionados
+    tipo_tarefa_nome = tarefa.tipo_tarefa.descricao if tarefa.tipo_tarefa else 'N/A'
+    colaborador_nome = tarefa.colaborador.nome if tarefa.colaborador else 'N/A'
+    
+    # Monta string de produtos/serviços
+    itens_str = TarefaController.describe_task_items(tarefa, nomes) or "N/A"
+    
+    return {
+        'id': tarefa.id,
+        'cliente': tarefa.cliente or 'N/A',
+        'tipo_tarefa': tipo_tarefa_nome,
+        'colaborador': colaborador_nome,
+        'data': tarefa.data.strftime('%d/%m/%Y') if tarefa.data else 'N/A',
+        'itens': itens_str,
+        'valor_total': f"{tarefa.valor_total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'),
+        'custo_total': f"{tarefa.custo_total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'),
+        'lucro_bruto': f"{tarefa.lucro_bruto:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    }
+
 @relatorio_tarefas_bp.route('/api/relatorio/detailed-data')
 def detailed_data():
-    """API para retornar dados detalhados da tabela de tarefas"""
+    """
+    API para retornar uma página dos dados detalhados da tabela de tarefas
+    
+    Query params além dos filtros: sort (data, cliente, valor_total,
+    custo_total ou lucro_bruto), order (asc ou desc), limit e cursor (o
+    next_cursor da página anterior).
+    """
     
     # Verifica se o usuário está autenticado
     user_id = session.get('user_id')
@@ -22,99 +89,240 @@ def detailed_data():
         }), 401
     
     # Captura os filtros enviados via query parameters
-    filters = {
-        'data_inicial': request.args.get('data_inicial'),
-        'data_final': request.args.get('data_final'),
-        'produto': request.args.get('produto'),
-        'servico': request.args.get('servico'),
-        'tipo_tarefa': request.args.get('tipo_tarefa'),
-        'colaborador': request.args.get('colaborador')
-    }
+    filters = _get_report_filters()
+    sort = request.args.get('sort', 'data')
+    order = request.args.get('order', 'asc')
     
     try:
-        # Define datas padrão se não fornecidas
-        if not filters['data_inicial']:
-            filters['data_inicial'] = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        if not filters['data_final']:
-            filters['data_final'] = datetime.now().strftime('%Y-%m-%d')
-        
-        # Converte datas para datetime
-        data_inicial = datetime.strptime(filters['data_inicial'], '%Y-%m-%d')
-        data_final = datetime.strptime(filters['data_final'], '%Y-%m-%d')
-        
-        # Busca tarefas do usuário no período
-        query = Tarefa.query.filter_by(usuario_id=user_id).filter(
-            Tarefa.data >= data_inicial,
-            Tarefa.data <= data_final
+        # Busca uma página de tarefas do usuário no período com os filtros de tipo,
+        # colaborador, produto e serviço (estes dois pelos itens da tarefa)
+        page = TarefaController.list_tasks_page(
+            user_id, filters['data_inicial'], filters['data_final'], filters,
+            sort=sort,
+            order=order,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', REPORT_PAGE_SIZE, type=int)
         )
+        tarefas = page['tasks']
+        nomes = TarefaController.load_item_names(user_id)
         
-        # Aplica filtros adicionais se fornecidos
-        if filters['tipo_tarefa']:
-            query = query.filter(Tarefa.tipo_tarefa_id == int(filters['tipo_tarefa']))
+        # Formata dados para o frontend
+        data = [_format_task_row(tarefa, nomes) for tarefa in tarefas]
         
-        if filters['colaborador']:
-            query = query.filter(Tarefa.colaborador_id == int(filters['colaborador']))
+        return jsonify({
+            'data': data,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['has_more'],
+            'sort': sort,
+            'order': order
+        })
         
-        tarefas = query.all()
+    except ValueError as e:
+        # Ordenação, cursor ou filtro inválido
+        return jsonify({
+            'error': str(e)
+        }), 400
         
-        # Formata dados para o frontend
-        data = []
-        for tarefa in tarefas:
-            # Busca nomes relacionados
-            tipo_tarefa_nome = tarefa.tipo_tarefa.descricao if tarefa.tipo_tarefa else 'N/A'
-            colaborador_nome = tarefa.colaborador.nome if tarefa.colaborador else 'N/A'
-            
-            # Extrai produtos e serviços do JSON de detalhes
-            detalhes = tarefa.detalhes_json or {}
-            task_original = detalhes.get('task_original', {})
-            produtos = task_original.get('products', [])
-            servicos = task_original.get('services', [])
-            
-            # Monta string de produtos/serviços
-            itens_str = ""
-            if produtos:
-                produto_nomes = [p.get('nome', f"Produto {p.get('productId', 'N/A')}") for p in produtos]
-                itens_str += "Produtos: " + ", ".join(produto_nomes)
-            
-            if servicos:
-                servico_nomes = [s.get('nome', f"Serviço {s.get('id', 'N/A')}") for s in servicos]
-                if itens_str:
-                    itens_str += " | "
-                itens_str += "Serviços: " + ", ".join(servico_nomes)
-            
-            if not itens_str:
-                itens_str = "N/A"
-            
-            data.append({
-                'id': tarefa.id,
-                'cliente': tarefa.cliente or 'N/A',
-                'tipo_tarefa': tipo_tarefa_nome,
-                'colaborador': colaborador_nome,
-                'data': tarefa.data.strftime('%d/%m/%Y') if tarefa.data else 'N/A',
-                'itens': itens_str,
-                'valor_total': f"{tarefa.valor_total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'),
-                'custo_total': f"{tarefa.custo_total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'),
-                'lucro_bruto': f"{tarefa.lucro_bruto:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
-            })
+    except Exception as e:
+        # O detalhe (SQL, caminhos) fica só no log
+        logger.error(f"❌ Erro ao buscar dados detalhados: {str(e)}")
+        return jsonify({
+            'error': 'Erro ao buscar dados detalhados'
+        }), 500
+
+@relatorio_tarefas_bp.route('/api/relatorio/detailed-data/count')
+def detailed_data_count():
+    """API para retornar o total de tarefas do relatório com os mesmos filtros"""
+    
+    # Verifica se o usuário está autenticado
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({
+            'error': 'Usuário não autenticado'
+        }), 401
+    
+    filters = _get_report_filters()
+    
+    try:
+        total = TarefaController.count_tasks(user_id, filters['data_inicial'], filters['data_final'], filters)
+        return jsonify({
+            'total': total
+        })
         
-        return jsonify(data)
+    except ValueError as e:
+        # Data ou filtro inválido
+        return jsonify({
+            'error': str(e)
+        }), 400
         
     except Exception as e:
+        logger.error(f"❌ Erro ao contar tarefas: {str(e)}")
         return jsonify({
-            'error': f'Erro ao buscar dados detalhados: {str(e)}'
+            'error': 'Erro ao contar tarefas'
         }), 500
 
+@relatorio_tarefas_bp.route('/api/relatorio/detailed-data/stream')
+def detailed_data_stream():
+    """
+    API que retorna todas as tarefas do período como um array JSON em streaming
+    
+    As tarefas são lidas do banco em lotes e cada lote é escrito na resposta
+    assim que formatado, sem montar a lista completa em memória. Aceita os
+    mesmos filtros e a mesma ordenação (sort, order) de detailed_data.
+    """
+    
+    # Verifica se o usuário está autenticado
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({
+            'error': 'Usuário não autenticado'
+        }), 401
+    
+    filters = _get_report_filters()
+    
+    try:
+        # Valida ordenação e filtros antes de começar a responder
+        tarefas = TarefaController.iter_tasks(
+            user_id, filters['data_inicial'], filters['data_final'], filters,
+            sort=request.args.get('sort', 'data'),
+            order=request.args.get('order', 'asc')
+        )
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
+    nomes = TarefaController.load_item_names(user_id)
+    
+    def generate():
+        yield '['
+        separator = ''
+        buffer = []
+        
+        try:
+            for tarefa in tarefas:
+                buffer.append(separator + json.dumps(_format_task_row(tarefa, nomes), ensure_ascii=False))
+                separator = ','
+                
+                if len(buffer) >= REPORT_STREAM_BATCH_SIZE:
+                    yield ''.join(buffer)
+                    buffer = []
+        except Exception as e:
+            # O status já foi enviado: o array fica incompleto e o erro vai para o log
+            logger.error(f"❌ Erro durante o streaming do relatório: {str(e)}")
+            raise
+        
+        yield ''.join(buffer) + ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 @relatorio_tarefas_bp.route('/api/relatorio/export')
 def export_excel():
-    """Exporta os dados do relatório de tarefas para Excel"""
-    # Aqui você implementaria a lógica de exportação específica para tarefas
-    # Por enquanto, retorna uma resposta JSON
+    """
+    Exporta as tarefas do relatório com os mesmos filtros de detailed_data
+    
+    Query param formato: xlsx (padrão) ou csv. Para exportações grandes, use
+    POST /api/relatorio/export/jobs e baixe o arquivo quando o job terminar.
+    """
+    
+    # Verifica se o usuário está autenticado
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({
+            'error': 'Usuário não autenticado'
+        }), 401
+    
+    try:
+        return ExportacaoService.resposta_download(
+            user_id, request.args.get('formato', 'xlsx'), _get_report_filters()
+        )
+        
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+        
+    except Exception as e:
+        logger.error(f"❌ Erro ao exportar tarefas: {str(e)}")
+        return jsonify({
+            'error': 'Erro ao exportar tarefas'
+        }), 500
+
+@relatorio_tarefas_bp.route('/api/relatorio/export/jobs', methods=['POST'])
+def export_job_create():
+    """
+    Inicia uma exportação em segundo plano
+    
+    Recebe no corpo JSON o formato (xlsx ou csv) e os filtros do relatório.
+    Responde 202 com o ID do job e o link para acompanhar o progresso.
+    """
+    
+    # Verifica se o usuário está autenticado
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({
+            'error': 'Usuário não autenticado'
+        }), 401
+    
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        job_id = ExportJobService.enfileirar(
+            user_id,
+            data.get('formato', 'xlsx'),
+            _get_report_filters(data),
+            incluir_resumo=bool(data.get('incluir_resumo', False))
+        )
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
     return jsonify({
-        'status': 'success',
-        'message': 'Exportação de relatório de tarefas em desenvolvimento',
-        'filename': f'relatorio_tarefas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    })
+        'job_id': job_id,
+        'status_url': url_for('relatorio_tarefas.export_job_status', job_id=job_id)
+    }), 202
+
+@relatorio_tarefas_bp.route('/api/relatorio/export/jobs/<job_id>')
+def export_job_status(job_id):
+    """Retorna o progresso de uma exportação e, quando pronta, o link de download"""
+    
+    user_id = session.get('user_id')
+    job = ExportJobService.get_job(job_id)
+    
+    if not user_id or not job or job['usuario_id'] != user_id:
+        return jsonify({
+            'error': 'Exportação não encontrada'
+        }), 404
+    
+    return jsonify(ExportJobService.serializar(
+        job, url_for('relatorio_tarefas.export_job_download', job_id=job_id)
+    ))
+
+@relatorio_tarefas_bp.route('/api/relatorio/export/jobs/<job_id>/download')
+def export_job_download(job_id):
+    """Baixa o arquivo de uma exportação concluída"""
+    
+    user_id = session.get('user_id')
+    job = ExportJobService.get_job(job_id)
+    
+    if not user_id or not job or job['usuario_id'] != user_id:
+        return jsonify({
+            'error': 'Exportação não encontrada'
+        }), 404
+    
+    if job['status'] != 'concluido' or not os.path.exists(job['arquivo']):
+        return jsonify({
+            'error': 'Exportação ainda não disponível',
+            'status': job['status']
+        }), 409
+    
+    return send_file(
+        job['arquivo'],
+        mimetype=MIMETYPES[job['formato']],
+        as_attachment=True,
+        download_name=job['nome_arquivo']
+    )
 
 @relatorio_tarefas_bp.route('/api/tasks/sync', methods=['POST'])
 def sync_tasks():
@@ -0,0 +1 @@
+# Sincronização package - Blueprints para acompanhar jobs de sincronização
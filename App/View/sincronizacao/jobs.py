@@ -0,0 +1,35 @@
+from flask import Blueprint, session, jsonify
+from ...services.jobs import SyncJobService
+
+sync_jobs_bp = Blueprint('sync_jobs', __name__)
+
+@sync_jobs_bp.route('/sync/jobs/<job_id>', methods=['GET'])
+def status_job(job_id):
+    """
+    Retorna o progresso de um job de sincronização do usuário logado
+    
+    Cada etapa (produtos, servicos, colaboradores, tipos_tarefa, tarefas)
+    informa seu status; a etapa de tarefas informa também as páginas
+    concluídas e o total de páginas.
+    """
+    
+    user_id = session.get('user_id')
+    
+    if not user_id or not session.get('authenticated'):
+        return jsonify({
+            'success': False,
+            'message': 'Usuário não autenticado'
+        }), 401
+    
+    job = SyncJobService.get_job(job_id)
+    
+    if not job or job['usuario_id'] != user_id:
+        return jsonify({
+            'success': False,
+            'message': 'Job não encontrado'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': SyncJobService.serializar(job)
+    })
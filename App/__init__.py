@@ -1,21 +1,144 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 import os
 
 db = SQLAlchemy()
 
-def create_app():
+# Pool de conexões dos bancos servidor (PostgreSQL, MySQL); o SQLite usa o pool padrão
+DB_POOL_DEFAULTS = {
+    'DB_POOL_SIZE': 5,           # conexões mantidas abertas por processo
+    'DB_MAX_OVERFLOW': 10,       # conexões extras em picos
+    'DB_POOL_RECYCLE': 1800,     # segundos até reabrir uma conexão (antes do timeout do servidor)
+    'DB_POOL_PRE_PING': True,    # testa a conexão antes de usá-la
+}
+
+# PRAGMAs aplicados a cada nova conexão SQLite (sobrescritos por SQLITE_PRAGMAS; None desativa)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',       # leituras do dashboard não esperam a transação da sincronização
+    'synchronous': 'NORMAL',     # seguro com WAL: fsync apenas nos checkpoints
+    'busy_timeout': 5000,        # ms esperando o lock de escrita antes de "database is locked"
+    'cache_size': -65536,        # 64 MB de cache de páginas por conexão (negativo = KiB)
+    'mmap_size': 268435456,      # até 256 MB do arquivo lidos via mmap
+    'temp_store': 'MEMORY',      # ordenações e índices temporários em memória
+}
+
+
+def load_config(app, test_config=None):
+    """
+    Carrega as configurações da aplicação
+    
+    Ordem de precedência (a última vence): padrões, arquivo Python indicado
+    em AUVO_CONFIG, variáveis de ambiente (DATABASE_URL, SECRET_KEY e as
+    chaves de DB_POOL_DEFAULTS) e test_config. Nos testes (TESTING),
+    TEST_DATABASE_URL substitui o banco pedido, para rodar a suíte em outro
+    servidor (ex.: PostgreSQL).
+    
+    Args:
+        app (Flask): Aplicação
+        test_config (dict, optional): Configurações dos testes
+    """
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SECRET_KEY'] = 'sua-chave-secreta-aqui'  # Defina SECRET_KEY em produção
+    app.config.update(DB_POOL_DEFAULTS)
+    
+    if os.environ.get('AUVO_CONFIG'):
+        app.config.from_pyfile(os.environ['AUVO_CONFIG'])
+    
+    if os.environ.get('DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
+    
+    if os.environ.get('SECRET_KEY'):
+        app.config['SECRET_KEY'] = os.environ['SECRET_KEY']
+    
+    for key, default in DB_POOL_DEFAULTS.items():
+        value = os.environ.get(key)
+        if value:
+            app.config[key] = value.lower() in ('1', 'true', 'yes', 'sim') if isinstance(default, bool) else int(value)
+    
+    # Sobrescreve configurações (ex: banco em memória nos testes)
+    if test_config:
+        app.config.update(test_config)
+    
+    if app.config.get('TESTING') and os.environ.get('TEST_DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['TEST_DATABASE_URL']
+    
+    # URLs no formato postgres:// (Heroku e afins) não são aceitas pelo SQLAlchemy
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('postgres://'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://' + uri[len('postgres://'):]
+    
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+
+
+def build_engine_options(config):
+    """
+    Monta as opções do create_engine a partir das chaves DB_POOL_*
+    
+    Opções já definidas em SQLALCHEMY_ENGINE_OPTIONS são mantidas. O SQLite
+    não recebe opções de pool: o Flask-SQLAlchemy escolhe o pool adequado
+    (StaticPool no banco em memória).
+    
+    Args:
+        config (dict): Configuração da aplicação
+        
+    Returns:
+        dict: Opções do engine
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    
+    if make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite':
+        return options
+    
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+    
+    return options
+
+
+def configure_sqlite(app):
+    """
+    Registra os PRAGMAs de SQLITE_PRAGMAS para todas as conexões do banco da aplicação
+    
+    Não faz nada para outros bancos. No banco em memória o journal_mode
+    continua 'memory' (o SQLite ignora WAL nesse caso).
+    
+    Args:
+        app (Flask): Aplicação já registrada no db
+    """
+    pragmas = dict(SQLITE_PRAGMAS, **app.config.get('SQLITE_PRAGMAS', {}))
+    
+    with app.app_context():
+        engine = db.engine
+    
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f'PRAGMA {pragma} = {value}')
+        finally:
+            cursor.close()
+
+def create_app(test_config=None):
     # Caminho absoluto para a pasta templates na raiz do projeto
     template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../templates'))
     static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../static'))
     app = Flask(__name__, template_folder=template_dir, static_folder=static_dir)
     
-    # Configurações da aplicação
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///database.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['SECRET_KEY'] = 'sua-chave-secreta-aqui'  # Mude para uma chave segura
+    # Configurações da aplicação (padrões, AUVO_CONFIG, ambiente e testes)
+    load_config(app, test_config)
     
     db.init_app(app)
+    configure_sqlite(app)
 
     from .View.login.renderizar_pagina import renderizar_página_bp
     from .View.login.logar_user import logar_user_bp
@@ -23,6 +146,7 @@ def create_app():
     from .View.dashboard.renderizar_pagina import renderizar_pagina_bp
     from .View.relatorio_tarefas import relatorio_tarefas_bp
     from .View.filtro.filtrar import filtrar_bp
+    from .View.sincronizacao.jobs import sync_jobs_bp
     
     app.register_blueprint(renderizar_página_bp)
     app.register_blueprint(logar_user_bp)
@@ -30,12 +154,18 @@ def create_app():
     app.register_blueprint(renderizar_pagina_bp)
     app.register_blueprint(relatorio_tarefas_bp)
     app.register_blueprint(filtrar_bp)
+    app.register_blueprint(sync_jobs_bp)
+
+    # Comandos "flask auvo ..."
+    from .cli import auvo_cli
+    app.cli.add_command(auvo_cli)
 
     # Importar os modelos para que o SQLAlchemy os reconheça
     from .Models import (
-        Usuario, TipoTarefa, Colaborador, Produto, Servico, Tarefa,
+        Usuario, TipoTarefa, Colaborador, Produto, Servico, Tarefa, TarefaDetalhes, TarefaItem,
         FaturamentoTotal, FaturamentoProduto, FaturamentoServico,
-        LucroTotal, LucroProduto, LucroServico
+        LucroTotal, LucroProduto, LucroServico, CheckpointSincronizacao, CoberturaTarefas,
+        PaginacaoTarefas, ResumoDiario
     )
 
     with app.app_context():
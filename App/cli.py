@@ -0,0 +1,51 @@
+"""
+Comandos de linha de comando da aplicação (flask auvo ...)
+"""
+
+import click
+from flask.cli import AppGroup
+
+from .services.backfill import BackfillService, FATIAS
+
+auvo_cli = AppGroup('auvo', help='Comandos de sincronização com a API da Auvo.')
+
+
+@auvo_cli.command('backfill')
+@click.option('--user', 'user_id', type=int, required=True, help='ID do usuário no banco de dados.')
+@click.option('--from', 'data_inicial', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='Primeiro dia do período (YYYY-MM-DD).')
+@click.option('--to', 'data_final', type=click.DateTime(formats=['%Y-%m-%d']), required=True,
+              help='Último dia do período, inclusivo (YYYY-MM-DD).')
+@click.option('--slice', 'fatia', type=click.Choice(FATIAS), default='week', show_default=True,
+              help='Tamanho de cada fatia do período.')
+@click.option('--workers', type=click.IntRange(min=1), default=None,
+              help='Fatias buscadas ao mesmo tempo. Default: BACKFILL_MAX_WORKERS.')
+@click.option('--rate', type=click.FloatRange(min=0, min_open=True), default=None,
+              help='Requisições por segundo à API, somando todas as fatias. Default: BACKFILL_RATE_LIMIT.')
+def backfill(user_id, data_inicial, data_final, fatia, workers, rate):
+    """Baixa as tarefas de um período longo em fatias paralelas."""
+
+    def progresso(inicio, fim, resultado):
+        if resultado['success']:
+            click.echo(f"  {inicio} a {fim}: {resultado['tarefas']} tarefas, {resultado['paginas']} página(s)")
+        else:
+            click.echo(f"  {inicio} a {fim}: erro - {resultado['message']}", err=True)
+
+    resultado = BackfillService.executar(
+        user_id, data_inicial.date(), data_final.date(), fatia=fatia,
+        max_workers=workers, rate_limit=rate, progresso=progresso
+    )
+
+    estatisticas = resultado['data']
+    if estatisticas:
+        click.echo(
+            f"{estatisticas['tarefas']} tarefas e {estatisticas['paginas']} páginas em {estatisticas['duracao_s']}s "
+            f"({estatisticas['tarefas_por_s']} tarefas/s, {estatisticas['paginas_por_s']} páginas/s), "
+            f"{estatisticas['tarefas_removidas']} tarefas removidas, "
+            f"retentativas: {estatisticas['retentativas_http']} HTTP, {estatisticas['retentativas_fatias']} de fatia"
+        )
+
+    click.echo(resultado['message'], err=not resultado['success'])
+
+    if not resultado['success']:
+        raise SystemExit(1)
@@ -0,0 +1,190 @@
+"""
+Cliente HTTP compartilhado para a API da Auvo
+
+Este módulo mantém uma única requests.Session por processo, usada por todos
+os controllers que conversam com a API da Auvo:
+- Pool de conexões keep-alive com limite de conexões por host
+- Negociação de compressão gzip/deflate
+- Retentativas com backoff exponencial em 429 e erros 5xx, contadas para estatísticas
+- Limite opcional de requisições por segundo, global para todas as threads
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# URL base da API da Auvo
+AUVO_API_BASE_URL = "https://api.auvo.com.br/v2"
+
+
+class _ContadorRetry(Retry):
+    """Retry que soma cada retentativa em AuvoApiService"""
+
+    def increment(self, *args, **kwargs):
+        novo = super().increment(*args, **kwargs)
+        AuvoApiService._count_retry()
+        return novo
+
+
+class AuvoApiService:
+    """Cliente HTTP com pool de conexões compartilhado pelos controllers"""
+
+    # Pool de conexões
+    POOL_CONNECTIONS = 4         # Quantidade de hosts mantidos no pool
+    POOL_MAXSIZE = 10            # Conexões keep-alive por host
+
+    # Retentativas
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF_FACTOR = 0.5   # 0.5s, 1s, 2s...
+    RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+    DEFAULT_TIMEOUT = 30
+
+    _session = None
+    _lock = threading.Lock()
+
+    # Estatísticas e limite de taxa (compartilhados por todas as threads)
+    _retry_count = 0
+    _rate_limit = None           # Requisições por segundo; None = sem limite
+    _next_request_at = 0.0
+    _rate_lock = threading.Lock()
+
+    @staticmethod
+    def build_url(path):
+        """
+        Monta a URL completa de um endpoint da API
+
+        Args:
+            path (str): Caminho relativo, ex: 'products/?pageSize=100'
+
+        Returns:
+            str: URL completa
+        """
+        return f"{AUVO_API_BASE_URL}/{path.lstrip('/')}"
+
+    @classmethod
+    def get_session(cls):
+        """
+        Retorna a sessão compartilhada, criando-a na primeira chamada
+
+        Returns:
+            requests.Session: Sessão com pool de conexões e retentativas
+        """
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    cls._session = cls._create_session()
+        return cls._session
+
+    @classmethod
+    def _create_session(cls):
+        """
+        Cria uma sessão configurada com pool, compressão e retentativas
+
+        Returns:
+            requests.Session: Nova sessão
+        """
+        retry = _ContadorRetry(
+            total=cls.RETRY_TOTAL,
+            backoff_factor=cls.RETRY_BACKOFF_FACTOR,
+            status_forcelist=cls.RETRY_STATUS_FORCELIST,
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False  # Devolve a última resposta para o controller tratar o status
+        )
+
+        # pool_block: com todas as conexões do host em uso, a thread espera uma
+        # ser devolvida em vez de abrir (e descartar) conexões além do limite
+        adapter = HTTPAdapter(
+            pool_connections=cls.POOL_CONNECTIONS,
+            pool_maxsize=cls.POOL_MAXSIZE,
+            pool_block=True,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+
+        logger.debug(f"🔌 Sessão HTTP da Auvo criada (pool {cls.POOL_MAXSIZE}/host, {cls.RETRY_TOTAL} retentativas)")
+
+        return session
+
+    @classmethod
+    def get(cls, url, headers=None, timeout=None):
+        """
+        Faz uma requisição GET usando a sessão compartilhada
+
+        Args:
+            url (str): URL completa
+            headers (dict, optional): Headers adicionais da requisição
+            timeout (int, optional): Timeout em segundos. Default: DEFAULT_TIMEOUT
+
+        Returns:
+            requests.Response: Resposta da API
+        """
+        cls._wait_for_rate_limit()
+        return cls.get_session().get(url, headers=headers, timeout=timeout or cls.DEFAULT_TIMEOUT)
+
+    @classmethod
+    def set_rate_limit(cls, requests_per_second=None):
+        """
+        Limita as requisições de todas as threads do processo
+
+        As requisições são espaçadas em 1/requests_per_second segundos; as
+        retentativas automáticas da sessão não passam pelo limite.
+
+        Args:
+            requests_per_second (float, optional): Requisições por segundo. None remove o limite
+        """
+        with cls._rate_lock:
+            cls._rate_limit = requests_per_second or None
+            cls._next_request_at = 0.0
+
+    @classmethod
+    def _wait_for_rate_limit(cls):
+        """Espera a vez desta requisição quando há limite de taxa"""
+        if not cls._rate_limit:
+            return
+
+        with cls._rate_lock:
+            now = time.monotonic()
+            slot = max(now, cls._next_request_at)
+            cls._next_request_at = slot + 1.0 / cls._rate_limit
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    @classmethod
+    def _count_retry(cls):
+        """Soma uma retentativa feita pela sessão"""
+        with cls._rate_lock:
+            cls._retry_count += 1
+
+    @classmethod
+    def get_retry_count(cls):
+        """
+        Retorna quantas retentativas a sessão fez desde o início do processo
+
+        Returns:
+            int: Total de retentativas
+        """
+        return cls._retry_count
+
+    @classmethod
+    def reset_session(cls):
+        """Fecha a sessão compartilhada; a próxima chamada cria uma nova"""
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
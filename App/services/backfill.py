@@ -0,0 +1,327 @@
+"""
+Backfill de tarefas de períodos longos
+
+Um período grande é dividido em fatias (dia, semana ou mês), cada uma com a
+sua própria paginação na API da Auvo:
+- As fatias são buscadas em paralelo, sob um limite global de requisições
+  por segundo (AuvoApiService.set_rate_limit)
+- Cada página é gravada em Tarefa assim que chega; uma fatia que falha é
+  tentada de novo e continua do checkpoint da página que falhou
+- Tarefas que a API não devolve mais são removidas da fatia, como na
+  sincronização incremental
+- Ao final os dados financeiros do período são recalculados a partir do banco
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy.pool import StaticPool
+
+from .. import db
+from ..Models import Usuario
+from ..Controllers.auth_api import AuthController
+from ..Controllers.tarefas import TarefaController
+from .api_service import AuvoApiService
+from .sincronizacao import SincronizacaoService
+
+logger = logging.getLogger(__name__)
+
+# Tamanhos de fatia aceitos
+FATIAS = ('day', 'week', 'month')
+
+# Padrões para BACKFILL_MAX_WORKERS, BACKFILL_RATE_LIMIT, BACKFILL_TENTATIVAS e BACKFILL_ESPERA_SEGUNDOS
+BACKFILL_MAX_WORKERS = 4        # fatias buscadas ao mesmo tempo
+BACKFILL_RATE_LIMIT = 10        # requisições por segundo à API, somando todas as fatias
+BACKFILL_TENTATIVAS = 3         # tentativas por fatia
+BACKFILL_ESPERA_SEGUNDOS = 2    # espera antes de tentar a fatia de novo (multiplicada pela tentativa)
+
+
+class BackfillService:
+    """Serviço para baixar longos períodos de tarefas em fatias paralelas"""
+
+    @staticmethod
+    def _config(key, default, tipo=int):
+        """Lê uma configuração numérica da aplicação"""
+        if has_app_context():
+            return tipo(current_app.config.get(key, default))
+        return default
+
+    @staticmethod
+    def dividir_periodo(data_inicial, data_final, fatia='week'):
+        """
+        Divide um período em fatias consecutivas
+
+        Semanas vão de segunda a domingo e meses seguem o calendário; a
+        primeira e a última fatia são recortadas nas datas do período.
+
+        Args:
+            data_inicial (date): Primeiro dia do período
+            data_final (date): Último dia do período (inclusivo)
+            fatia (str): 'day', 'week' ou 'month'
+
+        Returns:
+            list: Lista de tuplas (início, fim) com fim inclusivo
+        """
+        if fatia not in FATIAS:
+            raise ValueError(f'Fatia inválida: {fatia}. Use {", ".join(FATIAS)}')
+
+        fatias = []
+        inicio = data_inicial
+
+        while inicio <= data_final:
+            if fatia == 'day':
+                fim = inicio
+            elif fatia == 'week':
+                fim = inicio + timedelta(days=6 - inicio.weekday())
+            else:
+                proximo_mes = (inicio.replace(day=1) + timedelta(days=32)).replace(day=1)
+                fim = proximo_mes - timedelta(days=1)
+
+            fim = min(fim, data_final)
+            fatias.append((inicio, fim))
+            inicio = fim + timedelta(days=1)
+
+        return fatias
+
+    @staticmethod
+    def _max_workers(max_workers=None):
+        """
+        Retorna quantas fatias podem ser buscadas ao mesmo tempo
+
+        Um SQLite em memória usa uma única conexão (StaticPool) compartilhada
+        por todas as threads; nesse caso as fatias rodam uma de cada vez.
+
+        Args:
+            max_workers (int, optional): Valor pedido. Default: BACKFILL_MAX_WORKERS
+
+        Returns:
+            int: Quantidade de threads
+        """
+        if isinstance(db.engine.pool, StaticPool):
+            return 1
+        if max_workers is None:
+            max_workers = BackfillService._config('BACKFILL_MAX_WORKERS', BACKFILL_MAX_WORKERS)
+        return max(1, max_workers)
+
+    @staticmethod
+    def _executar_fatia(app, user_id, inicio, fim):
+        """
+        Baixa e grava as tarefas de uma fatia em um app context (e sessão do banco) próprio
+
+        Cada tentativa valida o token antes (AuthController.validate_token
+        renova o que venceu durante um backfill longo). Uma tentativa que
+        falha é repetida até BACKFILL_TENTATIVAS vezes; a nova tentativa
+        continua da página que falhou (checkpoint de paginação de
+        TarefaController._stream_tasks_to_db).
+
+        Se a fatia foi lida inteira em uma tentativa, as tarefas do período que
+        não vieram da API são removidas e a fatia pode ser registrada como
+        coberta. Uma fatia continuada de um checkpoint não conhece os IDs das
+        primeiras páginas: nada é removido e ela não é registrada.
+        
+        Qualquer outra exceção (ex.: do banco ao remover tarefas) desfaz a
+        transação da fatia e vira um resultado com erro, sem interromper as
+        demais fatias.
+
+        Returns:
+            dict: success, message, tarefas (baixadas nesta execução),
+                removidas, paginas, retentativas e cobrir (True se a fatia
+                pode ser registrada como coberta)
+        """
+        paginas = 0
+
+        def contar_pagina(concluidas, total):
+            nonlocal paginas
+            paginas += 1
+
+        tarefas = 0
+        removidas = 0
+        cobrir = False
+        tentativa = 1
+
+        with app.app_context():
+            try:
+                tentativas = max(1, BackfillService._config('BACKFILL_TENTATIVAS', BACKFILL_TENTATIVAS))
+                espera = BackfillService._config('BACKFILL_ESPERA_SEGUNDOS', BACKFILL_ESPERA_SEGUNDOS, float)
+                usuario = db.session.get(Usuario, user_id)
+
+                for tentativa in range(1, tentativas + 1):
+                    token_validation = AuthController.validate_token(usuario.chave_app)
+                    if not token_validation.get('valid'):
+                        resultado = {
+                            'success': False,
+                            'message': 'Token expirado. Faça login novamente.',
+                            'data': None
+                        }
+                    else:
+                        resultado = TarefaController._stream_tasks_to_db(
+                            usuario, token_validation['access_token'], inicio.isoformat(), fim.isoformat(),
+                            progress_callback=contar_pagina, collect_ids=True
+                        )
+                    if resultado['success'] or tentativa == tentativas:
+                        break
+
+                    logger.warning(
+                        f"🔁 Fatia {inicio} a {fim} falhou ({resultado['message']}); "
+                        f"tentativa {tentativa + 1} de {tentativas}"
+                    )
+                    time.sleep(espera * tentativa)
+
+                if resultado['success']:
+                    tarefas = resultado['data']['processed']
+                    if resultado['data']['task_ids'] is not None:
+                        removidas = TarefaController._remove_missing_tasks(
+                            user_id, inicio, fim, resultado['data']['task_ids']
+                        )
+                        cobrir = True
+
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"❌ Erro na fatia {inicio} a {fim}: {str(e)}")
+                resultado = {
+                    'success': False,
+                    'message': f'Erro na fatia: {str(e)}',
+                    'data': None
+                }
+
+        return {
+            'success': resultado['success'],
+            'message': resultado['message'],
+            'tarefas': tarefas,
+            'removidas': removidas,
+            'paginas': paginas,
+            'retentativas': tentativa - 1,
+            'cobrir': cobrir
+        }
+
+    @staticmethod
+    def executar(user_id, data_inicial, data_final, fatia='week', max_workers=None, rate_limit=None, progresso=None):
+        """
+        Baixa as tarefas de um período em fatias paralelas e recalcula os dados financeiros
+
+        Os cadastros são sincronizados antes (os custos das tarefas dependem
+        dos produtos). Cada fatia lida inteira é registrada como intervalo
+        coberto, então a sincronização incremental não a baixa de novo.
+
+        Args:
+            user_id (int): ID do usuário
+            data_inicial (date): Primeiro dia do período
+            data_final (date): Último dia do período (inclusivo)
+            fatia (str): 'day', 'week' ou 'month'
+            max_workers (int, optional): Fatias ao mesmo tempo. Default: BACKFILL_MAX_WORKERS
+            rate_limit (float, optional): Requisições por segundo à API. Default: BACKFILL_RATE_LIMIT
+            progresso (callable, optional): Chamado como progresso(início, fim, resultado)
+                a cada fatia concluída
+
+        Returns:
+            dict: Resultado; data traz as estatísticas (tarefas baixadas e
+                removidas, paginas, retentativas, duração e vazão por
+                segundo), as fatias com erro e os dados financeiros do período
+        """
+        if data_final < data_inicial:
+            return {
+                'success': False,
+                'message': 'Data final anterior à data inicial',
+                'data': None
+            }
+
+        usuario = db.session.get(Usuario, user_id)
+        if not usuario:
+            return {
+                'success': False,
+                'message': 'Usuário não encontrado',
+                'data': None
+            }
+
+        token_validation = AuthController.validate_token(usuario.chave_app)
+        if not token_validation.get('valid'):
+            return {
+                'success': False,
+                'message': 'Token expirado. Faça login novamente.',
+                'data': None
+            }
+
+        for entidade in SincronizacaoService.CATALOGOS:
+            resultado = SincronizacaoService.sincronizar_catalogo(user_id, entidade, incremental=True)
+            if not resultado.get('success'):
+                return resultado
+
+        # Criado antes das threads, para duas fatias não inserirem o mesmo tipo padrão
+        TarefaController._ensure_default_task_type(user_id, TarefaController._load_sync_lookups(user_id))
+        db.session.commit()
+
+        fatias = BackfillService.dividir_periodo(data_inicial, data_final, fatia)
+        workers = BackfillService._max_workers(max_workers)
+        if rate_limit is None:
+            rate_limit = BackfillService._config('BACKFILL_RATE_LIMIT', BACKFILL_RATE_LIMIT, float)
+
+        logger.debug(f"📦 Backfill de {data_inicial} a {data_final}: {len(fatias)} fatia(s), {workers} em paralelo, {rate_limit} req/s")
+
+        app = current_app._get_current_object()
+        agora = datetime.now()
+        resultados = {}
+        retentativas_http = AuvoApiService.get_retry_count()
+        inicio_total = time.perf_counter()
+
+        AuvoApiService.set_rate_limit(rate_limit)
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='backfill') as executor:
+                futures = {
+                    executor.submit(BackfillService._executar_fatia, app, user_id, inicio, fim): (inicio, fim)
+                    for inicio, fim in fatias
+                }
+                for future in as_completed(futures):
+                    resultados[futures[future]] = future.result()
+                    if progresso:
+                        progresso(*futures[future], resultados[futures[future]])
+        finally:
+            AuvoApiService.set_rate_limit(None)
+
+        duracao = time.perf_counter() - inicio_total
+        retentativas_http = AuvoApiService.get_retry_count() - retentativas_http
+
+        # Gravações no banco só depois das threads (no SQLite em memória a conexão é compartilhada)
+        erros = []
+        for (inicio, fim), resultado in sorted(resultados.items()):
+            if resultado['cobrir']:
+                SincronizacaoService.registrar_cobertura(user_id, inicio, fim, sincronizado_em=agora)
+            elif not resultado['success']:
+                erros.append({'inicio': inicio.isoformat(), 'fim': fim.isoformat(), 'message': resultado['message']})
+
+        financial_result = TarefaController.recalculate_financial_data(
+            user_id, data_inicial.isoformat(), data_final.isoformat()
+        )
+
+        tarefas = sum(resultado['tarefas'] for resultado in resultados.values())
+        paginas = sum(resultado['paginas'] for resultado in resultados.values())
+        estatisticas = {
+            'fatias': len(fatias),
+            'tarefas': tarefas,
+            'tarefas_removidas': sum(resultado['removidas'] for resultado in resultados.values()),
+            'paginas': paginas,
+            'retentativas_http': retentativas_http,
+            'retentativas_fatias': sum(resultado['retentativas'] for resultado in resultados.values()),
+            'duracao_s': round(duracao, 3),
+            'tarefas_por_s': round(tarefas / duracao, 1) if duracao else 0.0,
+            'paginas_por_s': round(paginas / duracao, 2) if duracao else 0.0
+        }
+
+        logger.debug(f"⏱️ Backfill do usuário {user_id}: {estatisticas}")
+
+        if erros:
+            message = f'Backfill concluído com erros em {len(erros)} de {len(fatias)} fatia(s)'
+        else:
+            message = f'Backfill concluído. {tarefas} tarefas em {len(fatias)} fatia(s).'
+
+        return {
+            'success': not erros,
+            'message': message,
+            'data': {
+                **estatisticas,
+                'erros': erros,
+                'financial_data': financial_result
+            }
+        }
@@ -5,12 +5,27 @@ Este módulo contém todas as funções auxiliares para calcular:
 - Faturamento total, produto e serviço
 - Lucro total, produto e serviço  
 - Porcentagens de faturamento e lucro
+
+Os valores em dinheiro são somados em centavos inteiros (exatos); a
+conversão para reais acontece só na entrada e na saída.
 """
 
 import logging
+from decimal import Decimal, ROUND_HALF_UP
 
 logger = logging.getLogger(__name__)
 
+# Valores calculados por tarefa e somados nos totais
+CHAVES_VALORES = (
+    'faturamento_total', 'faturamento_produto', 'faturamento_servico', 'custo_produto',
+    'lucro_total', 'lucro_produto', 'lucro_servico'
+)
+
+CENTAVOS_POR_REAL = 100
+
+# Preços e custos unitários: décimos de milésimo de real (multiplicados pela quantidade)
+ESCALA_PRECO_UNITARIO = 10000
+
 
 class CalculosService:
     """Serviço para cálculos financeiros"""
@@ -82,9 +97,7 @@ class CalculosService:
         Returns:
             float: Porcentagem do faturamento de produtos
         """
-        if faturamento_total == 0:
-            return 0.0
-        return (faturamento_produto / faturamento_total) * 100
+        return CalculosService._porcentagem(faturamento_produto, faturamento_total)
     
     @staticmethod
     def calcular_porcentagem_faturamento_servico(faturamento_servico, faturamento_total):
@@ -98,9 +111,7 @@ class CalculosService:
         Returns:
             float: Porcentagem do faturamento de serviços
         """
-        if faturamento_total == 0:
-            return 0.0
-        return (faturamento_servico / faturamento_total) * 100
+        return CalculosService._porcentagem(faturamento_servico, faturamento_total)
     
     @staticmethod
     def calcular_porcentagem_lucro_produto(lucro_produto, lucro_total):
@@ -114,9 +125,7 @@ class CalculosService:
         Returns:
             float: Porcentagem do lucro de produtos
         """
-        if lucro_total == 0:
-            return 0.0
-        return (lucro_produto / lucro_total) * 100
+        return CalculosService._porcentagem(lucro_produto, lucro_total)
     
     @staticmethod
     def calcular_porcentagem_lucro_servico(lucro_servico, lucro_total):
@@ -130,9 +139,7 @@ class CalculosService:
         Returns:
             float: Porcentagem do lucro de serviços
         """
-        if lucro_total == 0:
-            return 0.0
-        return (lucro_servico / lucro_total) * 100
+        return CalculosService._porcentagem(lucro_servico, lucro_total)
     
     @staticmethod
     def calcular_porcentagem_lucro_faturamento(lucro_total, faturamento_total):
@@ -146,9 +153,184 @@ class CalculosService:
         Returns:
             float: Porcentagem do lucro sobre o faturamento
         """
-        if faturamento_total == 0:
+        return CalculosService._porcentagem(lucro_total, faturamento_total)
+    
+    @staticmethod
+    def _porcentagem(parte, total):
+        """Percentual de parte sobre total (0 quando o total é zero)"""
+        if total == 0:
             return 0.0
-        return (lucro_total / faturamento_total) * 100
+        return (parte / total) * 100
+    
+    @staticmethod
+    def calcular_porcentagens(valores):
+        """
+        Calcula as porcentagens de produto/serviço e a margem de lucro
+        
+        Args:
+            valores (dict): faturamento_total, faturamento_produto, faturamento_servico,
+                lucro_total, lucro_produto e lucro_servico
+            
+        Returns:
+            dict: faturamento_produto, faturamento_servico, lucro_produto,
+                lucro_servico e lucro_faturamento, em porcentagem
+        """
+        faturamento_total = valores['faturamento_total']
+        lucro_total = valores['lucro_total']
+        
+        return {
+            'faturamento_produto': CalculosService._porcentagem(valores['faturamento_produto'], faturamento_total),
+            'faturamento_servico': CalculosService._porcentagem(valores['faturamento_servico'], faturamento_total),
+            'lucro_produto': CalculosService._porcentagem(valores['lucro_produto'], lucro_total),
+            'lucro_servico': CalculosService._porcentagem(valores['lucro_servico'], lucro_total),
+            'lucro_faturamento': CalculosService._porcentagem(lucro_total, faturamento_total)
+        }
+    
+    @staticmethod
+    def para_centavos(valor, escala=CENTAVOS_POR_REAL):
+        """
+        Converte um valor em reais para centavos inteiros
+        
+        Usa a representação decimal do valor (0.1 vira 10 centavos, não
+        9,999...) e arredonda meia unidade para cima.
+        
+        Args:
+            valor (float | int | Decimal | str): Valor em reais; None é mantido
+            escala (int): Unidades por real. Default: centavos; ESCALA_PRECO_UNITARIO
+                para preços unitários
+            
+        Returns:
+            int: Valor em centavos (ou na escala pedida)
+        """
+        if valor is None:
+            return None
+        if isinstance(valor, int):
+            return valor * escala
+        return int((Decimal(str(valor)) * escala).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    
+    @staticmethod
+    def para_reais(centavos, escala=CENTAVOS_POR_REAL):
+        """
+        Converte centavos inteiros para reais
+        
+        Args:
+            centavos (int): Valor em centavos (ou na escala pedida); None é mantido
+            escala (int): Unidades por real. Default: centavos
+            
+        Returns:
+            float: Valor em reais
+        """
+        if centavos is None:
+            return None
+        return int(centavos) / escala
+    
+    @staticmethod
+    def calcular_lote_centavos(faturamento_produto, faturamento_servico, custo_produto, grupos=None):
+        """
+        Calcula os valores de várias tarefas e seus totais, em centavos inteiros
+        
+        Mesmo resultado de calcular_lote, com entradas e valores em centavos;
+        as somas são exatas para qualquer quantidade de tarefas. As tarefas
+        são calculadas uma a uma em Python (laço comum, não vetorizado).
+        
+        Args:
+            faturamento_produto (sequence): Faturamento de produtos de cada tarefa (centavos)
+            faturamento_servico (sequence): Faturamento de serviços de cada tarefa (centavos)
+            custo_produto (sequence): Custo dos produtos de cada tarefa (centavos)
+            grupos (sequence, optional): Chave de agrupamento de cada tarefa
+            
+        Returns:
+            dict: Mesmo formato de calcular_lote, com os valores em centavos
+        """
+        tarefas = [
+            {
+                'faturamento_produto': fp,
+                'faturamento_servico': fs,
+                'faturamento_total': fp + fs,
+                'custo_produto': cp,
+                'lucro_produto': fp - cp,
+                'lucro_servico': fs,                # lucro de serviço = faturamento de serviço
+                'lucro_total': fp - cp + fs
+            }
+            for fp, fs, cp in zip(
+                map(int, faturamento_produto), map(int, faturamento_servico), map(int, custo_produto)
+            )
+        ]
+        
+        total = {chave: sum(valores[chave] for valores in tarefas) for chave in CHAVES_VALORES}
+        
+        acumulados = {}
+        if grupos is not None:
+            for valores, grupo in zip(tarefas, grupos):
+                acumulado = acumulados.setdefault(grupo, dict.fromkeys(CHAVES_VALORES, 0))
+                for chave in CHAVES_VALORES:
+                    acumulado[chave] += valores[chave]
+        
+        resultado = {
+            'tarefas': tarefas,
+            'total': {'valores': total, 'porcentagens': CalculosService.calcular_porcentagens(total)}
+        }
+        
+        if grupos is not None:
+            resultado['grupos'] = {
+                chave: {'valores': valores, 'porcentagens': CalculosService.calcular_porcentagens(valores)}
+                for chave, valores in acumulados.items()
+            }
+        
+        return resultado
+    
+    @staticmethod
+    def calcular_lote(faturamento_produto, faturamento_servico, custo_produto, grupos=None):
+        """
+        Calcula os valores de várias tarefas e seus totais em uma só chamada
+        
+        API em lote: reúne em um lugar as regras dos valores por tarefa, dos
+        totais e dos grupos. O cálculo continua tarefa a tarefa em Python, com
+        o mesmo custo de chamar calcular_todos_os_valores para cada uma.
+        
+        As sequências (listas, tuplas ou qualquer iterável) têm um elemento
+        por tarefa, na mesma ordem. Os valores são convertidos para centavos,
+        somados com calcular_lote_centavos e devolvidos em reais.
+        
+        Args:
+            faturamento_produto (sequence): Faturamento de produtos de cada tarefa
+            faturamento_servico (sequence): Faturamento de serviços de cada tarefa
+            custo_produto (sequence): Custo dos produtos de cada tarefa
+            grupos (sequence, optional): Chave de agrupamento de cada tarefa
+                (ex.: dia ou colaborador)
+            
+        Returns:
+            dict: 'tarefas' (valores de cada tarefa, na ordem recebida), 'total'
+                e, se houver grupos, 'grupos' ({chave: resultado}); total e cada
+                grupo no formato de calcular_todos_os_valores
+        """
+        para_centavos = CalculosService.para_centavos
+        resultado = CalculosService.calcular_lote_centavos(
+            map(para_centavos, faturamento_produto),
+            map(para_centavos, faturamento_servico),
+            map(para_centavos, custo_produto),
+            grupos
+        )
+        
+        resultado['tarefas'] = [CalculosService.valores_em_reais(valores) for valores in resultado['tarefas']]
+        resultado['total']['valores'] = CalculosService.valores_em_reais(resultado['total']['valores'])
+        for grupo in resultado.get('grupos', {}).values():
+            grupo['valores'] = CalculosService.valores_em_reais(grupo['valores'])
+        
+        return resultado
+    
+    @staticmethod
+    def valores_em_reais(valores):
+        """
+        Converte para reais os valores em centavos de um resultado do cálculo em lote
+        
+        Args:
+            valores (dict): Chaves de CHAVES_VALORES em centavos
+            
+        Returns:
+            dict: Mesmas chaves, em reais
+        """
+        return {chave: CalculosService.para_reais(valor) for chave, valor in valores.items()}
     
     @staticmethod
     def calcular_todos_os_valores(faturamento_produto, faturamento_servico, custo_produto):
@@ -163,38 +345,7 @@ class CalculosService:
         Returns:
             dict: Dicionário com todos os valores calculados
         """
-        
-        # Cálculos básicos
-        faturamento_total = CalculosService.calcular_faturamento_total(faturamento_produto, faturamento_servico)
-        lucro_produto = CalculosService.calcular_lucro_produto(faturamento_produto, custo_produto)
-        lucro_servico = CalculosService.calcular_lucro_servico(faturamento_servico)
-        lucro_total = CalculosService.calcular_lucro_total(lucro_produto, lucro_servico)
-        
-        # Porcentagens
-        porc_faturamento_produto = CalculosService.calcular_porcentagem_faturamento_produto(faturamento_produto, faturamento_total)
-        porc_faturamento_servico = CalculosService.calcular_porcentagem_faturamento_servico(faturamento_servico, faturamento_total)
-        porc_lucro_produto = CalculosService.calcular_porcentagem_lucro_produto(lucro_produto, lucro_total)
-        porc_lucro_servico = CalculosService.calcular_porcentagem_lucro_servico(lucro_servico, lucro_total)
-        porc_lucro_faturamento = CalculosService.calcular_porcentagem_lucro_faturamento(lucro_total, faturamento_total)
-        
-        resultado = {
-            'valores': {
-                'faturamento_total': faturamento_total,
-                'faturamento_produto': faturamento_produto,
-                'faturamento_servico': faturamento_servico,
-                'custo_produto': custo_produto,
-                'lucro_total': lucro_total,
-                'lucro_produto': lucro_produto,
-                'lucro_servico': lucro_servico
-            },
-            'porcentagens': {
-                'faturamento_produto': porc_faturamento_produto,
-                'faturamento_servico': porc_faturamento_servico,
-                'lucro_produto': porc_lucro_produto,
-                'lucro_servico': porc_lucro_servico,
-                'lucro_faturamento': porc_lucro_faturamento
-            }
-        }
+        resultado = CalculosService.calcular_lote([faturamento_produto], [faturamento_servico], [custo_produto])['total']
         
         logger.debug(f"📊 Cálculos realizados: {resultado}")
         
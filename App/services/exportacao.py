@@ -0,0 +1,467 @@
+"""
+Exportação das tarefas para CSV e XLSX com memória limitada
+
+As tarefas são lidas do banco em lotes (TarefaController.iter_tasks) e
+escritas conforme chegam: o CSV sai direto na resposta HTTP e o XLSX é
+gravado pelo openpyxl em modo write-only. Exportações grandes podem rodar
+em segundo plano (ExportJobService) e ser baixadas depois pelo link do job.
+
+Os jobs ficam em memória, como os de sincronização: cada processo do
+servidor conhece apenas os jobs que ele mesmo iniciou.
+"""
+
+import copy
+import csv
+import io
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context, Response, send_file, stream_with_context
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from ..Controllers.tarefas import TarefaController, REPORT_STREAM_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = ('csv', 'xlsx')
+MIMETYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+COLUNAS = (
+    'ID', 'Data', 'Cliente', 'Tipo de tarefa', 'Colaborador', 'Itens',
+    'Valor total', 'Custo total', 'Lucro bruto'
+)
+
+# Padrões para EXPORT_JOBS_MAX_WORKERS e EXPORT_JOBS_RETENCAO_MINUTOS
+EXPORT_JOBS_MAX_WORKERS = 1
+EXPORT_JOBS_RETENCAO_MINUTOS = 60
+
+
+class ExportacaoService:
+    """Geração dos arquivos de exportação das tarefas"""
+
+    @staticmethod
+    def nome_arquivo(formato, prefixo='relatorio_tarefas'):
+        """Nome sugerido para o download, com data e hora"""
+        return f'{prefixo}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{formato}'
+
+    @staticmethod
+    def iter_linhas(usuario_id, filters, sort='data', order='asc'):
+        """
+        Percorre as tarefas filtradas como tuplas na ordem de COLUNAS
+
+        Args:
+            usuario_id (int): ID do usuário
+            filters (dict): data_inicial, data_final e os filtros de apply_task_filters
+            sort (str): Coluna de ordenação (ver REPORT_SORT_COLUMNS)
+            order (str): 'asc' ou 'desc'
+
+        Returns:
+            Iterável de tuplas (valores numéricos e datas sem formatação)
+
+        Raises:
+            ValueError: Ordenação ou direção inválidas (na chamada)
+        """
+        tarefas = TarefaController.iter_tasks(
+            usuario_id, filters.get('data_inicial'), filters.get('data_final'), filters,
+            sort=sort, order=order
+        )
+        nomes = TarefaController.load_item_names(usuario_id)
+
+        def linhas():
+            for tarefa in tarefas:
+                yield (
+                    tarefa.id,
+                    tarefa.data,
+                    tarefa.cliente or '',
+                    tarefa.tipo_tarefa.descricao if tarefa.tipo_tarefa else '',
+                    tarefa.colaborador.nome if tarefa.colaborador else '',
+                    TarefaController.describe_task_items(tarefa, nomes),
+                    tarefa.valor_total,
+                    tarefa.custo_total,
+                    tarefa.lucro_bruto
+                )
+
+        return linhas()
+
+    @staticmethod
+    def _valor_csv(valor):
+        """Formata datas e números no padrão brasileiro do Excel"""
+        if isinstance(valor, datetime):
+            return valor.strftime('%d/%m/%Y %H:%M')
+        if isinstance(valor, float):
+            return f'{valor:.2f}'.replace('.', ',')
+        return valor
+
+    @staticmethod
+    def gerar_csv(linhas, progresso=None):
+        """
+        Gera o CSV em blocos de texto, um bloco por lote de linhas
+
+        Usa ';' como separador e BOM UTF-8 para o Excel abrir acentos e
+        decimais com vírgula corretamente.
+
+        Args:
+            linhas: Iterável de ExportacaoService.iter_linhas
+            progresso (callable, optional): Recebe o total de linhas já escritas
+
+        Yields:
+            str: Trechos do arquivo
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';')
+
+        buffer.write('\ufeff')
+        writer.writerow(COLUNAS)
+
+        total = 0
+        for linha in linhas:
+            writer.writerow([ExportacaoService._valor_csv(valor) for valor in linha])
+            total += 1
+
+            if total % REPORT_STREAM_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                if progresso:
+                    progresso(total)
+
+        yield buffer.getvalue()
+        if progresso:
+            progresso(total)
+
+    @staticmethod
+    def escrever_xlsx(linhas, destino, resumo=None, progresso=None):
+        """
+        Escreve o XLSX em modo write-only (as linhas não ficam em memória)
+
+        Args:
+            linhas: Iterável de ExportacaoService.iter_linhas
+            destino: Caminho ou arquivo binário de saída
+            resumo (dict, optional): Resultado de get_financial_summary para a aba "Resumo"
+            progresso (callable, optional): Recebe o total de linhas já escritas
+
+        Returns:
+            int: Quantidade de linhas de tarefas escritas
+        """
+        workbook = Workbook(write_only=True)
+
+        if resumo:
+            ExportacaoService._escrever_resumo(workbook.create_sheet('Resumo'), resumo)
+
+        sheet = workbook.create_sheet('Tarefas')
+        sheet.append(COLUNAS)
+
+        total = 0
+        for linha in linhas:
+            cells = list(linha)
+
+            data = WriteOnlyCell(sheet, value=cells[1])
+            data.number_format = 'DD/MM/YYYY HH:MM'
+            cells[1] = data
+
+            for index in (6, 7, 8):
+                valor = WriteOnlyCell(sheet, value=cells[index])
+                valor.number_format = '#,##0.00'
+                cells[index] = valor
+
+            sheet.append(cells)
+            total += 1
+
+            if progresso and total % REPORT_STREAM_BATCH_SIZE == 0:
+                progresso(total)
+
+        workbook.save(destino)
+        if progresso:
+            progresso(total)
+
+        return total
+
+    @staticmethod
+    def _escrever_resumo(sheet, resumo):
+        """Escreve os totais do dashboard em uma aba de resumo"""
+        faturamento = resumo['faturamento']
+        lucro = resumo['lucro']
+
+        sheet.append(('Indicador', 'Valor', '%'))
+        sheet.append(('Quantidade de tarefas', resumo.get('quantidade_tarefas', 0), None))
+        sheet.append(('Faturamento total', faturamento['total'], None))
+        sheet.append(('Faturamento produtos', faturamento['produto'], faturamento['porcentagem_produto']))
+        sheet.append(('Faturamento serviços', faturamento['servico'], faturamento['porcentagem_servico']))
+        sheet.append(('Lucro total', lucro['total'], lucro['margem_lucro']))
+        sheet.append(('Lucro produtos', lucro['produto'], lucro['porcentagem_produto']))
+        sheet.append(('Lucro serviços', lucro['servico'], lucro['porcentagem_servico']))
+
+    @staticmethod
+    def escrever_arquivo(usuario_id, formato, filters, destino, incluir_resumo=False, progresso=None):
+        """
+        Grava a exportação completa em um arquivo
+
+        Args:
+            usuario_id (int): ID do usuário
+            formato (str): 'csv' ou 'xlsx'
+            filters (dict): Filtros do relatório
+            destino (str): Caminho do arquivo
+            incluir_resumo (bool): Inclui a aba de resumo do dashboard (apenas XLSX)
+            progresso (callable, optional): Recebe o total de linhas já escritas
+
+        Raises:
+            ValueError: Formato inválido
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f'Formato inválido: {formato}')
+
+        linhas = ExportacaoService.iter_linhas(usuario_id, filters)
+
+        if formato == 'csv':
+            with open(destino, 'w', encoding='utf-8', newline='') as arquivo:
+                for trecho in ExportacaoService.gerar_csv(linhas, progresso):
+                    arquivo.write(trecho)
+            return
+
+        resumo = None
+        if incluir_resumo:
+            resumo = TarefaController.get_financial_summary(
+                usuario_id, filters.get('data_inicial'), filters.get('data_final'), filters
+            )
+        ExportacaoService.escrever_xlsx(linhas, destino, resumo, progresso)
+
+
+    @staticmethod
+    def resposta_download(usuario_id, formato, filters, incluir_resumo=False, prefixo='relatorio_tarefas'):
+        """
+        Monta a resposta HTTP de download da exportação
+
+        O CSV é gerado durante o envio. O XLSX precisa do arquivo completo
+        (é um zip), então é gravado em um arquivo temporário, enviado e apagado.
+
+        Args:
+            usuario_id (int): ID do usuário
+            formato (str): 'csv' ou 'xlsx'
+            filters (dict): Filtros do relatório
+            incluir_resumo (bool): Inclui a aba de resumo do dashboard (apenas XLSX)
+            prefixo (str): Prefixo do nome do arquivo baixado
+
+        Returns:
+            Response: Resposta com Content-Disposition de anexo
+
+        Raises:
+            ValueError: Formato ou filtros inválidos
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f'Formato inválido: {formato}')
+
+        nome = ExportacaoService.nome_arquivo(formato, prefixo)
+
+        if formato == 'csv':
+            linhas = ExportacaoService.iter_linhas(usuario_id, filters)
+            return Response(
+                stream_with_context(ExportacaoService.gerar_csv(linhas)),
+                mimetype=MIMETYPES['csv'],
+                headers={'Content-Disposition': f'attachment; filename="{nome}"'}
+            )
+
+        descritor, caminho = tempfile.mkstemp(suffix='.xlsx')
+        os.close(descritor)
+        try:
+            ExportacaoService.escrever_arquivo(usuario_id, formato, filters, caminho, incluir_resumo)
+            resposta = send_file(caminho, mimetype=MIMETYPES['xlsx'], as_attachment=True, download_name=nome)
+        except Exception:
+            os.remove(caminho)
+            raise
+
+        resposta.call_on_close(lambda: os.path.exists(caminho) and os.remove(caminho))
+        return resposta
+
+
+class ExportJobService:
+    """Fila em memória de exportações em segundo plano"""
+
+    _executor = None
+    _lock = threading.Lock()
+    _jobs = {}
+    _futures = {}
+
+    @staticmethod
+    def _config(key, default):
+        """Lê uma configuração numérica da aplicação"""
+        if has_app_context():
+            return int(current_app.config.get(key, default))
+        return default
+
+    @staticmethod
+    def _diretorio():
+        """Pasta dos arquivos gerados (EXPORT_DIR ou instance/exports)"""
+        diretorio = current_app.config.get('EXPORT_DIR') or os.path.join(current_app.instance_path, 'exports')
+        os.makedirs(diretorio, exist_ok=True)
+        return diretorio
+
+    @staticmethod
+    def _get_executor():
+        """Retorna o pool de threads das exportações, criando-o na primeira chamada"""
+        with ExportJobService._lock:
+            if ExportJobService._executor is None:
+                ExportJobService._executor = ThreadPoolExecutor(
+                    max_workers=ExportJobService._config('EXPORT_JOBS_MAX_WORKERS', EXPORT_JOBS_MAX_WORKERS),
+                    thread_name_prefix='export-job'
+                )
+            return ExportJobService._executor
+
+    @staticmethod
+    def enfileirar(user_id, formato, filters, incluir_resumo=False, prefixo='relatorio_tarefas'):
+        """
+        Enfileira uma exportação
+
+        Args:
+            user_id (int): ID do usuário
+            formato (str): 'csv' ou 'xlsx'
+            filters (dict): Filtros do relatório
+            incluir_resumo (bool): Inclui a aba de resumo do dashboard (apenas XLSX)
+            prefixo (str): Prefixo do nome do arquivo baixado
+
+        Returns:
+            str: ID do job
+
+        Raises:
+            ValueError: Formato inválido
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f'Formato inválido: {formato}')
+
+        app = current_app._get_current_object()
+        job_id = uuid.uuid4().hex
+
+        with ExportJobService._lock:
+            ExportJobService._remover_antigos()
+            ExportJobService._jobs[job_id] = {
+                'id': job_id,
+                'usuario_id': user_id,
+                'formato': formato,
+                'filtros': dict(filters),
+                'incluir_resumo': incluir_resumo,
+                'status': 'pendente',
+                'linhas': 0,
+                'mensagem': None,
+                'arquivo': os.path.join(ExportJobService._diretorio(), f'{job_id}.{formato}'),
+                'nome_arquivo': ExportacaoService.nome_arquivo(formato, prefixo),
+                'criado_em': datetime.now(),
+                'finalizado_em': None
+            }
+
+        future = ExportJobService._get_executor().submit(ExportJobService._executar, app, job_id)
+        with ExportJobService._lock:
+            ExportJobService._futures[job_id] = future
+
+        logger.debug(f"📨 Exportação {job_id} ({formato}) enfileirada para usuário {user_id}")
+        return job_id
+
+    @staticmethod
+    def _executar(app, job_id):
+        """Gera o arquivo em um app context próprio"""
+        with app.app_context():
+            with ExportJobService._lock:
+                job = ExportJobService._jobs[job_id]
+                job['status'] = 'executando'
+                parametros = (job['usuario_id'], job['formato'], dict(job['filtros']), job['arquivo'], job['incluir_resumo'])
+
+            def progresso(linhas):
+                with ExportJobService._lock:
+                    job['linhas'] = linhas
+
+            try:
+                ExportacaoService.escrever_arquivo(*parametros, progresso=progresso)
+                status = 'concluido'
+                mensagem = 'Exportação concluída'
+
+            except Exception as e:
+                logger.error(f"❌ Erro na exportação {job_id}: {str(e)}")
+                status = 'erro'
+                mensagem = f'Erro durante exportação: {str(e)}'
+                if os.path.exists(parametros[3]):
+                    os.remove(parametros[3])
+
+            with ExportJobService._lock:
+                job['status'] = status
+                job['mensagem'] = mensagem
+                job['finalizado_em'] = datetime.now()
+
+    @staticmethod
+    def _remover_antigos():
+        """Remove jobs (e arquivos) finalizados há mais tempo que a retenção (chamar com o lock)"""
+        limite = datetime.now() - timedelta(
+            minutes=ExportJobService._config('EXPORT_JOBS_RETENCAO_MINUTOS', EXPORT_JOBS_RETENCAO_MINUTOS)
+        )
+        antigos = [
+            job_id for job_id, job in ExportJobService._jobs.items()
+            if job['finalizado_em'] and job['finalizado_em'] < limite
+        ]
+        for job_id in antigos:
+            job = ExportJobService._jobs.pop(job_id, None)
+            ExportJobService._futures.pop(job_id, None)
+            if job and os.path.exists(job['arquivo']):
+                os.remove(job['arquivo'])
+
+    @staticmethod
+    def get_job(job_id):
+        """
+        Retorna uma cópia do estado atual do job
+
+        Args:
+            job_id (str): ID do job
+
+        Returns:
+            dict: Estado do job ou None se não existir
+        """
+        with ExportJobService._lock:
+            job = ExportJobService._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    @staticmethod
+    def aguardar(job_id, timeout=None):
+        """
+        Bloqueia até o job terminar
+
+        Args:
+            job_id (str): ID do job
+            timeout (float, optional): Tempo máximo de espera em segundos
+
+        Returns:
+            dict: Estado final do job
+        """
+        with ExportJobService._lock:
+            future = ExportJobService._futures.get(job_id)
+        if future:
+            future.result(timeout=timeout)
+        return ExportJobService.get_job(job_id)
+
+    @staticmethod
+    def serializar(job, download_url=None):
+        """
+        Converte o estado do job para a resposta JSON
+
+        Args:
+            job (dict): Estado do job (ver get_job)
+            download_url (str, optional): Link de download, incluído quando o arquivo está pronto
+
+        Returns:
+            dict: Job sem o caminho interno do arquivo
+        """
+        return {
+            'id': job['id'],
+            'status': job['status'],
+            'formato': job['formato'],
+            'linhas': job['linhas'],
+            'mensagem': job['mensagem'],
+            'nome_arquivo': job['nome_arquivo'],
+            'download_url': download_url if job['status'] == 'concluido' else None,
+            'criado_em': job['criado_em'].isoformat(),
+            'finalizado_em': job['finalizado_em'].isoformat() if job['finalizado_em'] else None
+        }
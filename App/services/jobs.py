@@ -0,0 +1,221 @@
+"""
+Execução de sincronizações em segundo plano
+
+As rotas de login e de consulta enfileiram a sincronização e respondem na
+hora com o ID do job. O job roda em um pool de threads do próprio processo,
+cada um com seu app context (e portanto sua sessão do banco), e registra o
+progresso de cada etapa para ser consultado em /sync/jobs/<id>.
+
+Os jobs ficam em memória: cada processo do servidor conhece apenas os jobs
+que ele mesmo iniciou.
+"""
+
+import copy
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+
+from .sincronizacao import SincronizacaoService
+
+logger = logging.getLogger(__name__)
+
+# Padrões para SYNC_JOBS_MAX_WORKERS e SYNC_JOBS_RETENCAO_MINUTOS
+JOBS_MAX_WORKERS = 2
+JOBS_RETENCAO_MINUTOS = 60
+
+ETAPAS = ('produtos', 'servicos', 'colaboradores', 'tipos_tarefa', 'tarefas')
+
+
+class SyncJobService:
+    """Fila em memória de jobs de sincronização"""
+
+    _executor = None
+    _lock = threading.Lock()
+    _jobs = {}
+    _futures = {}
+
+    @staticmethod
+    def _config(key, default):
+        """Lê uma configuração numérica da aplicação"""
+        if has_app_context():
+            return int(current_app.config.get(key, default))
+        return default
+
+    @staticmethod
+    def _get_executor():
+        """Retorna o pool de threads dos jobs, criando-o na primeira chamada"""
+        with SyncJobService._lock:
+            if SyncJobService._executor is None:
+                SyncJobService._executor = ThreadPoolExecutor(
+                    max_workers=SyncJobService._config('SYNC_JOBS_MAX_WORKERS', JOBS_MAX_WORKERS),
+                    thread_name_prefix='sync-job'
+                )
+            return SyncJobService._executor
+
+    @staticmethod
+    def enfileirar(user_id, start_date=None, end_date=None, incremental=True):
+        """
+        Enfileira a sincronização completa de um usuário
+
+        Se já existe um job pendente ou em execução do mesmo usuário com os
+        mesmos parâmetros, ele é reaproveitado.
+
+        Args:
+            user_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD)
+            end_date (str, optional): Data final (YYYY-MM-DD)
+            incremental (bool): Se True, reaproveita dados já sincronizados
+
+        Returns:
+            str: ID do job
+        """
+        app = current_app._get_current_object()
+        parametros = {'start_date': start_date, 'end_date': end_date, 'incremental': incremental}
+
+        with SyncJobService._lock:
+            SyncJobService._remover_antigos()
+
+            for job in SyncJobService._jobs.values():
+                if job['usuario_id'] == user_id and job['parametros'] == parametros and job['status'] in ('pendente', 'executando'):
+                    logger.debug(f"♻️ Reaproveitando job {job['id']} do usuário {user_id}")
+                    return job['id']
+
+            job_id = uuid.uuid4().hex
+            SyncJobService._jobs[job_id] = {
+                'id': job_id,
+                'usuario_id': user_id,
+                'parametros': parametros,
+                'status': 'pendente',
+                'etapas': {etapa: {'status': 'pendente'} for etapa in ETAPAS},
+                'mensagem': None,
+                'resultado': None,
+                'tempos': None,
+                'criado_em': datetime.now(),
+                'iniciado_em': None,
+                'finalizado_em': None
+            }
+            SyncJobService._jobs[job_id]['etapas']['tarefas'].update({'paginas_concluidas': 0, 'paginas_total': None})
+
+        future = SyncJobService._get_executor().submit(SyncJobService._executar, app, job_id)
+        with SyncJobService._lock:
+            SyncJobService._futures[job_id] = future
+
+        logger.debug(f"📨 Job {job_id} enfileirado para usuário {user_id}")
+        return job_id
+
+    @staticmethod
+    def _executar(app, job_id):
+        """Executa o job em um app context próprio"""
+        with app.app_context():
+            with SyncJobService._lock:
+                job = SyncJobService._jobs[job_id]
+                job['status'] = 'executando'
+                job['iniciado_em'] = datetime.now()
+                user_id = job['usuario_id']
+                parametros = dict(job['parametros'])
+
+            try:
+                resultado = SincronizacaoService.sincronizar_tudo(
+                    user_id,
+                    progresso=lambda etapa, **dados: SyncJobService._atualizar_etapa(job_id, etapa, **dados),
+                    **parametros
+                )
+                status = 'concluido' if resultado['success'] else 'erro'
+                mensagem = resultado['message']
+
+            except Exception as e:
+                logger.error(f"❌ Erro no job {job_id}: {str(e)}")
+                resultado = None
+                status = 'erro'
+                mensagem = f'Erro durante sincronização: {str(e)}'
+
+            with SyncJobService._lock:
+                job['status'] = status
+                job['mensagem'] = mensagem
+                job['resultado'] = resultado
+                job['tempos'] = resultado['data']['tempos'] if resultado else None
+                job['finalizado_em'] = datetime.now()
+
+    @staticmethod
+    def _atualizar_etapa(job_id, etapa, **dados):
+        """Registra o progresso de uma etapa do job"""
+        with SyncJobService._lock:
+            SyncJobService._jobs[job_id]['etapas'][etapa].update(dados)
+
+    @staticmethod
+    def _remover_antigos():
+        """Remove jobs finalizados há mais tempo que a retenção (chamar com o lock)"""
+        limite = datetime.now() - timedelta(
+            minutes=SyncJobService._config('SYNC_JOBS_RETENCAO_MINUTOS', JOBS_RETENCAO_MINUTOS)
+        )
+        antigos = [
+            job_id for job_id, job in SyncJobService._jobs.items()
+            if job['finalizado_em'] and job['finalizado_em'] < limite
+        ]
+        for job_id in antigos:
+            SyncJobService._jobs.pop(job_id, None)
+            SyncJobService._futures.pop(job_id, None)
+
+    @staticmethod
+    def get_job(job_id):
+        """
+        Retorna uma cópia do estado atual do job
+
+        Args:
+            job_id (str): ID do job
+
+        Returns:
+            dict: Estado do job ou None se não existir
+        """
+        with SyncJobService._lock:
+            job = SyncJobService._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    @staticmethod
+    def aguardar(job_id, timeout=None):
+        """
+        Bloqueia até o job terminar
+
+        Args:
+            job_id (str): ID do job
+            timeout (float, optional): Tempo máximo de espera em segundos
+
+        Returns:
+            dict: Estado final do job
+        """
+        with SyncJobService._lock:
+            future = SyncJobService._futures.get(job_id)
+        if future:
+            future.result(timeout=timeout)
+        return SyncJobService.get_job(job_id)
+
+    @staticmethod
+    def serializar(job):
+        """
+        Converte o estado do job para a resposta JSON
+
+        Args:
+            job (dict): Estado do job (ver get_job)
+
+        Returns:
+            dict: Job com datas em ISO 8601, progresso geral e duração das etapas
+        """
+        etapas_concluidas = sum(1 for etapa in job['etapas'].values() if etapa['status'] in ('concluido', 'erro'))
+
+        return {
+            'id': job['id'],
+            'status': job['status'],
+            'mensagem': job['mensagem'],
+            'etapas': job['etapas'],
+            'etapas_concluidas': etapas_concluidas,
+            'etapas_total': len(job['etapas']),
+            'tempos': job['tempos'],
+            'parametros': job['parametros'],
+            'criado_em': job['criado_em'].isoformat(),
+            'iniciado_em': job['iniciado_em'].isoformat() if job['iniciado_em'] else None,
+            'finalizado_em': job['finalizado_em'].isoformat() if job['finalizado_em'] else None
+        }
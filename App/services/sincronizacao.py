@@ -0,0 +1,548 @@
+"""
+Serviço de sincronização incremental com a API da Auvo
+
+Este módulo guarda o estado de sincronização de cada usuário:
+- Cadastros (produtos, serviços, colaboradores e tipos de tarefa) têm um
+  checkpoint e só são baixados novamente quando ele expira
+- Tarefas têm uma tabela de intervalos de datas já cobertos; uma consulta
+  dentro desses intervalos é respondida direto do banco e só as lacunas e a
+  janela recente em que as tarefas ainda podem mudar na Auvo são baixadas
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy.pool import StaticPool
+
+from .. import db
+from ..Models import Usuario, CheckpointSincronizacao, CoberturaTarefas, PaginacaoTarefas
+from ..Controllers.auth_api import AuthController
+from ..Controllers.produtos import ProdutoController
+from ..Controllers.serviço import ServicoController
+from ..Controllers.Colaborador import ColaboradorController
+from ..Controllers.tipo_de_tarefas import TipoTarefaController
+from ..Controllers.tarefas import TarefaController
+
+logger = logging.getLogger(__name__)
+
+# Padrões para SYNC_CATALOGO_VALIDADE_MINUTOS, SYNC_TAREFAS_VALIDADE_MINUTOS e SYNC_JANELA_MUTAVEL_DIAS
+CATALOGO_VALIDADE_MINUTOS = 30
+TAREFAS_VALIDADE_MINUTOS = 5
+JANELA_MUTAVEL_DIAS = 3
+
+# Padrão para SYNC_CATALOGOS_MAX_WORKERS
+CATALOGOS_MAX_WORKERS = 4
+
+
+class SincronizacaoService:
+    """Serviço para sincronização incremental de cadastros e tarefas"""
+
+    # Entidade -> (controller, método de sincronização do cadastro)
+    CATALOGOS = {
+        'produtos': (ProdutoController, 'fetch_and_save_products'),
+        'servicos': (ServicoController, 'fetch_and_save_services'),
+        'colaboradores': (ColaboradorController, 'fetch_and_save_collaborators'),
+        'tipos_tarefa': (TipoTarefaController, 'fetch_and_save_task_types'),
+    }
+
+    @staticmethod
+    def _config(key, default):
+        """Lê uma configuração numérica da aplicação"""
+        if has_app_context():
+            return int(current_app.config.get(key, default))
+        return default
+
+    @staticmethod
+    def get_checkpoint(usuario_id, entidade):
+        """
+        Busca o checkpoint de uma entidade
+
+        Args:
+            usuario_id (int): ID do usuário
+            entidade (str): Nome da entidade
+
+        Returns:
+            CheckpointSincronizacao: Checkpoint ou None
+        """
+        return CheckpointSincronizacao.query.filter_by(usuario_id=usuario_id, entidade=entidade).first()
+
+    @staticmethod
+    def registrar_checkpoint(usuario_id, entidade, sincronizado_em=None):
+        """
+        Salva ou atualiza o checkpoint de uma entidade
+
+        Args:
+            usuario_id (int): ID do usuário
+            entidade (str): Nome da entidade
+            sincronizado_em (datetime, optional): Momento da sincronização. Default: agora
+        """
+        checkpoint = SincronizacaoService.get_checkpoint(usuario_id, entidade)
+
+        if not checkpoint:
+            checkpoint = CheckpointSincronizacao(usuario_id=usuario_id, entidade=entidade)
+            db.session.add(checkpoint)
+
+        checkpoint.sincronizado_em = sincronizado_em or datetime.now()
+
+        db.session.commit()
+
+    @staticmethod
+    def limpar_checkpoints(usuario_id):
+        """
+        Remove todos os checkpoints, intervalos cobertos e paginações pendentes do usuário (sem commit)
+
+        Args:
+            usuario_id (int): ID do usuário
+        """
+        CheckpointSincronizacao.query.filter_by(usuario_id=usuario_id).delete()
+        CoberturaTarefas.query.filter_by(usuario_id=usuario_id).delete()
+        PaginacaoTarefas.query.filter_by(usuario_id=usuario_id).delete()
+
+    @staticmethod
+    def catalogo_atualizado(usuario_id, entidade, agora=None):
+        """
+        Verifica se o cadastro foi sincronizado dentro do prazo de validade
+
+        Args:
+            usuario_id (int): ID do usuário
+            entidade (str): Nome da entidade
+            agora (datetime, optional): Momento de referência. Default: agora
+
+        Returns:
+            bool: True se o cadastro ainda está válido
+        """
+        checkpoint = SincronizacaoService.get_checkpoint(usuario_id, entidade)
+        if not checkpoint:
+            return False
+
+        validade = timedelta(minutes=SincronizacaoService._config('SYNC_CATALOGO_VALIDADE_MINUTOS', CATALOGO_VALIDADE_MINUTOS))
+        return (agora or datetime.now()) - checkpoint.sincronizado_em < validade
+
+    @staticmethod
+    def sincronizar_catalogo(user_id, entidade, incremental=True):
+        """
+        Sincroniza um cadastro, pulando o download se o checkpoint ainda for válido
+
+        Args:
+            user_id (int): ID do usuário
+            entidade (str): Nome do cadastro (chave de CATALOGOS)
+            incremental (bool): Se True, reaproveita o cadastro ainda válido
+
+        Returns:
+            dict: Resultado da sincronização
+        """
+        if incremental and SincronizacaoService.catalogo_atualizado(user_id, entidade):
+            logger.debug(f"♻️ Cadastro {entidade} em cache para usuário {user_id}")
+            return {
+                'success': True,
+                'message': f'Cadastro de {entidade} em cache',
+                'data': {'cached': True, 'saved': 0, 'updated': 0, 'errors': 0}
+            }
+
+        controller, metodo = SincronizacaoService.CATALOGOS[entidade]
+        result = getattr(controller, metodo)(user_id)
+
+        if result.get('success'):
+            SincronizacaoService.registrar_checkpoint(user_id, entidade)
+
+        return result
+
+    @staticmethod
+    def listar_coberturas(usuario_id):
+        """
+        Lista os intervalos de tarefas já sincronizados, em ordem de data
+
+        Args:
+            usuario_id (int): ID do usuário
+
+        Returns:
+            list: Lista de CoberturaTarefas
+        """
+        return CoberturaTarefas.query.filter_by(usuario_id=usuario_id).order_by(
+            CoberturaTarefas.cobertura_inicio
+        ).all()
+
+    @staticmethod
+    def _faixa_definitiva(cobertura, agora):
+        """
+        Retorna a parte do intervalo coberto que não precisa ser re-checada
+
+        Um intervalo sincronizado há menos de SYNC_TAREFAS_VALIDADE_MINUTOS vale
+        inteiro. Depois disso, os dias dentro da janela mutável no momento da
+        sincronização ainda podiam mudar e ficam de fora.
+
+        Args:
+            cobertura (CoberturaTarefas): Intervalo coberto
+            agora (datetime): Momento de referência
+
+        Returns:
+            tuple: (inicio, fim) como date, ou None se não houver faixa definitiva
+        """
+        validade = timedelta(minutes=SincronizacaoService._config('SYNC_TAREFAS_VALIDADE_MINUTOS', TAREFAS_VALIDADE_MINUTOS))
+        if agora - cobertura.sincronizado_em < validade:
+            return cobertura.cobertura_inicio, cobertura.cobertura_fim
+
+        janela = SincronizacaoService._config('SYNC_JANELA_MUTAVEL_DIAS', JANELA_MUTAVEL_DIAS)
+        fim = min(cobertura.cobertura_fim, cobertura.sincronizado_em.date() - timedelta(days=janela))
+
+        if fim < cobertura.cobertura_inicio:
+            return None
+
+        return cobertura.cobertura_inicio, fim
+
+    @staticmethod
+    def _totalmente_definitiva(cobertura):
+        """Indica se nenhum dia do intervalo estava na janela mutável quando foi sincronizado"""
+        janela = SincronizacaoService._config('SYNC_JANELA_MUTAVEL_DIAS', JANELA_MUTAVEL_DIAS)
+        return cobertura.cobertura_fim <= cobertura.sincronizado_em.date() - timedelta(days=janela)
+
+    @staticmethod
+    def calcular_intervalos_pendentes(usuario_id, data_inicial, data_final, agora=None):
+        """
+        Calcula os intervalos do período que precisam ser baixados da API
+
+        Args:
+            usuario_id (int): ID do usuário
+            data_inicial (date): Primeiro dia do período
+            data_final (date): Último dia do período (inclusivo)
+            agora (datetime, optional): Momento de referência. Default: agora
+
+        Returns:
+            list: Lista de tuplas (inicio, fim) como date
+        """
+        agora = agora or datetime.now()
+        intervalos = []
+        proximo_dia = data_inicial
+
+        for cobertura in SincronizacaoService.listar_coberturas(usuario_id):
+            faixa = SincronizacaoService._faixa_definitiva(cobertura, agora)
+            if not faixa or faixa[1] < proximo_dia:
+                continue
+            if faixa[0] > data_final:
+                break
+
+            if faixa[0] > proximo_dia:
+                intervalos.append((proximo_dia, faixa[0] - timedelta(days=1)))
+            proximo_dia = faixa[1] + timedelta(days=1)
+
+        if proximo_dia <= data_final:
+            intervalos.append((proximo_dia, data_final))
+
+        return intervalos
+
+    @staticmethod
+    def registrar_cobertura(usuario_id, inicio, fim, sincronizado_em=None):
+        """
+        Registra um intervalo de tarefas recém-sincronizado
+
+        Intervalos antigos sobrepostos são recortados (o novo prevalece) e
+        intervalos vizinhos são unidos quando isso não altera a faixa definitiva.
+
+        Args:
+            usuario_id (int): ID do usuário
+            inicio (date): Primeiro dia sincronizado
+            fim (date): Último dia sincronizado (inclusivo)
+            sincronizado_em (datetime, optional): Momento da sincronização. Default: agora
+        """
+        sincronizado_em = sincronizado_em or datetime.now()
+
+        sobrepostas = CoberturaTarefas.query.filter(
+            CoberturaTarefas.usuario_id == usuario_id,
+            CoberturaTarefas.cobertura_inicio <= fim,
+            CoberturaTarefas.cobertura_fim >= inicio
+        ).all()
+
+        for cobertura in sobrepostas:
+            if cobertura.cobertura_fim > fim:
+                db.session.add(CoberturaTarefas(
+                    usuario_id=usuario_id,
+                    cobertura_inicio=fim + timedelta(days=1),
+                    cobertura_fim=cobertura.cobertura_fim,
+                    sincronizado_em=cobertura.sincronizado_em
+                ))
+            if cobertura.cobertura_inicio < inicio:
+                cobertura.cobertura_fim = inicio - timedelta(days=1)
+            else:
+                db.session.delete(cobertura)
+
+        db.session.add(CoberturaTarefas(
+            usuario_id=usuario_id,
+            cobertura_inicio=inicio,
+            cobertura_fim=fim,
+            sincronizado_em=sincronizado_em
+        ))
+        db.session.flush()
+
+        SincronizacaoService._compactar_coberturas(usuario_id)
+        db.session.commit()
+
+    @staticmethod
+    def _compactar_coberturas(usuario_id):
+        """
+        Une intervalos vizinhos sincronizados juntos ou já totalmente definitivos (sem commit)
+
+        Args:
+            usuario_id (int): ID do usuário
+        """
+        anterior = None
+
+        for cobertura in SincronizacaoService.listar_coberturas(usuario_id):
+            vizinhas = anterior is not None and anterior.cobertura_fim + timedelta(days=1) >= cobertura.cobertura_inicio
+            unir = vizinhas and (
+                anterior.sincronizado_em == cobertura.sincronizado_em or (
+                    SincronizacaoService._totalmente_definitiva(anterior) and
+                    SincronizacaoService._totalmente_definitiva(cobertura)
+                )
+            )
+
+            if unir:
+                anterior.cobertura_fim = max(anterior.cobertura_fim, cobertura.cobertura_fim)
+                anterior.sincronizado_em = max(anterior.sincronizado_em, cobertura.sincronizado_em)
+                db.session.delete(cobertura)
+            else:
+                anterior = cobertura
+
+    @staticmethod
+    def _parse_periodo(start_date, end_date):
+        """Converte o período (YYYY-MM-DD) em date, com padrão ontem até hoje"""
+        hoje = datetime.now().date()
+        data_inicial = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else hoje - timedelta(days=1)
+        data_final = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else hoje
+        return data_inicial, data_final
+
+    @staticmethod
+    def sincronizar_tarefas(user_id, start_date=None, end_date=None, incremental=True, progress_callback=None):
+        """
+        Sincroniza as tarefas do período
+
+        No modo completo todo o período é baixado. No modo incremental apenas
+        as lacunas entre os intervalos já cobertos (e a janela mutável) são
+        baixadas; os dados financeiros do período são recalculados a partir
+        das tarefas gravadas.
+
+        Args:
+            user_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD). Default: ontem
+            end_date (str, optional): Data final (YYYY-MM-DD). Default: hoje
+            incremental (bool): Se True, usa os intervalos já cobertos
+            progress_callback (callable, optional): Recebe (páginas concluídas, total de páginas),
+                somando as páginas de todos os intervalos baixados
+
+        Returns:
+            dict: Resultado da sincronização
+        """
+        data_inicial, data_final = SincronizacaoService._parse_periodo(start_date, end_date)
+        agora = datetime.now()
+
+        if not incremental:
+            result = TarefaController.fetch_and_process_tasks(
+                user_id, data_inicial.isoformat(), data_final.isoformat(), progress_callback=progress_callback
+            )
+            if result.get('success'):
+                SincronizacaoService.registrar_cobertura(user_id, data_inicial, data_final, sincronizado_em=agora)
+            return result
+
+        usuario = Usuario.query.get(user_id)
+        if not usuario:
+            return {
+                'success': False,
+                'message': 'Usuário não encontrado',
+                'data': None
+            }
+
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(usuario.id, data_inicial, data_final, agora)
+
+        if intervalos:
+            token_validation = AuthController.validate_token(usuario.chave_app)
+            if not token_validation.get('valid'):
+                return {
+                    'success': False,
+                    'message': 'Token expirado. Faça login novamente.',
+                    'data': None
+                }
+
+        totais = {'tasks_processed': 0, 'tasks_saved': 0, 'tasks_updated': 0, 'tasks_errors': 0, 'tasks_removed': 0}
+        paginas = {'anteriores': 0, 'intervalo': 0}
+
+        def progresso_intervalo(concluidas, total):
+            paginas['intervalo'] = total
+            if progress_callback:
+                progress_callback(paginas['anteriores'] + concluidas, paginas['anteriores'] + total)
+
+        try:
+            for inicio, fim in intervalos:
+                logger.debug(f"📥 Baixando tarefas de {inicio} até {fim}")
+
+                # Cada página é gravada assim que chega; os IDs recebidos definem as removidas
+                stream_result = TarefaController._stream_tasks_to_db(
+                    usuario, token_validation['access_token'], inicio.isoformat(), fim.isoformat(),
+                    progress_callback=progresso_intervalo, collect_ids=True
+                )
+                if not stream_result['success']:
+                    return stream_result
+
+                paginas['anteriores'] += paginas['intervalo']
+
+                store_result = stream_result['data']
+                if store_result['task_ids'] is not None:
+                    removed = TarefaController._remove_missing_tasks(usuario.id, inicio, fim, store_result['task_ids'])
+                else:
+                    # Continuação de uma tentativa interrompida: sem os IDs das primeiras páginas nada é removido
+                    removed = 0
+
+                totais['tasks_processed'] += store_result['processed']
+                totais['tasks_saved'] += store_result['saved']
+                totais['tasks_updated'] += store_result['updated']
+                totais['tasks_errors'] += store_result['errors']
+                totais['tasks_removed'] += removed
+
+                SincronizacaoService.registrar_cobertura(usuario.id, inicio, fim, sincronizado_em=agora)
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"❌ Erro na sincronização incremental de tarefas: {str(e)}")
+            return {
+                'success': False,
+                'message': f'Erro crítico: {str(e)}',
+                'data': None
+            }
+
+        financial_result = TarefaController.recalculate_financial_data(
+            usuario.id, data_inicial.isoformat(), data_final.isoformat()
+        )
+
+        if intervalos:
+            message = f'Sincronização incremental concluída. {totais["tasks_saved"]} tarefas salvas, {totais["tasks_updated"]} atualizadas.'
+        else:
+            message = 'Tarefas do período já estavam sincronizadas'
+
+        return {
+            'success': True,
+            'message': message,
+            'data': {
+                **totais,
+                'intervalos_sincronizados': [[inicio.isoformat(), fim.isoformat()] for inicio, fim in intervalos],
+                'financial_data': financial_result
+            }
+        }
+
+    @staticmethod
+    def _sincronizar_catalogo_isolado(app, user_id, entidade, incremental, progresso):
+        """
+        Sincroniza um cadastro em um app context (e sessão do banco) próprio
+
+        Usado pelas threads de sincronizar_tudo; exceções viram um resultado com erro.
+
+        Returns:
+            tuple: (resultado, duração em segundos)
+        """
+        inicio = time.perf_counter()
+        progresso(entidade, status='executando')
+
+        with app.app_context():
+            try:
+                resultado = SincronizacaoService.sincronizar_catalogo(user_id, entidade, incremental)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"❌ Erro ao sincronizar {entidade}: {str(e)}")
+                resultado = {
+                    'success': False,
+                    'message': f'Erro durante sincronização: {str(e)}',
+                    'data': None
+                }
+
+        duracao = round(time.perf_counter() - inicio, 3)
+        progresso(
+            entidade,
+            status='concluido' if resultado.get('success') else 'erro',
+            mensagem=resultado.get('message'),
+            duracao_s=duracao
+        )
+        return resultado, duracao
+
+    @staticmethod
+    def _max_workers_catalogos():
+        """
+        Retorna quantos cadastros podem ser sincronizados ao mesmo tempo
+
+        Um SQLite em memória usa uma única conexão (StaticPool) compartilhada
+        por todas as threads; nesse caso os cadastros rodam um de cada vez.
+
+        Returns:
+            int: Valor de SYNC_CATALOGOS_MAX_WORKERS ou 1
+        """
+        if isinstance(db.engine.pool, StaticPool):
+            return 1
+        return max(1, SincronizacaoService._config('SYNC_CATALOGOS_MAX_WORKERS', CATALOGOS_MAX_WORKERS))
+
+    @staticmethod
+    def sincronizar_tudo(user_id, start_date=None, end_date=None, incremental=True, progresso=None):
+        """
+        Sincroniza os cadastros em paralelo e depois as tarefas do período
+
+        Os quatro cadastros são independentes e rodam ao mesmo tempo, cada um
+        em uma thread com app context próprio. As tarefas dependem dos
+        cadastros e só começam depois que todos terminam.
+
+        Args:
+            user_id (int): ID do usuário
+            start_date (str, optional): Data inicial (YYYY-MM-DD). Default: ontem
+            end_date (str, optional): Data final (YYYY-MM-DD). Default: hoje
+            incremental (bool): Se True, reaproveita cadastros válidos e intervalos cobertos
+            progresso (callable, optional): Chamado como progresso(etapa, **dados) ao
+                iniciar e concluir cada etapa e a cada página de tarefas
+
+        Returns:
+            dict: Resultado geral; data traz o resultado de cada etapa (etapas) e
+                a duração de cada etapa em segundos (tempos)
+        """
+        progresso = progresso or (lambda etapa, **dados: None)
+        app = current_app._get_current_object()
+        inicio_total = time.perf_counter()
+        resultados = {}
+        tempos = {}
+
+        with ThreadPoolExecutor(max_workers=SincronizacaoService._max_workers_catalogos(), thread_name_prefix='sync-catalogo') as executor:
+            futures = {
+                entidade: executor.submit(
+                    SincronizacaoService._sincronizar_catalogo_isolado, app, user_id, entidade, incremental, progresso
+                )
+                for entidade in SincronizacaoService.CATALOGOS
+            }
+            for entidade, future in futures.items():
+                resultados[entidade], tempos[entidade] = future.result()
+
+        tempos['catalogos'] = round(time.perf_counter() - inicio_total, 3)
+
+        inicio_tarefas = time.perf_counter()
+        progresso('tarefas', status='executando')
+        resultados['tarefas'] = SincronizacaoService.sincronizar_tarefas(
+            user_id, start_date, end_date, incremental,
+            progress_callback=lambda concluidas, total: progresso(
+                'tarefas', paginas_concluidas=concluidas, paginas_total=total
+            )
+        )
+        tempos['tarefas'] = round(time.perf_counter() - inicio_tarefas, 3)
+        progresso(
+            'tarefas',
+            status='concluido' if resultados['tarefas'].get('success') else 'erro',
+            mensagem=resultados['tarefas'].get('message'),
+            duracao_s=tempos['tarefas']
+        )
+
+        tempos['total'] = round(time.perf_counter() - inicio_total, 3)
+        logger.debug(f"⏱️ Sincronização do usuário {user_id}: {tempos}")
+
+        falhas = [etapa for etapa, resultado in resultados.items() if not resultado.get('success')]
+
+        return {
+            'success': not falhas,
+            'message': 'Sincronização concluída' if not falhas else f'Sincronização com erros em: {", ".join(falhas)}',
+            'data': {
+                'etapas': resultados,
+                'tempos': tempos
+            }
+        }
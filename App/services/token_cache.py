@@ -0,0 +1,213 @@
+"""
+Cache em memória dos tokens bearer da API da Auvo
+
+Cada sincronização valida o token uma vez por controller. Com o cache, o
+token válido sai da memória, sem consultar o banco. Perto de expirar, ele é
+renovado em segundo plano com AuthController.authenticate_auvo. Um token já
+vencido é renovado na hora.
+
+Só uma renovação por chave de API roda por vez (single-flight): quem chega
+durante a renovação espera o resultado dela em vez de fazer outro login.
+
+O cache fica em app.extensions, então cada aplicação (e cada processo do
+servidor) tem o seu.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+
+from ..Models import Usuario
+
+logger = logging.getLogger(__name__)
+
+# Padrões para AUVO_TOKEN_VALIDADE_SEGUNDOS e AUVO_TOKEN_RENOVACAO_ANTECIPADA_SEGUNDOS
+TOKEN_VALIDADE_SEGUNDOS = 1680           # token dura 30 minutos; 2 minutos de margem
+TOKEN_RENOVACAO_ANTECIPADA_SEGUNDOS = 180
+TOKEN_RENOVACAO_TIMEOUT_SEGUNDOS = 60    # espera máxima por uma renovação em andamento
+
+
+class TokenCacheService:
+    """Cache por chave de API dos tokens bearer, com renovação antecipada"""
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _config(key, default):
+        """Lê uma configuração numérica da aplicação"""
+        if has_app_context():
+            return int(current_app.config.get(key, default))
+        return default
+
+    @staticmethod
+    def _estado():
+        """Retorna os tokens e as renovações em andamento da aplicação atual"""
+        return current_app.extensions.setdefault('auvo_tokens', {'tokens': {}, 'renovacoes': {}})
+
+    @staticmethod
+    def _get_executor():
+        """Retorna o pool de threads das renovações, criando-o na primeira chamada"""
+        with TokenCacheService._lock:
+            if TokenCacheService._executor is None:
+                TokenCacheService._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='auvo-token')
+            return TokenCacheService._executor
+
+    @staticmethod
+    def armazenar(usuario_id, api_key, api_token, access_token, obtido_em):
+        """
+        Guarda o token no cache, a menos que já exista um obtido depois dele
+
+        Args:
+            usuario_id (int): ID do usuário
+            api_key (str): Chave da API
+            api_token (str): Token da API (usado para renovar)
+            access_token (str): Token bearer
+            obtido_em (datetime): Momento em que o token foi obtido
+        """
+        entrada = {
+            'usuario_id': usuario_id,
+            'api_token': api_token,
+            'access_token': access_token,
+            'obtido_em': obtido_em,
+            'expira_em': obtido_em + timedelta(
+                seconds=TokenCacheService._config('AUVO_TOKEN_VALIDADE_SEGUNDOS', TOKEN_VALIDADE_SEGUNDOS)
+            )
+        }
+
+        with TokenCacheService._lock:
+            tokens = TokenCacheService._estado()['tokens']
+            atual = tokens.get(api_key)
+            if atual is None or atual['obtido_em'] <= obtido_em:
+                tokens[api_key] = entrada
+
+    @staticmethod
+    def invalidar(api_key=None):
+        """
+        Remove um token do cache (ou todos, sem api_key)
+
+        Args:
+            api_key (str, optional): Chave da API
+        """
+        with TokenCacheService._lock:
+            tokens = TokenCacheService._estado()['tokens']
+            if api_key is None:
+                tokens.clear()
+            else:
+                tokens.pop(api_key, None)
+
+    @staticmethod
+    def obter(api_key):
+        """
+        Retorna um token válido para a chave de API
+
+        Sem token em memória, carrega o último token salvo no banco. Um token
+        perto de expirar é devolvido e renovado em segundo plano; um token
+        vencido é renovado antes de responder.
+
+        Args:
+            api_key (str): Chave da API
+
+        Returns:
+            dict: Entrada do cache (usuario_id, access_token, obtido_em,
+                expira_em) ou None se o usuário não existe ou a renovação falhou
+        """
+        with TokenCacheService._lock:
+            entrada = TokenCacheService._estado()['tokens'].get(api_key)
+
+        if entrada is None:
+            usuario = Usuario.query.filter_by(chave_app=api_key).first()
+            if not usuario:
+                return None
+
+            TokenCacheService.armazenar(
+                usuario.id, api_key, usuario.token_api, usuario.token_bearer, usuario.token_obtido_em
+            )
+            with TokenCacheService._lock:
+                entrada = TokenCacheService._estado()['tokens'].get(api_key)
+
+        agora = datetime.now()
+        if agora >= entrada['expira_em']:
+            logger.debug(f"🔑 Token expirado para {api_key} - renovando")
+            return TokenCacheService._renovar(api_key, entrada['api_token'])
+
+        antecedencia = timedelta(seconds=TokenCacheService._config(
+            'AUVO_TOKEN_RENOVACAO_ANTECIPADA_SEGUNDOS', TOKEN_RENOVACAO_ANTECIPADA_SEGUNDOS
+        ))
+        if agora >= entrada['expira_em'] - antecedencia:
+            TokenCacheService._agendar_renovacao(api_key, entrada['api_token'])
+
+        return entrada
+
+    @staticmethod
+    def _iniciar_renovacao(api_key):
+        """
+        Registra uma renovação para a chave, se ainda não houver uma em andamento
+
+        Returns:
+            tuple: (threading.Event da renovação, True se esta chamada deve renová-lo)
+        """
+        with TokenCacheService._lock:
+            renovacoes = TokenCacheService._estado()['renovacoes']
+            evento = renovacoes.get(api_key)
+            if evento is not None:
+                return evento, False
+
+            evento = renovacoes[api_key] = threading.Event()
+            return evento, True
+
+    @staticmethod
+    def _executar_renovacao(api_key, api_token, evento):
+        """Faz o login na Auvo (que atualiza banco e cache) e libera quem está esperando"""
+        from ..Controllers.auth_api import AuthController
+
+        try:
+            resultado = AuthController.authenticate_auvo(api_key, api_token)
+            if resultado.get('success'):
+                logger.debug(f"🔑 Token renovado para {api_key}")
+            else:
+                logger.error(f"❌ Falha ao renovar token para {api_key}: {resultado.get('message')}")
+                TokenCacheService.invalidar(api_key)
+        except Exception as e:
+            logger.error(f"❌ Erro ao renovar token para {api_key}: {str(e)}")
+            TokenCacheService.invalidar(api_key)
+        finally:
+            with TokenCacheService._lock:
+                TokenCacheService._estado()['renovacoes'].pop(api_key, None)
+            evento.set()
+
+    @staticmethod
+    def _renovar(api_key, api_token):
+        """Renova o token agora, ou espera a renovação já em andamento, e retorna a nova entrada"""
+        evento, lider = TokenCacheService._iniciar_renovacao(api_key)
+
+        if lider:
+            TokenCacheService._executar_renovacao(api_key, api_token, evento)
+        else:
+            evento.wait(TOKEN_RENOVACAO_TIMEOUT_SEGUNDOS)
+
+        with TokenCacheService._lock:
+            entrada = TokenCacheService._estado()['tokens'].get(api_key)
+
+        if entrada is None or datetime.now() >= entrada['expira_em']:
+            return None
+        return entrada
+
+    @staticmethod
+    def _agendar_renovacao(api_key, api_token):
+        """Renova o token em segundo plano, se ninguém já estiver renovando"""
+        evento, lider = TokenCacheService._iniciar_renovacao(api_key)
+        if not lider:
+            return
+
+        app = current_app._get_current_object()
+
+        def executar():
+            with app.app_context():
+                TokenCacheService._executar_renovacao(api_key, api_token, evento)
+
+        logger.debug(f"🔑 Token de {api_key} perto de expirar - renovando em segundo plano")
+        TokenCacheService._get_executor().submit(executar)
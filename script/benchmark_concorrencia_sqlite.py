@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência no SQLite: leituras do dashboard durante uma sincronização
+
+Para cada configuração, popula um banco temporário em disco e grava um lote
+de tarefas com TarefaController._process_and_save_tasks (uma única transação,
+como na sincronização) enquanto outra thread abre o dashboard repetidamente.
+Mede a latência das leituras e quantas falharam com "database is locked".
+
+    - padrao: journal DELETE, synchronous FULL e cache padrão (configuração anterior)
+    - wal: SQLITE_PRAGMAS da aplicação (WAL, synchronous NORMAL, cache e mmap)
+
+Uso:
+    python script/benchmark_concorrencia_sqlite.py [--base 20000] [--tasks 30000]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from App import create_app, db
+from App.Models import Usuario, Produto, Colaborador, TipoTarefa
+from App.Controllers.tarefas import TarefaController
+from mock_auvo_server import gerar_tarefa, NUM_PRODUTOS, NUM_COLABORADORES, NUM_TIPOS_TAREFA
+
+CONFIGURACOES = {
+    'padrao': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'cache_size': -2000, 'mmap_size': 0, 'temp_store': 'DEFAULT'},
+    'wal': {}
+}
+
+
+def preparar_banco(db_path, pragmas, num_base):
+    """Cria o banco com cadastros sintéticos e num_base tarefas já sincronizadas"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'SQLITE_PRAGMAS': pragmas})
+    with app.app_context():
+        usuario = Usuario(chave_app='bench', token_api='t', token_bearer='b', token_obtido_em=datetime.now())
+        db.session.add(usuario)
+        db.session.flush()
+        db.session.add_all(
+            [TipoTarefa(id=i, usuario_id=usuario.id, descricao=f'Tipo {i}') for i in range(1, NUM_TIPOS_TAREFA + 1)] +
+            [Colaborador(id=i, usuario_id=usuario.id, nome=f'Colaborador {i}') for i in range(1, NUM_COLABORADORES + 1)] +
+            [Produto(id=f'prod-{i}', usuario_id=usuario.id, nome=f'Produto {i}', custo_unitario=10.0) for i in range(NUM_PRODUTOS)]
+        )
+        db.session.commit()
+
+        TarefaController._store_tasks([gerar_tarefa(i, datetime(2025, 1, 1)) for i in range(num_base)], usuario.id)
+        usuario_id = usuario.id
+        db.session.remove()
+
+    return app, usuario_id
+
+
+def medir(nome, num_base, num_tasks):
+    """Retorna duração da escrita, latências das leituras (ms) e leituras bloqueadas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        app, usuario_id = preparar_banco(os.path.join(tmp, 'bench.db'), CONFIGURACOES[nome], num_base)
+
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = usuario_id
+            sess['authenticated'] = True
+
+        # A sincronização grava tarefas novas no ano seguinte, em uma única transação
+        tasks = [gerar_tarefa(num_base + i, datetime(2026, 1, 1)) for i in range(num_tasks)]
+        escrita = {}
+
+        def sincronizar():
+            with app.app_context():
+                inicio = time.perf_counter()
+                TarefaController._process_and_save_tasks(tasks, usuario_id, '2026-01-01', '2026-12-31')
+                escrita['segundos'] = time.perf_counter() - inicio
+                db.session.remove()
+
+        latencias = []
+        bloqueadas = 0
+
+        # As rotas do dashboard imprimem mensagens de debug a cada requisição
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            thread = threading.Thread(target=sincronizar)
+            thread.start()
+            while thread.is_alive():
+                inicio = time.perf_counter()
+                resposta = client.get('/dashboard', query_string={'data_inicial': '2025-01-01', 'data_final': '2025-12-31'})
+                if resposta.status_code == 200 and b'database is locked' not in resposta.data:
+                    latencias.append((time.perf_counter() - inicio) * 1000)
+                else:
+                    bloqueadas += 1
+            thread.join()
+
+        with app.app_context():
+            db.engine.dispose()
+
+    return escrita['segundos'], latencias, bloqueadas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de leituras do dashboard durante a sincronização')
+    parser.add_argument('--base', type=int, default=20000, help='Tarefas já gravadas antes da medição')
+    parser.add_argument('--tasks', type=int, default=30000, help='Tarefas gravadas pela sincronização medida')
+    args = parser.parse_args()
+
+    # Silencia o log de debug durante a medição
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"📊 Dashboard durante a gravação de {args.tasks} tarefas (base de {args.base})")
+    print("=" * 84)
+    print(f"{'config':>8} {'escrita s':>10} {'leituras':>9} {'p50 ms':>9} {'p95 ms':>9} {'máx ms':>9} {'bloqueadas':>11}")
+    print("-" * 84)
+
+    for nome in CONFIGURACOES:
+        segundos, latencias, bloqueadas = medir(nome, args.base, args.tasks)
+        if latencias:
+            p95 = sorted(latencias)[int(len(latencias) * 0.95) - 1] if len(latencias) >= 20 else max(latencias)
+            print(f"{nome:>8} {segundos:>10.1f} {len(latencias):>9} {statistics.median(latencias):>9.1f} "
+                  f"{p95:>9.1f} {max(latencias):>9.1f} {bloqueadas:>11}")
+        else:
+            print(f"{nome:>8} {segundos:>10.1f} {0:>9} {'-':>9} {'-':>9} {'-':>9} {bloqueadas:>11}")
+
+    print("=" * 84)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark da paginação de tarefas contra um mock local da API da Auvo
+
+Mede o tempo total de TarefaController._fetch_all_tasks_from_api em função
+do número de páginas, comparando a busca sequencial (1 worker) com a busca
+paralela por um pool limitado de workers.
+
+Uso:
+    python script/benchmark_paginacao_tarefas.py [--latency 0.2] [--workers 4]
+                                                  [--pages 1 5 10 20 40]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from App.services import api_service
+from App.Controllers.tarefas import TarefaController, TASKS_PAGE_SIZE
+from mock_auvo_server import MockAuvoServer
+
+
+def medir(server, num_pages, workers):
+    """Executa uma busca completa e retorna (segundos, tarefas, requisições)"""
+    server.total_tasks = num_pages * TASKS_PAGE_SIZE
+    server.request_count = 0
+
+    inicio = time.perf_counter()
+    result = TarefaController._fetch_all_tasks_from_api(
+        'mock-token', '2025-01-01', '2025-12-31', max_workers=workers
+    )
+    elapsed = time.perf_counter() - inicio
+
+    if not result['success']:
+        raise RuntimeError(result['message'])
+
+    return elapsed, len(result['data']), server.request_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da paginação de tarefas')
+    parser.add_argument('--latency', type=float, default=0.2, help='Latência simulada por página (segundos)')
+    parser.add_argument('--workers', type=int, default=4, help='Workers do modo paralelo')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 10, 20, 40],
+                        help='Quantidades de páginas a medir')
+    args = parser.parse_args()
+
+    # Silencia o log de debug durante a medição
+    logging.getLogger().setLevel(logging.WARNING)
+
+    server = MockAuvoServer(latency=args.latency).start()
+    api_service.AUVO_API_BASE_URL = server.base_url
+
+    print(f"📊 Paginação de tarefas - latência {args.latency}s/página, {TASKS_PAGE_SIZE} tarefas/página")
+    print("=" * 72)
+    print(f"{'páginas':>8} {'tarefas':>8} {'sequencial (s)':>16} {f'paralelo x{args.workers} (s)':>18} {'ganho':>8}")
+    print("-" * 72)
+
+    try:
+        for num_pages in args.pages:
+            seq_time, seq_tasks, _ = medir(server, num_pages, workers=1)
+            par_time, par_tasks, _ = medir(server, num_pages, workers=args.workers)
+
+            if seq_tasks != par_tasks:
+                raise RuntimeError(f"Resultados divergentes: {seq_tasks} != {par_tasks}")
+
+            ganho = seq_time / par_time if par_time else 0
+            print(f"{num_pages:>8} {par_tasks:>8} {seq_time:>16.2f} {par_time:>18.2f} {ganho:>7.1f}x")
+    finally:
+        server.stop()
+
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória do relatório detalhado: lista completa x streaming
+
+Para cada quantidade de tarefas, popula um banco SQLite temporário e mede,
+em um processo novo por cenário, o pico de RSS para:
+    - lista: carrega todas as tarefas e serializa a lista inteira (comportamento anterior)
+    - stream: consome /api/relatorio/detailed-data/stream
+
+Uso:
+    python script/benchmark_relatorio_streaming.py [--tasks 10000 100000 500000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert
+from App import create_app, db
+from App.Models import Usuario, Colaborador, TipoTarefa, Tarefa, TarefaDetalhes, TarefaItem
+
+INSERT_CHUNK_SIZE = 5000
+
+
+def popular_banco(db_path, num_tasks):
+    """Cria o banco com um usuário e num_tasks tarefas sintéticas"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    with app.app_context():
+        usuario = Usuario(chave_app='bench', token_api='t', token_bearer='b', token_obtido_em=datetime.now())
+        db.session.add(usuario)
+        db.session.flush()
+        db.session.add_all([
+            TipoTarefa(id=1, usuario_id=usuario.id, descricao='Instalação'),
+            Colaborador(id=1, usuario_id=usuario.id, nome='Colaborador')
+        ])
+
+        data_base = datetime(2025, 1, 1)
+        for inicio in range(1, num_tasks + 1, INSERT_CHUNK_SIZE):
+            db.session.execute(insert(Tarefa), [
+                {
+                    'id': task_id, 'usuario_id': usuario.id, 'data': data_base + timedelta(seconds=task_id * 30),
+                    'cliente': f'Cliente {task_id}', 'tipo_tarefa_id': 1, 'colaborador_id': 1,
+                    'valor_total': 150.0, 'custo_total': 20.0, 'lucro_bruto': 130.0,
+                    'valor_produtos': 50.0, 'valor_servicos': 100.0
+                }
+                for task_id in range(inicio, min(inicio + INSERT_CHUNK_SIZE, num_tasks + 1))
+            ])
+            db.session.execute(insert(TarefaDetalhes), [
+                {
+                    'tarefa_id': task_id,
+                    'dados': {
+                        'task_original': {
+                            'products': [{'productId': f'prod-{task_id % 50}', 'quantity': 2, 'totalValue': 50.0}],
+                            'services': [{'id': f'serv-{task_id % 20}', 'totalValue': 100.0}]
+                        },
+                        'calculos': {'faturamento_produto': 50.0, 'faturamento_servico': 100.0}
+                    }
+                }
+                for task_id in range(inicio, min(inicio + INSERT_CHUNK_SIZE, num_tasks + 1))
+            ])
+            db.session.execute(insert(TarefaItem), [
+                item
+                for task_id in range(inicio, min(inicio + INSERT_CHUNK_SIZE, num_tasks + 1))
+                for item in (
+                    {'tarefa_id': task_id, 'usuario_id': usuario.id, 'tipo': 'produto', 'item_id': f'prod-{task_id % 50}',
+                     'quantidade': 2, 'faturamento': 50.0, 'custo': 20.0},
+                    {'tarefa_id': task_id, 'usuario_id': usuario.id, 'tipo': 'servico', 'item_id': f'serv-{task_id % 20}',
+                     'quantidade': 1, 'faturamento': 100.0, 'custo': 0.0}
+                )
+            ])
+        db.session.commit()
+        usuario_id = usuario.id
+        db.engine.dispose()
+
+    return usuario_id
+
+
+def medir_processo(db_path, usuario_id, modo):
+    """Executado no processo filho: imprime JSON com bytes gerados, tempo e pico de RSS (MB)"""
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from App.View.relatorio_tarefas import _format_task_row
+    from App.Controllers.tarefas import TarefaController
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = usuario_id
+
+    rss_inicial = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+
+    if modo == 'lista':
+        with app.app_context():
+            tarefas = TarefaController._report_query(usuario_id, '2025-01-01', '2030-12-31', {}, 'data', 'asc').all()
+            nomes = TarefaController.load_item_names(usuario_id)
+            tamanho = len(json.dumps([_format_task_row(tarefa, nomes) for tarefa in tarefas]))
+    else:
+        resposta = client.get('/api/relatorio/detailed-data/stream', buffered=False, query_string={
+            'data_inicial': '2025-01-01', 'data_final': '2030-12-31'
+        })
+        tamanho = sum(len(parte) for parte in resposta.response)
+
+    duracao = time.perf_counter() - inicio
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        'bytes': tamanho,
+        'segundos': duracao,
+        'rss_mb': rss_pico / 1024,
+        'rss_delta_mb': (rss_pico - rss_inicial) / 1024
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memória do relatório detalhado')
+    parser.add_argument('--tasks', type=int, nargs='+', default=[10000, 100000, 500000],
+                        help='Quantidades de tarefas a medir')
+    parser.add_argument('--worker', nargs=3, metavar=('DB', 'USUARIO', 'MODO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        db_path, usuario_id, modo = args.worker
+        medir_processo(db_path, int(usuario_id), modo)
+        return
+
+    # Silencia o log de debug durante a preparação
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print("📊 Relatório detalhado: pico de RSS (MB) acima do processo ocioso")
+    print("=" * 72)
+    print(f"{'tarefas':>8} {'MB json':>9} {'lista RSS':>10} {'lista s':>8} {'stream RSS':>11} {'stream s':>9}")
+    print("-" * 72)
+
+    for num_tasks in args.tasks:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            usuario_id = popular_banco(db_path, num_tasks)
+
+            resultados = {}
+            for modo in ('lista', 'stream'):
+                saida = subprocess.run(
+                    [sys.executable, __file__, '--worker', db_path, str(usuario_id), modo],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                resultados[modo] = json.loads(saida.strip().splitlines()[-1])
+
+        lista, stream = resultados['lista'], resultados['stream']
+        print(
+            f"{num_tasks:>8} {stream['bytes'] / 1e6:>9.1f} {lista['rss_delta_mb']:>10.1f} {lista['segundos']:>8.1f}"
+            f" {stream['rss_delta_mb']:>11.1f} {stream['segundos']:>9.1f}"
+        )
+
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
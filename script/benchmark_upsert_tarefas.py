@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark da gravação de tarefas: loop por linha x gravação em lote
+
+Compara tarefas/segundo do processamento anterior (uma consulta ORM por
+tipo, colaborador, produto e tarefa) com TarefaController._process_and_save_tasks
+(cadastros pré-carregados + INSERT ... ON CONFLICT DO UPDATE em lotes).
+Cada cenário roda em um banco SQLite temporário em disco, primeiro inserindo
+e depois atualizando as mesmas tarefas.
+
+Uso:
+    python script/benchmark_upsert_tarefas.py [--tasks 1000 5000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from App import create_app, db
+from App.Models import Usuario, Produto, Colaborador, TipoTarefa, Tarefa
+from App.Controllers.tarefas import TarefaController
+from mock_auvo_server import gerar_tarefa, NUM_PRODUTOS, NUM_COLABORADORES, NUM_TIPOS_TAREFA
+
+
+def processar_legado(tasks_list, usuario_id):
+    """Réplica do loop anterior: consultas ORM por tarefa e por produto"""
+    for task_data in tasks_list:
+        task_id = task_data.get('taskID')
+        user_to_id = task_data.get('idUserTo')
+        task_type_id = task_data.get('taskType')
+
+        if not TipoTarefa.query.filter_by(id=task_type_id, usuario_id=usuario_id).first():
+            task_type_id = 0
+        if not Colaborador.query.filter_by(id=user_to_id, usuario_id=usuario_id).first():
+            continue
+
+        task_date = datetime.fromisoformat(task_data['taskDate'])
+        faturamento_produto = 0.0
+        custo_produto = 0.0
+        for produto_data in task_data.get('products', []):
+            produto = Produto.query.filter_by(id=produto_data['productId'], usuario_id=usuario_id).first()
+            if produto:
+                faturamento_produto += float(produto_data['totalValue'])
+                custo_produto += produto.custo_unitario * float(produto_data['quantity'])
+        faturamento_servico = sum(float(s['totalValue']) for s in task_data.get('services', []))
+        faturamento_total = faturamento_produto + faturamento_servico
+        lucro_total = faturamento_total - custo_produto
+        detalhes = {'task_original': task_data, 'calculos': {'faturamento_total': faturamento_total}}
+
+        tarefa = Tarefa.query.filter_by(id=task_id, usuario_id=usuario_id).first()
+        if tarefa:
+            tarefa.data = task_date
+            tarefa.valor_total = faturamento_total
+            tarefa.custo_total = custo_produto
+            tarefa.lucro_bruto = lucro_total
+            tarefa.detalhes_json = detalhes
+        else:
+            db.session.add(Tarefa(
+                id=task_id, usuario_id=usuario_id, data=task_date,
+                cliente=task_data['customerDescription'], tipo_tarefa_id=task_type_id,
+                colaborador_id=user_to_id, valor_total=faturamento_total,
+                custo_total=custo_produto, lucro_bruto=lucro_total, detalhes_json=detalhes
+            ))
+    db.session.commit()
+
+
+def processar_lote(tasks_list, usuario_id):
+    """Processamento atual em lote"""
+    result = TarefaController._process_and_save_tasks(tasks_list, usuario_id, '2025-01-01', '2025-12-31')
+    if not result['success']:
+        raise RuntimeError(result['message'])
+
+
+def preparar_banco(db_path):
+    """Cria a aplicação com um banco novo e cadastros sintéticos"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+    with app.app_context():
+        usuario = Usuario(chave_app='bench', token_api='t', token_bearer='b', token_obtido_em=datetime.now())
+        db.session.add(usuario)
+        db.session.flush()
+        db.session.add_all(
+            [TipoTarefa(id=i, usuario_id=usuario.id, descricao=f'Tipo {i}') for i in range(1, NUM_TIPOS_TAREFA + 1)] +
+            [Colaborador(id=i, usuario_id=usuario.id, nome=f'Colaborador {i}') for i in range(1, NUM_COLABORADORES + 1)] +
+            [Produto(id=f'prod-{i}', usuario_id=usuario.id, nome=f'Produto {i}', custo_unitario=10.0) for i in range(NUM_PRODUTOS)]
+        )
+        db.session.commit()
+        return app, usuario.id
+
+
+def medir(funcao, num_tasks):
+    """Retorna tarefas/segundo para inserção e para atualização"""
+    data_base = datetime(2025, 1, 1, 8, 0, 0)
+    tasks = [gerar_tarefa(i, data_base) for i in range(num_tasks)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, usuario_id = preparar_banco(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            inicio = time.perf_counter()
+            funcao(tasks, usuario_id)
+            insert_rate = num_tasks / (time.perf_counter() - inicio)
+
+            db.session.expunge_all()
+
+            inicio = time.perf_counter()
+            funcao(tasks, usuario_id)
+            update_rate = num_tasks / (time.perf_counter() - inicio)
+
+            db.session.remove()
+            db.engine.dispose()
+
+    return insert_rate, update_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da gravação de tarefas')
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 5000],
+                        help='Quantidades de tarefas a medir')
+    args = parser.parse_args()
+
+    # Silencia o log de debug durante a medição
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print("📊 Gravação de tarefas (tarefas/segundo)")
+    print("=" * 76)
+    print(f"{'tarefas':>8} {'legado insert':>14} {'lote insert':>12} {'legado update':>14} {'lote update':>12} {'ganho':>8}")
+    print("-" * 76)
+
+    for num_tasks in args.tasks:
+        legado_insert, legado_update = medir(processar_legado, num_tasks)
+        lote_insert, lote_update = medir(processar_lote, num_tasks)
+        ganho = (lote_insert + lote_update) / (legado_insert + legado_update)
+        print(f"{num_tasks:>8} {legado_insert:>14.0f} {lote_insert:>12.0f} {legado_update:>14.0f} {lote_update:>12.0f} {ganho:>7.1f}x")
+
+    print("=" * 76)
+
+
+if __name__ == '__main__':
+    main()
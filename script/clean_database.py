@@ -37,7 +37,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
 
 from App import create_app, db
 from App.Models import (
-    Usuario, TipoTarefa, Colaborador, Produto, Servico, Tarefa,
+    Usuario, TipoTarefa, Colaborador, Produto, Servico, Tarefa, TarefaDetalhes, TarefaItem, ResumoDiario,
     FaturamentoTotal, FaturamentoProduto, FaturamentoServico,
     LucroTotal, LucroProduto, LucroServico
 )
@@ -124,6 +124,9 @@ class DatabaseCleaner:
         with self.app.app_context():
             try:
                 count = Tarefa.query.count()
+                ResumoDiario.query.delete()
+                TarefaItem.query.delete()
+                TarefaDetalhes.query.delete()
                 Tarefa.query.delete()
                 db.session.commit()
                 print(f"✅ {count} tarefas removidas")
@@ -6,12 +6,167 @@ com as novas colunas usuario_id nos models que não as possuíam.
 """
 
 from flask import Flask
+from sqlalchemy.schema import CreateIndex, CreateTable
 from App import create_app, db
 from App.Models import *
+from App.Models.tipos import comprimir_json
 import sqlite3
+import json
 import os
 
 
+def create_model_indexes(cursor):
+    """
+    Cria nas tabelas existentes os índices declarados nos models que ainda não existem
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor da conexão da migração
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    existing_tables = {row[0] for row in cursor.fetchall()}
+    
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+    
+    for table in db.metadata.sorted_tables:
+        # Tabelas novas são criadas depois, já com os índices, por db.create_all()
+        if table.name not in existing_tables:
+            continue
+        
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            
+            print(f"➕ Criando índice {index.name} em {table.name}...")
+            cursor.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=db.engine.dialect)))
+
+
+def move_task_details(cursor, chunk_size=500):
+    """
+    Move a coluna tarefa.detalhes_json para tarefa_detalhes, comprimida
+    
+    O JSON de cada tarefa é copiado comprimido com zlib e a coluna é removida
+    da tabela tarefa. Não faz nada se a coluna já não existir.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor da conexão da migração
+        chunk_size (int): Tarefas copiadas por lote
+    """
+    cursor.execute("PRAGMA table_info(tarefa)")
+    if 'detalhes_json' not in [column[1] for column in cursor.fetchall()]:
+        return
+    
+    print("📦 Movendo detalhes_json das tarefas para tarefa_detalhes...")
+    
+    cursor.execute(str(CreateTable(TarefaDetalhes.__table__, if_not_exists=True).compile(dialect=db.engine.dialect)))
+    
+    # Cursor separado: o de leitura continua posicionado enquanto os lotes são gravados
+    leitura = cursor.connection.cursor()
+    leitura.execute("SELECT id, detalhes_json FROM tarefa WHERE detalhes_json IS NOT NULL")
+    
+    total = 0
+    while True:
+        rows = leitura.fetchmany(chunk_size)
+        if not rows:
+            break
+        
+        cursor.executemany(
+            "INSERT OR REPLACE INTO tarefa_detalhes (tarefa_id, dados) VALUES (?, ?)",
+            [(task_id, comprimir_json(json.loads(detalhes))) for task_id, detalhes in rows]
+        )
+        total += len(rows)
+    
+    leitura.close()
+    cursor.execute("ALTER TABLE tarefa DROP COLUMN detalhes_json")
+    
+    print(f"✅ Detalhes de {total} tarefas comprimidos em tarefa_detalhes")
+
+
+def add_task_total_columns(cursor):
+    """
+    Adiciona à tabela tarefa as colunas valor_produtos e valor_servicos
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor da conexão da migração
+        
+    Returns:
+        bool: True se alguma coluna foi criada e precisa ser preenchida
+    """
+    cursor.execute("PRAGMA table_info(tarefa)")
+    columns = [column[1] for column in cursor.fetchall()]
+    
+    # Tabela ainda não existe: será criada por db.create_all() já com as colunas
+    if not columns:
+        return False
+    
+    added = False
+    for column in ('valor_produtos', 'valor_servicos'):
+        if column in columns:
+            continue
+        
+        print(f"➕ Adicionando {column} à tabela tarefa...")
+        cursor.execute(f"ALTER TABLE tarefa ADD COLUMN {column} BIGINT NOT NULL DEFAULT 0")
+        added = True
+    
+    return added
+
+
+def migrate_money_columns(cursor):
+    """
+    Converte para centavos inteiros as colunas de dinheiro ainda gravadas em reais (FLOAT)
+    
+    O SQLite não altera o tipo de uma coluna: a tabela é recriada com o
+    esquema do model e os valores copiados como ROUND(valor * escala) da
+    coluna: 100 para valores, ESCALA_PRECO_UNITARIO (10000) para preços e
+    custos unitários. Frações menores que a escala são arredondadas e não
+    podem ser recuperadas; faça um backup do banco antes. Tabelas
+    cujas colunas Dinheiro já são BIGINT são ignoradas. Os índices são
+    recriados depois por create_model_indexes.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor da conexão da migração
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    existing_tables = {row[0] for row in cursor.fetchall()}
+    
+    # Renomear a tabela antiga sem reescrever as chaves estrangeiras das outras tabelas
+    cursor.execute("PRAGMA legacy_alter_table = ON")
+    
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        
+        cursor.execute(f"PRAGMA table_info({table.name})")
+        existing_columns = {column[1]: column[2].upper() for column in cursor.fetchall()}
+        
+        money_columns = [
+            column.name for column in table.columns
+            if isinstance(column.type, Dinheiro) and column.name in existing_columns
+        ]
+        if not any(existing_columns[name] not in ('BIGINT', 'INTEGER') for name in money_columns):
+            continue
+        
+        print(f"💰 Convertendo valores de {table.name} para centavos...")
+        
+        backup = f"{table.name}_valores_reais"
+        cursor.execute(f"ALTER TABLE {table.name} RENAME TO {backup}")
+        cursor.execute(str(CreateTable(table).compile(dialect=db.engine.dialect)))
+        
+        columns = [column.name for column in table.columns if column.name in existing_columns]
+        values = [
+            f"CAST(ROUND({name} * {table.columns[name].type.escala}) AS INTEGER)" if name in money_columns else name
+            for name in columns
+        ]
+        cursor.execute(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) SELECT {', '.join(values)} FROM {backup}"
+        )
+        cursor.execute(f"DROP TABLE {backup}")
+        
+        print(f"✅ Colunas {', '.join(money_columns)} de {table.name} gravadas em centavos")
+    
+    cursor.execute("PRAGMA legacy_alter_table = OFF")
+
+
 def migrate_database():
     """
     Migra o banco de dados adicionando as colunas usuario_id necessárias
@@ -98,7 +253,22 @@ def migrate_database():
                 
                 print("✅ Constraint UNIQUE removida da coluna descricao")
             
+            # JSON das tarefas comprimido em tabela própria (antes de recriar a tabela tarefa)
+            move_task_details(cursor)
+            
+            # Faturamento de produtos e serviços por tarefa (preenchido depois do commit)
+            backfill_totals = add_task_total_columns(cursor)
+            
+            # Valores em dinheiro como centavos inteiros
+            migrate_money_columns(cursor)
+            
+            # Índices declarados nos models (tarefas por período, catálogos por usuário...)
+            create_model_indexes(cursor)
+            
             conn.commit()
+            
+            # Devolve ao sistema o espaço liberado pelas colunas removidas
+            conn.execute("VACUUM")
             print("✅ Migração concluída com sucesso!")
             
         except Exception as e:
@@ -107,6 +277,59 @@ def migrate_database():
             raise
         finally:
             conn.close()
+        
+        # Cria as tabelas novas (ex.: resumo_diario, tarefa_item) e preenche os dados derivados
+        db.create_all()
+        backfill_tarefa_item()
+        if backfill_totals:
+            backfill_tarefa_totais()
+        backfill_resumo_diario()
+
+
+def backfill_tarefa_item():
+    """
+    Preenche tarefa_item para as tarefas que ainda não têm itens gravados
+    """
+    from App.Controllers.tarefas import TarefaController
+    
+    print("🔄 Preenchendo itens das tarefas...")
+    
+    for usuario in Usuario.query.all():
+        if TarefaItem.query.filter_by(usuario_id=usuario.id).first():
+            print(f"ℹ️  Itens das tarefas do usuário {usuario.id} já preenchidos")
+            continue
+        
+        total = TarefaController.rebuild_task_items(usuario.id)
+        db.session.commit()
+        print(f"✅ Itens de {total} tarefas do usuário {usuario.id} preenchidos")
+
+
+def backfill_tarefa_totais():
+    """
+    Preenche valor_produtos e valor_servicos das tarefas a partir dos cálculos em tarefa_detalhes
+    """
+    from App.Controllers.tarefas import TarefaController
+    
+    print("🔄 Preenchendo faturamento de produtos e serviços das tarefas...")
+    
+    for usuario in Usuario.query.all():
+        total = TarefaController.backfill_task_totals(usuario.id)
+        db.session.commit()
+        print(f"✅ {total} tarefas do usuário {usuario.id} preenchidas")
+
+
+def backfill_resumo_diario():
+    """
+    Recalcula o resumo diário de todos os usuários a partir das tarefas gravadas
+    """
+    from App.Controllers.resumo_diario import ResumoDiarioController
+    
+    print("🔄 Preenchendo resumo diário...")
+    
+    for usuario in Usuario.query.all():
+        ResumoDiarioController.rebuild(usuario.id)
+        db.session.commit()
+        print(f"✅ Resumo diário do usuário {usuario.id} recalculado")
 
 
 if __name__ == "__main__":
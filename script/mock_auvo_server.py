@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a API da Auvo para benchmarks
+
+Responde aos endpoints usados pelos controllers com dados sintéticos e uma
+latência artificial por requisição, permitindo medir o comportamento da
+sincronização sem acessar a API real.
+
+Uso:
+    python mock_auvo_server.py --port 8765 --tasks 5000 --latency 0.2
+
+Endpoints:
+    /v2/login/       Autenticação (sempre autenticada)
+    /v2/Tasks/       Tarefas paginadas (Page, PageSize)
+    /v2/products/    Produtos
+    /v2/services/    Serviços
+    /v2/users/       Colaboradores
+    /v2/taskTypes/   Tipos de tarefa
+"""
+
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+NUM_PRODUTOS = 20
+NUM_COLABORADORES = 10
+NUM_TIPOS_TAREFA = 5
+
+
+def gerar_tarefa(indice, data_base):
+    """Gera uma tarefa sintética no formato da API da Auvo"""
+    return {
+        'taskID': indice + 1,
+        'idUserTo': (indice % NUM_COLABORADORES) + 1,
+        'customerDescription': f'Cliente {indice % 50}',
+        'taskType': (indice % NUM_TIPOS_TAREFA) + 1,
+        'taskDate': (data_base + timedelta(minutes=indice)).strftime('%Y-%m-%dT%H:%M:%S'),
+        'products': [
+            {
+                'productId': f'prod-{indice % NUM_PRODUTOS}',
+                'quantity': 2,
+                'totalValue': 50.0
+            }
+        ],
+        'services': [
+            {
+                'id': f'serv-{indice % 3}',
+                'totalValue': 120.0
+            }
+        ]
+    }
+
+
+class MockAuvoHandler(BaseHTTPRequestHandler):
+    """Handler HTTP com respostas sintéticas"""
+
+    server_version = 'MockAuvo/1.0'
+
+    def log_message(self, format, *args):
+        # Silencia o log de cada requisição
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.registrar_requisicao()
+        time.sleep(self.server.latency)
+
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip('/').lower()
+        query = parse_qs(parsed.query)
+
+        if path == '/v2/login':
+            agora = datetime.now()
+            self._send_json({'result': {
+                'authenticated': True,
+                'accessToken': 'mock-token',
+                'created': agora.isoformat(),
+                'expiration': (agora + timedelta(minutes=30)).isoformat()
+            }})
+        elif path == '/v2/tasks':
+            page = int(query.get('Page', ['1'])[0])
+            page_size = int(query.get('PageSize', ['100'])[0])
+            inicio = (page - 1) * page_size
+            fim = min(inicio + page_size, self.server.total_tasks)
+            data_base = datetime(2025, 1, 1, 8, 0, 0)
+            tarefas = [gerar_tarefa(i, data_base) for i in range(inicio, fim)]
+            self._send_json({'result': {
+                'entityList': tarefas,
+                'pagedSearchReturnData': {
+                    'order': 0,
+                    'pageSize': page_size,
+                    'page': page,
+                    'totalItems': self.server.total_tasks
+                }
+            }})
+        elif path == '/v2/products':
+            self._send_json({'result': {'entityList': [
+                {'productId': f'prod-{i}', 'name': f'Produto {i}', 'unitaryCost': '10,00'}
+                for i in range(NUM_PRODUTOS)
+            ]}})
+        elif path == '/v2/services':
+            self._send_json({'result': {'entityList': [
+                {'id': f'serv-{i}', 'title': f'Serviço {i}'}
+                for i in range(3)
+            ]}})
+        elif path == '/v2/users':
+            self._send_json({'result': {'entityList': [
+                {'userID': i, 'name': f'Colaborador {i}'}
+                for i in range(1, NUM_COLABORADORES + 1)
+            ]}})
+        elif path == '/v2/tasktypes':
+            self._send_json({'result': {'entityList': [
+                {'id': i, 'description': f'Tipo {i}'}
+                for i in range(1, NUM_TIPOS_TAREFA + 1)
+            ]}})
+        else:
+            self._send_json({'error': 'Not found'}, status=404)
+
+
+class MockAuvoServer(ThreadingHTTPServer):
+    """Servidor HTTP multi-thread com contadores de requisições"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, total_tasks=1000, latency=0.0):
+        super().__init__(('127.0.0.1', port), MockAuvoHandler)
+        self.total_tasks = total_tasks
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """URL base equivalente a https://api.auvo.com.br/v2"""
+        return f'http://127.0.0.1:{self.server_address[1]}/v2'
+
+    def registrar_requisicao(self):
+        with self._lock:
+            self.request_count += 1
+
+    def start(self):
+        """Inicia o servidor em uma thread de fundo"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local que imita a API da Auvo')
+    parser.add_argument('--port', type=int, default=8765, help='Porta HTTP')
+    parser.add_argument('--tasks', type=int, default=1000, help='Total de tarefas retornadas')
+    parser.add_argument('--latency', type=float, default=0.1, help='Latência por requisição (segundos)')
+    args = parser.parse_args()
+
+    server = MockAuvoServer(port=args.port, total_tasks=args.tasks, latency=args.latency)
+    print(f"🚀 Mock da API Auvo em {server.base_url} ({args.tasks} tarefas, latência {args.latency}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Servidor encerrado")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
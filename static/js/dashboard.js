@@ -33,8 +33,8 @@ document.addEventListener("DOMContentLoaded", function () {
   const exportBtn = document.querySelector(".btn-export");
   if (exportBtn) {
     exportBtn.addEventListener("click", function () {
-      console.log("Export Excel clicked");
-      alert("Funcionalidade de exportação será implementada");
+      // Exporta o resumo e as tarefas com o período e os filtros da URL atual
+      window.location.href = "/dashboard/export" + window.location.search;
     });
   } else {
     console.log("Botão de exportação não encontrado");
@@ -44,6 +44,12 @@ document.addEventListener("DOMContentLoaded", function () {
   console.log("Chamando initializeDashboard()");
   initializeDashboard();
 
+  // Acompanha a sincronização iniciada no login ou na consulta
+  const syncJobId = sessionStorage.getItem("syncJobId");
+  if (syncJobId) {
+    pollSyncJob(syncJobId);
+  }
+
   // Tooltips functionality
   const tooltipEnabled = document.querySelectorAll(
     ".metric-card .chart-container"
@@ -321,6 +327,84 @@ document.addEventListener("DOMContentLoaded", function () {
     }, delay);
   }
 
+  // Nomes das etapas da sincronização
+  const SYNC_STAGE_LABELS = {
+    produtos: "Produtos",
+    servicos: "Serviços",
+    colaboradores: "Colaboradores",
+    tipos_tarefa: "Tipos de tarefa",
+    tarefas: "Tarefas",
+  };
+
+  // Função para acompanhar um job de sincronização
+  function pollSyncJob(jobId) {
+    const statusBox = document.querySelector("#sync-status");
+
+    fetch(`/sync/jobs/${jobId}`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`HTTP ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((data) => {
+        const job = data.job;
+
+        if (job.status === "concluido") {
+          sessionStorage.removeItem("syncJobId");
+          window.location.reload();
+          return;
+        }
+
+        if (job.status === "erro") {
+          sessionStorage.removeItem("syncJobId");
+          showSyncStatus(statusBox, `❌ ${job.mensagem}`, true);
+          return;
+        }
+
+        showSyncStatus(statusBox, describeSyncJob(job), false);
+        setTimeout(() => pollSyncJob(jobId), 1000);
+      })
+      .catch((error) => {
+        console.error("Erro ao consultar sincronização:", error);
+        sessionStorage.removeItem("syncJobId");
+        if (statusBox) {
+          statusBox.hidden = true;
+        }
+      });
+  }
+
+  // Função para descrever o progresso do job
+  function describeSyncJob(job) {
+    const running = Object.keys(job.etapas).find(
+      (stage) => job.etapas[stage].status === "executando"
+    );
+
+    let text = `🔄 Sincronizando (${job.etapas_concluidas}/${job.etapas_total} etapas)`;
+
+    if (running) {
+      text += ` - ${SYNC_STAGE_LABELS[running] || running}`;
+
+      const stage = job.etapas[running];
+      if (running === "tarefas" && stage.paginas_total) {
+        text += `: página ${stage.paginas_concluidas} de ${stage.paginas_total}`;
+      }
+    }
+
+    return text;
+  }
+
+  // Função para exibir o progresso da sincronização
+  function showSyncStatus(statusBox, text, isError) {
+    if (!statusBox) {
+      return;
+    }
+
+    statusBox.textContent = text;
+    statusBox.classList.toggle("erro", isError);
+    statusBox.hidden = false;
+  }
+
   // Função para atualizar dashboard
   function updateDashboard() {
     const filters = {
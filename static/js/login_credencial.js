@@ -35,7 +35,12 @@ document.addEventListener("DOMContentLoaded", function () {
       .then((response) => response.json())
       .then((data) => {
         if (data.success) {
-          // Sucesso - redireciona para o dashboard
+          // Sucesso - guarda o job de sincronização para o dashboard acompanhar
+          if (data.job_id) {
+            sessionStorage.setItem("syncJobId", data.job_id);
+          }
+
+          // Redireciona para o dashboard
           showSuccess(data.message);
           setTimeout(() => {
             window.location.href = data.redirect_url;
@@ -20,8 +20,7 @@ document.addEventListener("DOMContentLoaded", function () {
   const exportBtn = document.querySelector(".btn-export");
   if (exportBtn) {
     exportBtn.addEventListener("click", function () {
-      console.log("Export Excel clicked - Relatório Detalhado");
-      // Implementar lógica específica para exportar tabela
+      // Gera o XLSX em segundo plano com os filtros atuais
       exportTableToExcel();
     });
   }
@@ -52,49 +51,181 @@ document.addEventListener("DOMContentLoaded", function () {
   const filterManager = new FilterManager();
   filterManager.initialize();
 
-  // Função para exportar tabela para Excel
+  // Função para exportar as tarefas filtradas para Excel em segundo plano
   function exportTableToExcel() {
-    const table = document.querySelector(".data-table");
-    const rows = [];
-
-    // Cabeçalho
-    const headers = Array.from(table.querySelectorAll("th")).map(
-      (th) => th.textContent
-    );
-    rows.push(headers);
-
-    // Dados
-    const dataRows = Array.from(table.querySelectorAll("tbody tr"));
-    dataRows.forEach((row) => {
-      const cells = Array.from(row.querySelectorAll("td")).map(
-        (td) => td.textContent
-      );
-      rows.push(cells);
+    const filters = filterManager.collectFilterValues();
+    const label = exportBtn.textContent;
+    exportBtn.disabled = true;
+    exportBtn.textContent = "EXPORTANDO...";
+
+    const finish = () => {
+      exportBtn.disabled = false;
+      exportBtn.textContent = label;
+    };
+
+    fetch("/api/relatorio/export/jobs", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(Object.assign({ formato: "xlsx" }, filters)),
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (!data.status_url) {
+          throw new Error(data.error || "Erro ao iniciar exportação");
+        }
+        pollExportJob(data.status_url, finish);
+      })
+      .catch((error) => {
+        console.error("Erro ao exportar:", error);
+        alert("Erro ao exportar tarefas");
+        finish();
+      });
+  }
+
+  // Acompanha o job de exportação e baixa o arquivo quando estiver pronto
+  function pollExportJob(statusUrl, finish) {
+    fetch(statusUrl)
+      .then((response) => response.json())
+      .then((job) => {
+        if (job.status === "concluido") {
+          window.location.href = job.download_url;
+          finish();
+        } else if (job.status === "erro" || job.error) {
+          throw new Error(job.mensagem || job.error);
+        } else {
+          exportBtn.textContent = `EXPORTANDO... ${job.linhas || 0} LINHAS`;
+          setTimeout(() => pollExportJob(statusUrl, finish), 1000);
+        }
+      })
+      .catch((error) => {
+        console.error("Erro na exportação:", error);
+        alert("Erro ao exportar tarefas");
+        finish();
+      });
+  }
+
+  // Estado da consulta: filtros, ordenação e cursor da próxima página
+  const reportState = {
+    filters: {},
+    sort: "data",
+    order: "asc",
+    cursor: null,
+    hasMore: false,
+    loading: false,
+  };
+
+  const loadMoreBtn = document.getElementById("btn-load-more");
+  const tableCount = document.getElementById("table-count");
+
+  // Ordenação pelo servidor ao clicar nas colunas ordenáveis
+  document.querySelectorAll(".data-table th.sortable").forEach((th) => {
+    th.addEventListener("click", function () {
+      const sort = this.dataset.sort;
+      if (reportState.sort === sort) {
+        reportState.order = reportState.order === "asc" ? "desc" : "asc";
+      } else {
+        reportState.sort = sort;
+        reportState.order = "asc";
+      }
+      fetchDetailedData(reportState.filters);
     });
+  });
+
+  if (loadMoreBtn) {
+    loadMoreBtn.addEventListener("click", loadNextPage);
 
-    console.log("Dados para exportação:", rows);
-    alert("Funcionalidade de exportação da tabela será implementada");
+    // Carrega a próxima página quando o fim da tabela aparece na tela
+    if ("IntersectionObserver" in window) {
+      new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          loadNextPage();
+        }
+      }).observe(loadMoreBtn);
+    }
   }
 
-  // Função para buscar dados detalhados
+  // Função para buscar dados detalhados (primeira página e total)
   function fetchDetailedData(filters) {
-    // Implementar chamada para API
-    fetch("/api/relatorio/detailed-data?" + new URLSearchParams(filters))
+    reportState.filters = filters;
+    reportState.cursor = null;
+    reportState.hasMore = false;
+
+    updateSortIndicators();
+    fetchTotalCount(filters);
+    fetchPage(true);
+  }
+
+  // Busca a próxima página, se houver
+  function loadNextPage() {
+    if (reportState.hasMore && !reportState.loading) {
+      fetchPage(false);
+    }
+  }
+
+  function fetchPage(reset) {
+    const params = new URLSearchParams(reportState.filters);
+    params.set("sort", reportState.sort);
+    params.set("order", reportState.order);
+    if (!reset && reportState.cursor) {
+      params.set("cursor", reportState.cursor);
+    }
+
+    reportState.loading = true;
+    if (loadMoreBtn) loadMoreBtn.disabled = true;
+
+    fetch("/api/relatorio/detailed-data?" + params)
       .then((response) => response.json())
-      .then((data) => {
-        console.log("Dados recebidos:", data);
-        updateTable(data);
+      .then((page) => {
+        if (page.error) {
+          throw new Error(page.error);
+        }
+        reportState.cursor = page.next_cursor;
+        reportState.hasMore = page.has_more;
+        updateTable(page.data, reset);
       })
       .catch((error) => {
         console.error("Erro ao buscar dados:", error);
         alert("Erro ao consultar dados");
+      })
+      .finally(() => {
+        reportState.loading = false;
+        if (loadMoreBtn) {
+          loadMoreBtn.disabled = false;
+          loadMoreBtn.hidden = !reportState.hasMore;
+        }
       });
   }
 
-  // Função para atualizar a tabela
-  function updateTable(data) {
+  // Total de tarefas com os mesmos filtros
+  function fetchTotalCount(filters) {
+    if (!tableCount) return;
+    tableCount.textContent = "";
+
+    fetch("/api/relatorio/detailed-data/count?" + new URLSearchParams(filters))
+      .then((response) => response.json())
+      .then((data) => {
+        if (typeof data.total === "number") {
+          tableCount.textContent = `${data.total} tarefa(s)`;
+        }
+      })
+      .catch((error) => console.error("Erro ao contar tarefas:", error));
+  }
+
+  function updateSortIndicators() {
+    document.querySelectorAll(".data-table th.sortable").forEach((th) => {
+      th.classList.remove("sort-asc", "sort-desc");
+      if (th.dataset.sort === reportState.sort) {
+        th.classList.add(`sort-${reportState.order}`);
+      }
+    });
+  }
+
+  // Função para atualizar a tabela (reset limpa as linhas da consulta anterior)
+  function updateTable(data, reset) {
     const tbody = document.querySelector(".data-table tbody");
-    tbody.innerHTML = "";
+    if (reset) {
+      tbody.innerHTML = "";
+    }
 
     data.forEach((item) => {
       const row = document.createElement("tr");
@@ -102,8 +233,8 @@ document.addEventListener("DOMContentLoaded", function () {
                 <td>${item.cliente}</td>
                 <td>${item.tipo_tarefa}</td>
                 <td>${item.data}</td>
-                <td>${item.produto}</td>
-                <td class="lucro-value">R$ ${item.lucro}</td>
+                <td>${item.itens}</td>
+                <td class="lucro-value">R$ ${item.lucro_bruto}</td>
             `;
       tbody.appendChild(row);
     });
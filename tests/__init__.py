@@ -1 +1,6 @@
 # Pasta de testes unitários
+import os
+import unittest
+
+# Testes de volume (ex.: pico de memória com 100 mil tarefas) só rodam com RUN_SLOW_TESTS=1
+lento = unittest.skipUnless(os.environ.get('RUN_SLOW_TESTS'), 'teste lento: defina RUN_SLOW_TESTS=1 para executar')
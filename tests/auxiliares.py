@@ -0,0 +1,111 @@
+"""
+Funções compartilhadas pelos testes: tarefas no formato da API da Auvo, um
+substituto paginado da API e os cadastros do usuário de teste
+"""
+import json
+import re
+import time
+from datetime import date, datetime
+from unittest.mock import Mock
+
+from App import db
+from App.Models import Usuario, Produto, Colaborador, TipoTarefa
+from App.Controllers.tarefas import TASKS_PAGE_SIZE
+
+
+def make_task(task_id, task_date='2025-01-15T10:00:00', colaborador=1, tipo=1, produto='prod-1', quantidade=1,
+              valor_produto=50.0, servico='serv-1', valor_servico=100.0, cliente=None):
+    """Monta uma tarefa no formato da API da Auvo
+
+    Por padrão a tarefa tem um produto prod-1 de 50,00 (custo 10,00 com os
+    cadastros de criar_usuario) e um serviço serv-1 de 100,00.
+
+    Args:
+        task_date (date | str): Data e hora, ou só a data (a tarefa fica às 10h)
+        produto (str, optional): ID do produto; None monta a tarefa sem produtos
+        cliente (str, optional): Descrição do cliente. Default: 'Cliente <task_id>'
+    """
+    if isinstance(task_date, date):
+        task_date = task_date.isoformat()
+    if 'T' not in task_date:
+        task_date = f'{task_date}T10:00:00'
+
+    return {
+        'taskID': task_id,
+        'idUserTo': colaborador,
+        'customerDescription': f'Cliente {task_id}' if cliente is None else cliente,
+        'taskType': tipo,
+        'taskDate': task_date,
+        'products': [{'productId': produto, 'quantity': quantidade, 'totalValue': valor_produto}] if produto else [],
+        'services': [{'id': servico, 'totalValue': valor_servico}]
+    }
+
+
+def fake_tasks_api(total_items, tarefa=None, failing_page=None, falhas=None, atraso=False):
+    """Cria um substituto de AuvoApiService.get que responde as páginas de tarefas sob demanda
+
+    As tarefas de cada página são geradas só quando ela é pedida, então o
+    total pode ser grande sem ocupar memória.
+
+    Args:
+        total_items (int | callable): Total de tarefas, ou função filtro -> total
+            (filtro é o ParamFilter da URL)
+        tarefa (callable, optional): Função (índice, filtro) -> tarefa. Default: {'taskID': índice}
+        failing_page (int, optional): Página que sempre responde 500
+        falhas (dict, optional): startDate -> quantidade de respostas 500 antes do sucesso
+        atraso (bool): Páginas menores respondem mais devagar, para embaralhar a ordem de conclusão
+    """
+    falhas = dict(falhas or {})
+
+    def fake_get(url, headers=None, timeout=None):
+        page = int(re.search(r'Page=(\d+)', url).group(1))
+        filtro = json.loads(re.search(r'ParamFilter=(\{.*?\})&', url).group(1))
+
+        if atraso:
+            time.sleep(0.05 / page)
+
+        response = Mock()
+        if falhas.get(filtro.get('startDate')):
+            falhas[filtro['startDate']] -= 1
+            response.status_code = 500
+            return response
+        if page == failing_page:
+            response.status_code = 500
+            return response
+
+        total = total_items(filtro) if callable(total_items) else total_items
+        inicio = (page - 1) * TASKS_PAGE_SIZE
+        fim = min(inicio + TASKS_PAGE_SIZE, total)
+        response.status_code = 200
+        response.json.return_value = {
+            'result': {
+                'entityList': [tarefa(i, filtro) if tarefa else {'taskID': i} for i in range(inicio, fim)],
+                'pagedSearchReturnData': {'page': page, 'totalItems': total}
+            }
+        }
+        return response
+
+    return fake_get
+
+
+def criar_usuario(tipos=('Instalação',), colaboradores=('João',), produtos=('Cabo',)):
+    """Cria o usuário de teste com seus tipos de tarefa, colaboradores e produtos
+
+    Os IDs seguem a ordem dos nomes: tipos e colaboradores 1, 2, ... e
+    produtos prod-1, prod-2, ..., todos com custo unitário de 10,00.
+    Precisa de um app context.
+
+    Returns:
+        int: ID do usuário
+    """
+    usuario = Usuario(chave_app='key', token_api='token', token_bearer='bearer', token_obtido_em=datetime.now())
+    db.session.add(usuario)
+    db.session.flush()
+
+    db.session.add_all(
+        [TipoTarefa(id=n, usuario_id=usuario.id, descricao=nome) for n, nome in enumerate(tipos, 1)]
+        + [Colaborador(id=n, usuario_id=usuario.id, nome=nome) for n, nome in enumerate(colaboradores, 1)]
+        + [Produto(id=f'prod-{n}', usuario_id=usuario.id, nome=nome, custo_unitario=10.0) for n, nome in enumerate(produtos, 1)]
+    )
+    db.session.commit()
+    return usuario.id
@@ -17,10 +17,11 @@ from App.Models import Usuario, Produto, Servico, Colaborador, TipoTarefa, Taref
 @pytest.fixture
 def app():
     """Cria uma instância da aplicação para testes"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['WTF_CSRF_ENABLED'] = False
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'WTF_CSRF_ENABLED': False
+    })
     
     with app.app_context():
         db.create_all()
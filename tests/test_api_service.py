@@ -0,0 +1,137 @@
+"""
+Testes do cliente HTTP compartilhado da API da Auvo
+"""
+import unittest
+from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App.services.api_service import AuvoApiService
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Responde 503 nas primeiras requisições e 200 depois"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.calls += 1
+        self.server.ports.add(self.client_address[1])
+        time.sleep(self.server.delay)
+        status = 503 if self.server.calls <= self.server.failures else 200
+        body = b'{"result": {}}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestAuvoApiService(unittest.TestCase):
+    """Testes para o AuvoApiService"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        AuvoApiService.reset_session()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        self.server.calls = 0
+        self.server.failures = 0
+        self.server.delay = 0
+        self.server.ports = set()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/v2/products/'
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        self.server.shutdown()
+        self.server.server_close()
+        AuvoApiService.reset_session()
+
+    def test_sessao_compartilhada(self):
+        """Testa que todas as chamadas usam a mesma sessão"""
+        self.assertIs(AuvoApiService.get_session(), AuvoApiService.get_session())
+
+    def test_configuracao_do_adapter(self):
+        """Testa pool, compressão e retentativas da sessão"""
+        session = AuvoApiService.get_session()
+        adapter = session.get_adapter('https://api.auvo.com.br/v2/login/')
+
+        self.assertEqual(adapter._pool_maxsize, AuvoApiService.POOL_MAXSIZE)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(adapter.max_retries.total, AuvoApiService.RETRY_TOTAL)
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+        self.assertIn('gzip', session.headers['Accept-Encoding'])
+
+    def test_build_url(self):
+        """Testa a montagem da URL de um endpoint"""
+        self.assertEqual(
+            AuvoApiService.build_url('products/?pageSize=10'),
+            'https://api.auvo.com.br/v2/products/?pageSize=10'
+        )
+
+    @patch.object(AuvoApiService, 'RETRY_BACKOFF_FACTOR', 0)
+    def test_retentativa_em_503(self):
+        """Testa que respostas 503 são repetidas até o sucesso"""
+        self.server.failures = 2
+        retentativas = AuvoApiService.get_retry_count()
+
+        response = AuvoApiService.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.calls, 3)
+        self.assertEqual(AuvoApiService.get_retry_count() - retentativas, 2)
+
+    def test_limite_de_taxa(self):
+        """Testa que o limite de taxa espaça as requisições de todas as threads"""
+        AuvoApiService.set_rate_limit(20)
+        try:
+            inicio = time.monotonic()
+            threads = [threading.Thread(target=AuvoApiService.get, args=(self.url,)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            duracao = time.monotonic() - inicio
+        finally:
+            AuvoApiService.set_rate_limit(None)
+
+        # 6 requisições a 20/s: a última sai 5 intervalos de 50 ms depois da primeira
+        self.assertEqual(self.server.calls, 6)
+        self.assertGreaterEqual(duracao, 0.25)
+
+    def test_conexao_reutilizada(self):
+        """Testa que requisições seguidas reutilizam a mesma conexão TCP"""
+        for _ in range(5):
+            self.assertEqual(AuvoApiService.get(self.url).status_code, 200)
+
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_limite_de_conexoes_por_host(self):
+        """Testa que requisições simultâneas além do pool esperam uma conexão livre, sem abrir outras"""
+        self.server.delay = 0.1
+
+        with patch.object(AuvoApiService, 'POOL_MAXSIZE', 2):
+            AuvoApiService.reset_session()
+            threads = [threading.Thread(target=AuvoApiService.get, args=(self.url,)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.server.calls, 6)
+        self.assertLessEqual(len(self.server.ports), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
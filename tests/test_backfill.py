@@ -0,0 +1,275 @@
+"""
+Testes do backfill de tarefas em fatias (BackfillService e comando flask auvo backfill)
+"""
+import unittest
+from unittest.mock import Mock, patch
+from datetime import date, datetime, timedelta
+import tempfile
+from sqlalchemy.exc import OperationalError
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa, CoberturaTarefas, FaturamentoTotal, PaginacaoTarefas
+from App.Controllers.tarefas import TarefaController
+from App.services.backfill import BackfillService
+from tests.auxiliares import make_task, fake_tasks_api, criar_usuario
+
+TAREFAS_POR_DIA = 3
+
+
+def tarefas_do_filtro(filtro):
+    """Total de tarefas do filtro para fake_tasks_api: TAREFAS_POR_DIA em cada dia"""
+    dias = (date.fromisoformat(filtro['endDate']) - date.fromisoformat(filtro['startDate'])).days + 1
+    return dias * TAREFAS_POR_DIA
+
+
+def tarefa_do_dia(indice, filtro):
+    """Tarefa de índice `indice` para fake_tasks_api, com ID derivado do dia"""
+    dia = date.fromisoformat(filtro['startDate']) + timedelta(days=indice // TAREFAS_POR_DIA)
+    return make_task(dia.toordinal() * 10 + indice % TAREFAS_POR_DIA, dia)
+
+
+class TestDividirPeriodo(unittest.TestCase):
+    """Testes para BackfillService.dividir_periodo"""
+
+    def test_fatias_diarias(self):
+        """Testa que cada dia vira uma fatia"""
+        fatias = BackfillService.dividir_periodo(date(2025, 1, 30), date(2025, 2, 1), 'day')
+        self.assertEqual(fatias, [
+            (date(2025, 1, 30), date(2025, 1, 30)),
+            (date(2025, 1, 31), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 1))
+        ])
+
+    def test_fatias_semanais(self):
+        """Testa semanas de segunda a domingo recortadas no período"""
+        # 2025-01-01 é uma quarta-feira
+        fatias = BackfillService.dividir_periodo(date(2025, 1, 1), date(2025, 1, 15), 'week')
+        self.assertEqual(fatias, [
+            (date(2025, 1, 1), date(2025, 1, 5)),
+            (date(2025, 1, 6), date(2025, 1, 12)),
+            (date(2025, 1, 13), date(2025, 1, 15))
+        ])
+
+    def test_fatias_mensais(self):
+        """Testa meses do calendário, incluindo fevereiro"""
+        fatias = BackfillService.dividir_periodo(date(2024, 1, 15), date(2024, 3, 10), 'month')
+        self.assertEqual(fatias, [
+            (date(2024, 1, 15), date(2024, 1, 31)),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+            (date(2024, 3, 1), date(2024, 3, 10))
+        ])
+
+    def test_fatia_invalida(self):
+        """Testa que um tamanho de fatia desconhecido é rejeitado"""
+        with self.assertRaises(ValueError):
+            BackfillService.dividir_periodo(date(2025, 1, 1), date(2025, 1, 2), 'year')
+
+
+@patch('App.services.backfill.SincronizacaoService.sincronizar_catalogo', Mock(return_value={'success': True}))
+@patch('App.services.backfill.AuthController.validate_token', Mock(return_value={'valid': True, 'access_token': 'bearer'}))
+class TestBackfill(unittest.TestCase):
+    """Testes para BackfillService.executar e o comando flask auvo backfill"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+            'BACKFILL_ESPERA_SEGUNDOS': 0
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_backfill_por_semana(self, mock_get):
+        """Testa que cada semana é buscada em separado e o período inteiro é gravado"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+
+        resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 31), 'week')
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['fatias'], 5)
+        self.assertEqual(resultado['data']['paginas'], 5)
+        self.assertEqual(resultado['data']['tarefas'], 31 * TAREFAS_POR_DIA)
+        self.assertEqual(Tarefa.query.count(), 31 * TAREFAS_POR_DIA)
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(resultado['data']['financial_data']['faturamento_total'], 150.0 * 31 * TAREFAS_POR_DIA)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_fatias_registradas_e_agregados_recalculados(self, mock_get):
+        """Testa a cobertura das fatias e o faturamento total salvo ao final"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+
+        BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 2, 28), 'month')
+
+        coberturas = CoberturaTarefas.query.filter_by(usuario_id=self.usuario_id).all()
+        self.assertEqual(min(c.cobertura_inicio for c in coberturas), date(2025, 1, 1))
+        self.assertEqual(max(c.cobertura_fim for c in coberturas), date(2025, 2, 28))
+        faturamento = FaturamentoTotal.query.filter_by(usuario_id=self.usuario_id).one()
+        self.assertEqual(faturamento.valor_total, 150.0 * 59 * TAREFAS_POR_DIA)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_fatia_com_falha_e_tentada_de_novo(self, mock_get):
+        """Testa que a fatia que falhou é repetida e contada nas retentativas"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia, falhas={'2025-01-06': 1})
+
+        resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 15), 'week')
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['retentativas_fatias'], 1)
+        self.assertEqual(Tarefa.query.count(), 15 * TAREFAS_POR_DIA)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_fatia_que_nao_se_recupera(self, mock_get):
+        """Testa que uma fatia que falha em todas as tentativas aparece nos erros"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia, falhas={'2025-01-06': 10})
+
+        resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 15), 'week')
+
+        self.assertFalse(resultado['success'])
+        self.assertEqual(
+            resultado['data']['erros'],
+            [{'inicio': '2025-01-06', 'fim': '2025-01-12', 'message': 'Erro inesperado: 500'}]
+        )
+        self.assertEqual(Tarefa.query.count(), 8 * TAREFAS_POR_DIA)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_token_validado_a_cada_tentativa(self, mock_get):
+        """Testa que cada tentativa de fatia usa o token devolvido pela validação feita antes dela"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia, falhas={'2025-01-06': 1})
+        tokens = iter(f'token-{n}' for n in range(1, 100))
+        validate = Mock(side_effect=lambda api_key: {'valid': True, 'access_token': next(tokens)})
+
+        with patch('App.services.backfill.AuthController.validate_token', validate):
+            resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 15), 'week')
+
+        self.assertTrue(resultado['success'])
+        # 1 validação no início + 3 fatias + 1 nova tentativa
+        self.assertEqual(validate.call_count, 5)
+        enviados = [c.kwargs['headers']['Authorization'] for c in mock_get.call_args_list]
+        self.assertNotIn('Bearer bearer', enviados)
+        self.assertEqual(len(set(enviados)), 4)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_tarefas_que_sumiram_da_api_sao_removidas(self, mock_get):
+        """Testa que a fatia lida inteira remove as tarefas que a API não devolve mais"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+        TarefaController._store_tasks([make_task(999, date(2025, 1, 3))], self.usuario_id)
+
+        resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 5), 'week')
+
+        self.assertEqual(resultado['data']['tarefas_removidas'], 1)
+        self.assertEqual(resultado['data']['tarefas'], 5 * TAREFAS_POR_DIA)
+        self.assertIsNone(db.session.get(Tarefa, 999))
+        self.assertEqual(CoberturaTarefas.query.filter_by(usuario_id=self.usuario_id).count(), 1)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_excecao_em_uma_fatia_nao_interrompe_as_outras(self, mock_get):
+        """Testa que um erro do banco ao remover tarefas vira erro da fatia, e as outras fatias seguem"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+        remover = TarefaController._remove_missing_tasks
+
+        def remover_com_erro(usuario_id, inicio, fim, task_ids):
+            if inicio == date(2025, 1, 6):
+                raise OperationalError('DELETE FROM tarefa', {}, Exception('database is locked'))
+            return remover(usuario_id, inicio, fim, task_ids)
+
+        with patch.object(TarefaController, '_remove_missing_tasks', side_effect=remover_com_erro):
+            resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 15), 'week')
+
+        self.assertFalse(resultado['success'])
+        self.assertEqual(len(resultado['data']['erros']), 1)
+        self.assertEqual(resultado['data']['erros'][0]['inicio'], '2025-01-06')
+        self.assertIn('database is locked', resultado['data']['erros'][0]['message'])
+        # As outras duas fatias foram gravadas e registradas
+        coberturas = CoberturaTarefas.query.filter_by(usuario_id=self.usuario_id).all()
+        self.assertEqual(len(coberturas), 2)
+        self.assertFalse(any(c.cobertura_inicio <= date(2025, 1, 8) <= c.cobertura_fim for c in coberturas))
+        self.assertIsNotNone(resultado['data']['financial_data'])
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_fatia_continuada_nao_e_coberta(self, mock_get):
+        """Testa que a fatia continuada de um checkpoint não remove tarefas nem é registrada como coberta"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+        TarefaController._store_tasks([make_task(999, date(2025, 1, 7))], self.usuario_id)
+        db.session.add(PaginacaoTarefas(
+            usuario_id=self.usuario_id, data_inicial='2025-01-06', data_final='2025-01-12',
+            ultima_pagina=1, total_itens=7 * TAREFAS_POR_DIA, atualizado_em=datetime.now()
+        ))
+        db.session.commit()
+
+        resultado = BackfillService.executar(self.usuario_id, date(2025, 1, 1), date(2025, 1, 15), 'week')
+
+        self.assertTrue(resultado['success'])
+        self.assertIsNotNone(db.session.get(Tarefa, 999))
+        self.assertEqual(resultado['data']['tarefas_removidas'], 0)
+        # Tarefas baixadas nesta execução: a semana continuada já tinha lido a sua única página
+        self.assertEqual(resultado['data']['tarefas'], (15 - 7) * TAREFAS_POR_DIA)
+        coberturas = CoberturaTarefas.query.filter_by(usuario_id=self.usuario_id).all()
+        self.assertFalse(any(c.cobertura_inicio <= date(2025, 1, 8) <= c.cobertura_fim for c in coberturas))
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_fatias_em_paralelo_em_banco_arquivo(self, mock_get):
+        """Testa fatias simultâneas, cada uma com a sua conexão, em um SQLite em arquivo"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            app = create_app({
+                'TESTING': True,
+                'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(pasta, "backfill.db")}'
+            })
+            with app.app_context():
+                usuario_id = criar_usuario()
+
+                resultado = BackfillService.executar(
+                    usuario_id, date(2025, 1, 1), date(2025, 1, 20), 'day', max_workers=4, rate_limit=1000
+                )
+
+                self.assertTrue(resultado['success'], resultado)
+                self.assertEqual(resultado['data']['fatias'], 20)
+                self.assertEqual(resultado['data']['tarefas'], 20 * TAREFAS_POR_DIA)
+                self.assertEqual(Tarefa.query.count(), 20 * TAREFAS_POR_DIA)
+                db.session.remove()
+                db.engine.dispose()
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_comando_cli(self, mock_get):
+        """Testa o comando flask auvo backfill e as estatísticas impressas"""
+        mock_get.side_effect = fake_tasks_api(tarefas_do_filtro, tarefa_do_dia)
+
+        result = self.app.test_cli_runner().invoke(args=[
+            'auvo', 'backfill', '--user', str(self.usuario_id),
+            '--from', '2025-01-01', '--to', '2025-01-10', '--slice', 'day'
+        ])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('tarefas/s', result.output)
+        self.assertIn('páginas/s', result.output)
+        self.assertIn('retentativas', result.output)
+        self.assertEqual(Tarefa.query.count(), 10 * TAREFAS_POR_DIA)
+
+    def test_comando_cli_usuario_inexistente(self):
+        """Testa que o comando termina com erro para um usuário que não existe"""
+        result = self.app.test_cli_runner().invoke(args=[
+            'auvo', 'backfill', '--user', '999', '--from', '2025-01-01', '--to', '2025-01-10'
+        ])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Usuário não encontrado', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
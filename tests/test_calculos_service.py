@@ -9,7 +9,7 @@ import os
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from App.services.calculos import CalculosService
+from App.services.calculos import CalculosService, ESCALA_PRECO_UNITARIO
 
 
 class TestCalculosService(unittest.TestCase):
@@ -169,7 +169,64 @@ class TestCalculosService(unittest.TestCase):
         self.assertAlmostEqual(porcentagens['lucro_produto'], 58.33, places=2)
         self.assertAlmostEqual(porcentagens['lucro_servico'], 41.67, places=2)
         self.assertEqual(porcentagens['lucro_faturamento'], 80.0)
-    
+
+    def test_calcular_lote(self):
+        """Testa os valores por tarefa, o total e os grupos calculados em lote"""
+        resultado = self.service.calcular_lote(
+            [1000.0, 0.0, 200.0],
+            [500.0, 100.0, 0.0],
+            [300.0, 0.0, 250.0],
+            grupos=['2025-01-01', '2025-01-02', '2025-01-01']
+        )
+
+        # Valores de cada tarefa, na ordem recebida
+        tarefas = resultado['tarefas']
+        self.assertEqual(len(tarefas), 3)
+        self.assertEqual(tarefas[0]['lucro_total'], 1200.0)
+        self.assertEqual(tarefas[1]['lucro_servico'], 100.0)
+        self.assertEqual(tarefas[2]['lucro_produto'], -50.0)
+
+        # O total é igual ao cálculo escalar sobre as somas
+        escalar = self.service.calcular_todos_os_valores(1200.0, 600.0, 550.0)
+        self.assertEqual(resultado['total'], escalar)
+
+        # Grupos somam as tarefas da mesma chave
+        grupo = resultado['grupos']['2025-01-01']
+        self.assertEqual(grupo['valores']['faturamento_total'], 1700.0)
+        self.assertEqual(grupo['valores']['lucro_total'], 1150.0)
+        self.assertAlmostEqual(grupo['porcentagens']['lucro_faturamento'], 67.65, places=2)
+        self.assertEqual(resultado['grupos']['2025-01-02']['porcentagens']['faturamento_servico'], 100.0)
+
+        # Lote vazio
+        vazio = self.service.calcular_lote([], [], [])
+        self.assertEqual(vazio['tarefas'], [])
+        self.assertEqual(vazio['total']['valores']['faturamento_total'], 0.0)
+        self.assertEqual(vazio['total']['porcentagens']['lucro_faturamento'], 0.0)
+
+    def test_para_centavos(self):
+        """Testa a conversão entre reais e centavos inteiros"""
+        self.assertEqual(self.service.para_centavos(0.1), 10)
+        self.assertEqual(self.service.para_centavos(1.005), 101)
+        self.assertEqual(self.service.para_centavos(25), 2500)
+        self.assertIsNone(self.service.para_centavos(None))
+
+        # Preços unitários em décimos de milésimo de real
+        self.assertEqual(self.service.para_centavos(0.125, ESCALA_PRECO_UNITARIO), 1250)
+        self.assertEqual(self.service.para_reais(1250, ESCALA_PRECO_UNITARIO), 0.125)
+        self.assertEqual(self.service.para_reais(12345), 123.45)
+
+    def test_calcular_lote_sem_erro_de_arredondamento(self):
+        """Testa que somas de muitos centavos são exatas"""
+        resultado = self.service.calcular_lote([0.1] * 1000, [0.01] * 1000, [0.07] * 1000)
+        valores = resultado['total']['valores']
+
+        self.assertEqual(valores['faturamento_produto'], 100.0)
+        self.assertEqual(valores['faturamento_total'], 110.0)
+        self.assertEqual(valores['lucro_total'], 40.0)
+
+        centavos = self.service.calcular_lote_centavos([10, 20], [5, 0], [3, 30])
+        self.assertEqual(centavos['total']['valores']['lucro_total'], 2)
+
     def test_validar_valores(self):
         """Testa a validação de valores"""
         # Valores válidos
@@ -0,0 +1,82 @@
+"""
+Testes da configuração do banco por ambiente e arquivo (load_config)
+"""
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+
+from flask import Flask
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import load_config
+
+
+class TestConfiguracaoBanco(unittest.TestCase):
+    """Testes para URL do banco, SECRET_KEY e opções de pool"""
+
+    def carregar(self, ambiente, test_config=None):
+        """Aplica load_config em uma aplicação nova com apenas as variáveis informadas"""
+        app = Flask(__name__)
+        with patch.dict(os.environ, ambiente, clear=True):
+            load_config(app, test_config)
+        return app.config
+
+    def test_padroes(self):
+        """Testa o SQLite local sem opções de pool quando nada é configurado"""
+        config = self.carregar({})
+
+        self.assertEqual(config['SQLALCHEMY_DATABASE_URI'], 'sqlite:///database.db')
+        self.assertEqual(config['SQLALCHEMY_ENGINE_OPTIONS'], {})
+
+    def test_variaveis_de_ambiente(self):
+        """Testa DATABASE_URL, SECRET_KEY e o pool de um banco servidor"""
+        config = self.carregar({
+            'DATABASE_URL': 'postgres://auvo:senha@db:5432/auvo',
+            'SECRET_KEY': 'segredo',
+            'DB_POOL_SIZE': '20',
+            'DB_POOL_PRE_PING': 'false'
+        })
+
+        self.assertEqual(config['SQLALCHEMY_DATABASE_URI'], 'postgresql://auvo:senha@db:5432/auvo')
+        self.assertEqual(config['SECRET_KEY'], 'segredo')
+        self.assertEqual(config['SQLALCHEMY_ENGINE_OPTIONS'], {
+            'pool_size': 20,
+            'max_overflow': 10,
+            'pool_recycle': 1800,
+            'pool_pre_ping': False
+        })
+
+    def test_arquivo_de_configuracao(self):
+        """Testa AUVO_CONFIG, com o ambiente e o test_config tendo precedência sobre o arquivo"""
+        with tempfile.TemporaryDirectory() as tmp:
+            arquivo = os.path.join(tmp, 'config.py')
+            with open(arquivo, 'w') as f:
+                f.write("SQLALCHEMY_DATABASE_URI = 'postgresql://arquivo/auvo'\n")
+                f.write("DB_MAX_OVERFLOW = 0\n")
+                f.write("SECRET_KEY = 'do-arquivo'\n")
+
+            config = self.carregar({'AUVO_CONFIG': arquivo, 'SECRET_KEY': 'do-ambiente'})
+            self.assertEqual(config['SQLALCHEMY_DATABASE_URI'], 'postgresql://arquivo/auvo')
+            self.assertEqual(config['SECRET_KEY'], 'do-ambiente')
+            self.assertEqual(config['SQLALCHEMY_ENGINE_OPTIONS']['max_overflow'], 0)
+
+            config = self.carregar({'AUVO_CONFIG': arquivo}, {'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+            self.assertEqual(config['SQLALCHEMY_ENGINE_OPTIONS'], {})
+
+    def test_banco_dos_testes(self):
+        """Testa que TEST_DATABASE_URL troca o banco apenas quando TESTING está ativo"""
+        ambiente = {'TEST_DATABASE_URL': 'postgresql://localhost/auvo_test'}
+
+        config = self.carregar(ambiente, {'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        self.assertEqual(config['SQLALCHEMY_DATABASE_URI'], 'postgresql://localhost/auvo_test')
+
+        config = self.carregar(ambiente)
+        self.assertEqual(config['SQLALCHEMY_DATABASE_URI'], 'sqlite:///database.db')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Testes dos PRAGMAs aplicados às conexões SQLite (configure_sqlite)
+"""
+import unittest
+import tempfile
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+
+
+@unittest.skipUnless(os.environ.get('TEST_DATABASE_URL', 'sqlite').startswith('sqlite'), 'PRAGMAs do SQLite')
+class TestConfiguracaoSqlite(unittest.TestCase):
+    """Testes para SQLITE_PRAGMAS em bancos em arquivo"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_uri = f'sqlite:///{os.path.join(self.tmp_dir.name, "test.db")}'
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        self.tmp_dir.cleanup()
+
+    def pragmas(self, app):
+        """Lê os PRAGMAs de uma conexão nova do pool"""
+        with app.app_context():
+            with db.engine.connect() as conexao:
+                valores = {
+                    pragma: conexao.exec_driver_sql(f'PRAGMA {pragma}').scalar()
+                    for pragma in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size')
+                }
+            db.engine.dispose()
+        return valores
+
+    def test_padroes(self):
+        """Testa WAL, synchronous NORMAL, busy timeout, cache e mmap em toda conexão"""
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': self.db_uri})
+
+        self.assertEqual(self.pragmas(app), {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -65536,
+            'mmap_size': 268435456
+        })
+
+    def test_sobrescrita_pela_configuracao(self):
+        """Testa que SQLITE_PRAGMAS altera ou desativa PRAGMAs específicos"""
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': self.db_uri,
+            'SQLITE_PRAGMAS': {'busy_timeout': 250, 'mmap_size': None}
+        })
+
+        pragmas = self.pragmas(app)
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['busy_timeout'], 250)
+        self.assertEqual(pragmas['mmap_size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
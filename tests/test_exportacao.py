@@ -0,0 +1,190 @@
+"""
+Testes da exportação de tarefas para CSV e XLSX (síncrona e em segundo plano)
+"""
+import unittest
+import csv
+import io
+import logging
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from openpyxl import load_workbook
+from sqlalchemy import insert
+import sys
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa
+from App.Controllers.tarefas import TarefaController
+from App.services.exportacao import ExportacaoService, ExportJobService
+from tests import lento
+from tests.auxiliares import make_task, criar_usuario
+
+
+class TestExportacao(unittest.TestCase):
+    """Testes para ExportacaoService, ExportJobService e as rotas de exportação"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        # Banco em arquivo: o job de exportação usa outra conexão em outra thread
+        self.tmp = tempfile.TemporaryDirectory()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(self.tmp.name, "test.db")}',
+            'EXPORT_DIR': os.path.join(self.tmp.name, 'exports')
+        })
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario(produtos=('Cabo', 'Roteador'))
+
+        TarefaController._store_tasks(
+            [make_task(task_id, f'2025-01-{task_id:02d}T10:30:00', produto='prod-2' if task_id == 3 else 'prod-1') for task_id in range(1, 6)],
+            self.usuario_id
+        )
+
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.usuario_id
+            sess['authenticated'] = True
+
+        self.filtros = {'data_inicial': '2025-01-01', 'data_final': '2025-01-31'}
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmp.cleanup()
+
+    def test_csv(self):
+        """Testa o CSV com separador ';', decimais com vírgula e os filtros do relatório"""
+        resposta = self.client.get('/api/relatorio/export', query_string=dict(self.filtros, formato='csv'))
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertIn('attachment', resposta.headers['Content-Disposition'])
+
+        texto = resposta.get_data(as_text=True)
+        self.assertTrue(texto.startswith('﻿'))
+        linhas = list(csv.reader(io.StringIO(texto.lstrip('﻿')), delimiter=';'))
+
+        self.assertEqual(linhas[0][0], 'ID')
+        self.assertEqual(len(linhas), 6)
+        self.assertEqual(linhas[1], [
+            '1', '01/01/2025 10:30', 'Cliente 1', 'Instalação', 'João',
+            'Produtos: Cabo | Serviços: Serviço serv-1', '150,00', '10,00', '140,00'
+        ])
+
+        resposta = self.client.get('/api/relatorio/export', query_string=dict(self.filtros, formato='csv', produto='prod-2'))
+        linhas = list(csv.reader(io.StringIO(resposta.get_data(as_text=True).lstrip('﻿')), delimiter=';'))
+        self.assertEqual([linha[0] for linha in linhas[1:]], ['3'])
+
+    def test_xlsx_e_dashboard(self):
+        """Testa o XLSX do relatório e o do dashboard, que inclui a aba de resumo"""
+        resposta = self.client.get('/api/relatorio/export', query_string=self.filtros)
+        self.assertEqual(resposta.status_code, 200)
+
+        workbook = load_workbook(io.BytesIO(resposta.data), read_only=True)
+        linhas = list(workbook['Tarefas'].iter_rows(values_only=True))
+        self.assertEqual(len(linhas), 6)
+        self.assertEqual(linhas[1][1], datetime(2025, 1, 1, 10, 30))
+        self.assertEqual(linhas[1][6:], (150.0, 10.0, 140.0))
+
+        resposta = self.client.get('/dashboard/export', query_string=self.filtros)
+        workbook = load_workbook(io.BytesIO(resposta.data), read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Resumo', 'Tarefas'])
+        resumo = {linha[0]: linha[1] for linha in workbook['Resumo'].iter_rows(values_only=True)}
+        self.assertEqual(resumo['Faturamento total'], 750.0)
+        self.assertEqual(resumo['Quantidade de tarefas'], 5)
+
+    def test_formato_invalido(self):
+        """Testa que um formato desconhecido responde 400"""
+        resposta = self.client.get('/api/relatorio/export', query_string={'formato': 'pdf'})
+        self.assertEqual(resposta.status_code, 400)
+
+        resposta = self.client.post('/api/relatorio/export/jobs', json={'formato': 'pdf'})
+        self.assertEqual(resposta.status_code, 400)
+
+    def test_exportacao_em_segundo_plano(self):
+        """Testa o job de exportação: 202, progresso, link de download e acesso restrito ao dono"""
+        resposta = self.client.post('/api/relatorio/export/jobs', json=dict(self.filtros, formato='csv'))
+        self.assertEqual(resposta.status_code, 202)
+        dados = resposta.get_json()
+
+        ExportJobService.aguardar(dados['job_id'], timeout=10)
+
+        job = self.client.get(dados['status_url']).get_json()
+        self.assertEqual(job['status'], 'concluido', job)
+        self.assertEqual(job['linhas'], 5)
+        self.assertTrue(job['nome_arquivo'].endswith('.csv'))
+
+        download = self.client.get(job['download_url'])
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(download.get_data(as_text=True).count('\n'), 6)
+        download.close()
+
+        outro = self.app.test_client()
+        with outro.session_transaction() as sess:
+            sess['user_id'] = self.usuario_id + 1
+        self.assertEqual(outro.get(dados['status_url']).status_code, 404)
+        self.assertEqual(outro.get(job['download_url']).status_code, 404)
+
+    def verificar_memoria(self, pequeno, grande):
+        """Compara o pico de memória do CSV e do XLSX com `pequeno` e com `grande` linhas"""
+        data_base = datetime(2025, 3, 1)
+
+        def inserir(inicio, quantidade):
+            db.session.execute(insert(Tarefa), [
+                {
+                    'id': task_id, 'usuario_id': self.usuario_id, 'data': data_base + timedelta(minutes=task_id),
+                    'cliente': f'Cliente {task_id}', 'tipo_tarefa_id': 1, 'colaborador_id': 1,
+                    'valor_total': 150.0, 'custo_total': 10.0, 'lucro_bruto': 140.0
+                }
+                for task_id in range(inicio, inicio + quantidade)
+            ])
+            db.session.commit()
+
+        def pico(formato):
+            destino = os.path.join(self.tmp.name, f'export.{formato}')
+            tracemalloc.start()
+            try:
+                ExportacaoService.escrever_arquivo(
+                    self.usuario_id, formato, {'data_inicial': '2025-03-01', 'data_final': '2025-12-31'}, destino
+                )
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        nivel = logging.getLogger().level
+        logging.getLogger().setLevel(logging.WARNING)
+        try:
+            inserir(1000, pequeno)
+            pico_pequeno = {formato: pico(formato) for formato in ('csv', 'xlsx')}
+
+            inserir(1000 + pequeno, grande - pequeno)
+            pico_grande = {formato: pico(formato) for formato in ('csv', 'xlsx')}
+        finally:
+            logging.getLogger().setLevel(nivel)
+
+        for formato in ('csv', 'xlsx'):
+            self.assertLess(
+                pico_grande[formato], 1.5 * pico_pequeno[formato],
+                (formato, pico_pequeno[formato], pico_grande[formato])
+            )
+
+    def test_memoria_limitada(self):
+        """Testa que o pico de memória do CSV e do XLSX com 4 mil linhas fica no patamar do de mil"""
+        self.verificar_memoria(1000, 4000)
+
+    @lento
+    def test_memoria_limitada_10_mil_linhas(self):
+        """Testa que o pico de memória do CSV e do XLSX com 10 mil linhas fica no patamar do de mil"""
+        self.verificar_memoria(1000, 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
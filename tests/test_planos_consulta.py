@@ -0,0 +1,186 @@
+"""
+Auditoria dos planos de consulta: as consultas frequentes não podem varrer a tabela inteira
+"""
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+from sqlalchemy import event, text, delete
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import (
+    Usuario, Produto, Servico, Colaborador, TipoTarefa, Tarefa, TarefaItem,
+    ResumoDiario, CheckpointSincronizacao, CoberturaTarefas
+)
+from App.Controllers.tarefas import TarefaController
+from App.Controllers.resumo_diario import ResumoDiarioController
+from tests.auxiliares import make_task, criar_usuario
+
+
+@unittest.skipUnless(os.environ.get('TEST_DATABASE_URL', 'sqlite').startswith('sqlite'), 'Planos de consulta do SQLite')
+class TestPlanosConsulta(unittest.TestCase):
+    """Roda EXPLAIN QUERY PLAN nas consultas quentes e falha em qualquer SCAN de tabela"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.usuario_id = 1
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def plano(self, query):
+        """Retorna as linhas de EXPLAIN QUERY PLAN da consulta"""
+        statement = getattr(query, 'statement', query)
+        compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+        return [linha[-1] for linha in db.session.execute(text(f'EXPLAIN QUERY PLAN {compiled}'))]
+
+    def assertSemScan(self, query):
+        """Falha se alguma tabela for lida por inteiro (SCAN sem índice)"""
+        plano = self.plano(query)
+        scans = [
+            linha for linha in plano
+            if linha.startswith('SCAN ') and ' USING ' not in linha and 'VIRTUAL TABLE' not in linha
+        ]
+        self.assertEqual(scans, [], plano)
+        return plano
+
+    def planos_executados(self, funcao):
+        """Executa funcao e retorna (instrução, plano) de cada SELECT, INSERT ou DELETE que ela rodou"""
+        executadas = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().split(' ', 1)[0] in ('SELECT', 'INSERT', 'DELETE'):
+                executadas.append((statement, parameters[0] if executemany else parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            funcao()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        conexao = db.session.connection()
+        return [
+            (statement, [linha[-1] for linha in conexao.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)])
+            for statement, parameters in executadas
+        ]
+
+    def assertExecutadasSemScan(self, funcao, tabela, indices):
+        """Falha se funcao varrer alguma tabela, ou se não ler `tabela` pelos índices esperados"""
+        planos = self.planos_executados(funcao)
+        for statement, plano in planos:
+            scans = [
+                linha for linha in plano
+                if linha.startswith('SCAN ') and ' USING ' not in linha and 'VIRTUAL TABLE' not in linha
+            ]
+            self.assertEqual(scans, [], (statement, plano))
+
+        linhas = [linha for _, plano in planos for linha in plano if f' {tabela} ' in f'{linha} ']
+        for indice in indices:
+            self.assertTrue(any(indice in linha for linha in linhas), (indice, linhas))
+        return planos
+
+    def test_tarefas_do_periodo(self):
+        """Testa o resumo financeiro e a listagem de tarefas por período e filtros"""
+        colunas = db.session.query(Tarefa.id, Tarefa.valor_total)
+
+        for filters, indices in (
+            ({}, ['ix_tarefa_usuario_data']),
+            ({'tipo_tarefa': '2'}, ['ix_tarefa_usuario_tipo_data']),
+            ({'colaborador': '3'}, ['ix_tarefa_usuario_colaborador_data']),
+            ({'produto': 'prod-1', 'servico': 'serv-1'}, ['ix_tarefa_usuario_data', 'ix_tarefa_item_usuario_item'])
+        ):
+            query = TarefaController.apply_task_filters(colunas, self.usuario_id, '2025-01-01', '2025-01-31', filters)
+            plano = self.assertSemScan(query)
+            for indice in indices:
+                self.assertTrue(any(indice in linha for linha in plano), (filters, plano))
+
+    def test_itens_da_tarefa(self):
+        """Testa a substituição dos itens de um lote de tarefas"""
+        self.assertSemScan(delete(TarefaItem).where(TarefaItem.tarefa_id.in_([1, 2, 3])))
+
+    def test_relatorio_detalhado(self):
+        """Testa a consulta de relatorio_tarefas.detailed_data com todos os filtros"""
+        filters = {'tipo_tarefa': '2', 'colaborador': '3', 'produto': 'prod-1'}
+        query = TarefaController.apply_task_filters(Tarefa.query, self.usuario_id, '2025-01-01', '2025-01-31', filters)
+        self.assertSemScan(query)
+
+    def test_relatorio_por_valor_com_cursor(self):
+        """Testa a página seguinte do relatório ordenado por valor (predicado de tupla do cursor)"""
+        self.usuario_id = criar_usuario()
+        TarefaController._store_tasks([make_task(task_id) for task_id in range(1, 11)], self.usuario_id)
+        cursor = TarefaController._encode_report_cursor('valor_total', SimpleNamespace(id=5, valor_total=150.0))
+
+        self.assertExecutadasSemScan(
+            lambda: TarefaController.list_tasks_page(
+                self.usuario_id, '2025-01-01', '2025-01-31', sort='valor_total', order='desc', cursor=cursor, limit=5
+            ),
+            'tarefa', ['ix_tarefa_usuario_data']
+        )
+
+    def test_atualizacao_do_resumo_diario(self):
+        """Testa o DELETE e o INSERT ... SELECT agrupado de ResumoDiarioController.refresh_days"""
+        self.usuario_id = criar_usuario()
+        TarefaController._store_tasks([make_task(task_id) for task_id in range(1, 11)], self.usuario_id)
+
+        self.assertExecutadasSemScan(
+            lambda: ResumoDiarioController.refresh_days(self.usuario_id, [date(2025, 1, 14), date(2025, 1, 15)]),
+            'tarefa', ['ix_tarefa_usuario_data']
+        )
+
+    def test_remocao_de_tarefas_que_sumiram(self):
+        """Testa as leituras e remoções de TarefaController._remove_missing_tasks"""
+        self.usuario_id = criar_usuario()
+        TarefaController._store_tasks([make_task(task_id) for task_id in range(1, 11)], self.usuario_id)
+
+        planos = self.assertExecutadasSemScan(
+            lambda: TarefaController._remove_missing_tasks(
+                self.usuario_id, date(2025, 1, 1), date(2025, 1, 31), set(range(1, 6))
+            ),
+            'tarefa', ['ix_tarefa_usuario_data']
+        )
+        self.assertEqual(Tarefa.query.count(), 5)
+
+        # As remoções por ID usam a chave primária, não todas as tarefas do usuário
+        for tabela in ('tarefa', 'tarefa_detalhes', 'tarefa_item'):
+            plano = next(plano for statement, plano in planos if statement.startswith(f'DELETE FROM {tabela} '))
+            self.assertTrue(all('PRIMARY KEY' in linha or 'ix_tarefa_item_tarefa' in linha for linha in plano), (tabela, plano))
+
+    def test_resumo_diario(self):
+        """Testa a soma do período a partir do resumo diário"""
+        query = db.session.query(db.func.sum(ResumoDiario.faturamento_produto)).filter(
+            ResumoDiario.usuario_id == self.usuario_id,
+            ResumoDiario.dia >= datetime(2025, 1, 1).date(),
+            ResumoDiario.dia <= datetime(2025, 1, 31).date(),
+            ResumoDiario.colaborador_id == 3
+        )
+        self.assertSemScan(query)
+
+    def test_catalogos_do_usuario(self):
+        """Testa as leituras de catálogo por usuário e por (id, usuario_id)"""
+        for model, item_id in ((Produto, 'prod-1'), (Servico, 'serv-1'), (Colaborador, 3), (TipoTarefa, 2)):
+            self.assertSemScan(db.session.query(model.id).filter_by(usuario_id=self.usuario_id))
+            self.assertSemScan(model.query.filter_by(id=item_id, usuario_id=self.usuario_id))
+
+    def test_checkpoints_e_coberturas(self):
+        """Testa as leituras de checkpoints e intervalos sincronizados"""
+        self.assertSemScan(CheckpointSincronizacao.query.filter_by(usuario_id=self.usuario_id, entidade='produtos'))
+        self.assertSemScan(
+            CoberturaTarefas.query.filter_by(usuario_id=self.usuario_id).order_by(CoberturaTarefas.cobertura_inicio)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from App.Controllers.produtos import ProdutoController
-from run import create_app
+from App import create_app
 
 
 class TestProdutoControllerSimple(unittest.TestCase):
@@ -18,7 +18,10 @@ class TestProdutoControllerSimple(unittest.TestCase):
     
     def setUp(self):
         """Configuração inicial para cada teste"""
-        self.app = create_app()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
         self.app_context = self.app.app_context()
         self.app_context.push()
         
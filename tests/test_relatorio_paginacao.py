@@ -0,0 +1,201 @@
+"""
+Testes da paginação por cursor do relatório detalhado (/api/relatorio/detailed-data)
+"""
+import unittest
+import base64
+import json
+from sqlalchemy import event
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Servico
+from App.Controllers.tarefas import TarefaController
+from tests.auxiliares import make_task, criar_usuario
+
+
+class TestRelatorioPaginacao(unittest.TestCase):
+    """Testes para list_tasks_page e as rotas do relatório detalhado"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario()
+
+        # Várias tarefas no mesmo horário para exercitar o desempate por id
+        TarefaController._store_tasks([
+            make_task(
+                task_id, f'2025-01-{1 + task_id % 10:02d}T{8 + task_id % 3:02d}:00:00',
+                produto='prod-1' if task_id % 2 else None, valor_servico=float(task_id % 5 * 10), cliente=f'Cliente {task_id % 7}'
+            )
+            for task_id in range(1, 58)
+        ], self.usuario_id)
+
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.usuario_id
+            sess['authenticated'] = True
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def todas_as_paginas(self, **params):
+        """Percorre todas as páginas da rota e retorna as linhas na ordem recebida"""
+        params = dict({'data_inicial': '2025-01-01', 'data_final': '2025-01-31', 'limit': 10}, **params)
+        linhas = []
+
+        while True:
+            resposta = self.client.get('/api/relatorio/detailed-data', query_string=params)
+            self.assertEqual(resposta.status_code, 200, resposta.get_json())
+            pagina = resposta.get_json()
+            linhas.extend(pagina['data'])
+            self.assertLessEqual(len(pagina['data']), 10)
+
+            if not pagina['has_more']:
+                self.assertIsNone(pagina['next_cursor'])
+                return linhas
+            params['cursor'] = pagina['next_cursor']
+
+    def test_percorre_por_data_sem_repetir(self):
+        """Testa que as páginas por (data, id) cobrem todas as tarefas uma única vez, nos dois sentidos"""
+        for order in ('asc', 'desc'):
+            ids = [linha['id'] for linha in self.todas_as_paginas(order=order)]
+
+            self.assertEqual(len(ids), 57)
+            self.assertEqual(len(set(ids)), 57)
+
+        asc = [linha['id'] for linha in self.todas_as_paginas(order='asc')]
+        desc = [linha['id'] for linha in self.todas_as_paginas(order='desc')]
+        self.assertEqual(asc, desc[::-1])
+
+    def test_ordenacao_por_outras_colunas(self):
+        """Testa a ordenação pelo servidor por lucro e cliente"""
+        pagina = TarefaController.list_tasks_page(self.usuario_id, '2025-01-01', '2025-01-31', sort='lucro_bruto', order='desc', limit=100)
+        lucros = [tarefa.lucro_bruto for tarefa in pagina['tasks']]
+        self.assertEqual(lucros, sorted(lucros, reverse=True))
+
+        clientes = [linha['cliente'] for linha in self.todas_as_paginas(sort='cliente')]
+        self.assertEqual(len(clientes), 57)
+        self.assertEqual(clientes, sorted(clientes))
+
+    def test_filtros_e_total(self):
+        """Testa que a página e o total usam os mesmos filtros"""
+        linhas = self.todas_as_paginas(produto='prod-1')
+        total = self.client.get('/api/relatorio/detailed-data/count', query_string={
+            'data_inicial': '2025-01-01', 'data_final': '2025-01-31', 'produto': 'prod-1'
+        }).get_json()['total']
+
+        self.assertEqual(len(linhas), 29)
+        self.assertEqual(total, 29)
+
+        total = self.client.get('/api/relatorio/detailed-data/count', query_string={
+            'data_inicial': '2025-01-01', 'data_final': '2025-01-31'
+        }).get_json()['total']
+        self.assertEqual(total, 57)
+
+    def test_parametros_invalidos(self):
+        """Testa que ordenação fora da lista e cursor adulterado respondem 400"""
+        for params in ({'sort': 'detalhes_json'}, {'order': 'sideways'}, {'cursor': 'nao-e-um-cursor'}):
+            resposta = self.client.get('/api/relatorio/detailed-data', query_string=params)
+            self.assertEqual(resposta.status_code, 400, params)
+
+    def test_cursor_com_valor_do_tipo_errado(self):
+        """Testa que um cursor com valor incompatível com a coluna de ordenação responde 400, sem o SQL"""
+        def cursor(valor, task_id=1):
+            return base64.urlsafe_b64encode(json.dumps([valor, task_id]).encode('utf-8')).decode('ascii')
+
+        casos = [
+            ('valor_total', cursor('abc')),
+            ('custo_total', cursor([1])),
+            ('lucro_bruto', cursor(float('inf'))),
+            ('lucro_bruto', cursor(True)),
+            ('cliente', cursor(1)),
+            ('data', cursor(5)),
+            ('valor_total', cursor(1.5, 'x')),
+        ]
+        for sort, valor in casos:
+            resposta = self.client.get('/api/relatorio/detailed-data', query_string={'sort': sort, 'cursor': valor})
+            self.assertEqual(resposta.status_code, 400, (sort, valor))
+            self.assertEqual(resposta.get_json()['error'], 'Cursor inválido')
+
+    def test_total_com_data_invalida(self):
+        """Testa que o total responde 400 para data inválida, como a listagem"""
+        for rota in ('/api/relatorio/detailed-data', '/api/relatorio/detailed-data/count'):
+            resposta = self.client.get(rota, query_string={'data_inicial': '2025-13-01'})
+            self.assertEqual(resposta.status_code, 400, rota)
+
+    @unittest.skipUnless(os.environ.get('TEST_DATABASE_URL', 'sqlite').startswith('sqlite'), 'Plano de consulta do SQLite')
+    def test_pagina_seguinte_usa_o_cursor_no_indice(self):
+        """Testa que a página seguinte por data lê o índice a partir do cursor, sem ordenar em memória"""
+        primeira = TarefaController.list_tasks_page(self.usuario_id, '2025-01-01', '2025-01-31', limit=5)
+        cursor_data = primeira['tasks'][-1].data
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            TarefaController.list_tasks_page(
+                self.usuario_id, '2025-01-01', '2025-01-31', cursor=primeira['next_cursor'], limit=5
+            )
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        # A página e os itens das tarefas dela
+        self.assertEqual(len(statements), 2)
+        statement, parameters = statements[0]
+        plano = [linha[-1] for linha in db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', tuple(parameters))]
+        self.assertTrue(any('ix_tarefa_usuario_data' in linha for linha in plano), plano)
+        self.assertFalse(any('TEMP B-TREE' in linha for linha in plano), plano)
+        # O intervalo lido começa no cursor, não no início do período
+        self.assertTrue(any(str(parametro).startswith(cursor_data.isoformat(' ')) for parametro in parameters), parameters)
+
+    def test_quantidade_de_consultas_constante(self):
+        """Testa que a rota faz o mesmo número de consultas para 1 ou 57 linhas e não lê o JSON das tarefas"""
+        db.session.add(Servico(id='serv-1', usuario_id=self.usuario_id, nome='Visita técnica'))
+        db.session.commit()
+
+        def consultas(limit):
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+            try:
+                resposta = self.client.get('/api/relatorio/detailed-data', query_string={
+                    'data_inicial': '2025-01-01', 'data_final': '2025-01-31', 'limit': limit
+                })
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+            self.assertEqual(len(resposta.get_json()['data']), limit)
+            return resposta.get_json()['data'], statements
+
+        _, poucas = consultas(1)
+        linhas, muitas = consultas(57)
+
+        self.assertEqual(len(poucas), len(muitas), muitas)
+        self.assertFalse(any('tarefa_detalhes' in statement for statement in muitas))
+
+        linha = next(linha for linha in linhas if linha['id'] == 1)
+        self.assertEqual((linha['tipo_tarefa'], linha['colaborador']), ('Instalação', 'João'))
+        self.assertEqual(linha['itens'], 'Produtos: Cabo | Serviços: Visita técnica')
+
+
+if __name__ == '__main__':
+    unittest.main()
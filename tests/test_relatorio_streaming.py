@@ -0,0 +1,140 @@
+"""
+Testes do relatório detalhado em streaming (/api/relatorio/detailed-data/stream)
+"""
+import unittest
+import json
+import logging
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa, TarefaItem
+from tests import lento
+from tests.auxiliares import criar_usuario
+
+
+class TestRelatorioStreaming(unittest.TestCase):
+    """Testes para a resposta em streaming do relatório detalhado"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario(produtos=())
+
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.usuario_id
+            sess['authenticated'] = True
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def inserir_tarefas(self, inicio, quantidade):
+        """Insere tarefas diretamente na tabela, uma por minuto a partir de 01/01/2025"""
+        data_base = datetime(2025, 1, 1)
+        db.session.execute(insert(Tarefa), [
+            {
+                'id': task_id,
+                'usuario_id': self.usuario_id,
+                'data': data_base + timedelta(minutes=task_id),
+                'cliente': f'Cliente {task_id}',
+                'tipo_tarefa_id': 1,
+                'colaborador_id': 1,
+                'valor_total': 150.0,
+                'custo_total': 20.0,
+                'lucro_bruto': 130.0
+            }
+            for task_id in range(inicio, inicio + quantidade)
+        ])
+        db.session.execute(insert(TarefaItem), [
+            item
+            for task_id in range(inicio, inicio + quantidade)
+            for item in (
+                {'tarefa_id': task_id, 'usuario_id': self.usuario_id, 'tipo': 'produto', 'item_id': 'prod-1',
+                 'quantidade': 1, 'faturamento': 50.0, 'custo': 20.0},
+                {'tarefa_id': task_id, 'usuario_id': self.usuario_id, 'tipo': 'servico', 'item_id': 'serv-1',
+                 'quantidade': 1, 'faturamento': 100.0, 'custo': 0.0}
+            )
+        ])
+        db.session.commit()
+
+    def stream(self, **params):
+        """Consome a resposta sem bufferizar e retorna (pico de memória, tamanho do corpo) em bytes"""
+        params = dict({'data_inicial': '2025-01-01', 'data_final': '2025-12-31'}, **params)
+
+        tracemalloc.start()
+        try:
+            resposta = self.client.get('/api/relatorio/detailed-data/stream', query_string=params, buffered=False)
+            tamanho = sum(len(parte) for parte in resposta.response)
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return pico, tamanho
+
+    def test_array_completo_na_ordem(self):
+        """Testa que o streaming devolve um array JSON válido com todas as tarefas na ordem pedida"""
+        self.inserir_tarefas(1, 1203)
+
+        resposta = self.client.get('/api/relatorio/detailed-data/stream', query_string={
+            'data_inicial': '2025-01-01', 'data_final': '2025-12-31', 'order': 'desc'
+        })
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.mimetype, 'application/json')
+        linhas = json.loads(resposta.get_data(as_text=True))
+        self.assertEqual([linha['id'] for linha in linhas], list(range(1203, 0, -1)))
+        self.assertEqual(linhas[0]['itens'], 'Produtos: Produto prod-1 | Serviços: Serviço serv-1')
+
+    def test_periodo_vazio_e_parametros_invalidos(self):
+        """Testa o array vazio e o 400 para ordenação fora da lista"""
+        resposta = self.client.get('/api/relatorio/detailed-data/stream')
+        self.assertEqual(json.loads(resposta.get_data(as_text=True)), [])
+
+        resposta = self.client.get('/api/relatorio/detailed-data/stream', query_string={'sort': 'detalhes_json'})
+        self.assertEqual(resposta.status_code, 400)
+
+    def verificar_memoria(self, pequeno, grande):
+        """Compara o pico de memória do stream com `pequeno` e com `grande` tarefas"""
+        # O log de debug do SQLAlchemy/aplicação distorceria a medição
+        nivel = logging.getLogger().level
+        logging.getLogger().setLevel(logging.WARNING)
+        try:
+            self.inserir_tarefas(1, pequeno)
+            pico_pequeno, tamanho_pequeno = self.stream()
+
+            self.inserir_tarefas(pequeno + 1, grande - pequeno)
+            pico_grande, tamanho_grande = self.stream()
+        finally:
+            logging.getLogger().setLevel(nivel)
+
+        self.assertGreater(tamanho_grande, 0.9 * grande / pequeno * tamanho_pequeno)
+        self.assertLess(pico_grande, 1.5 * pico_pequeno, (pico_pequeno, pico_grande))
+
+    def test_memoria_nao_cresce_com_o_numero_de_tarefas(self):
+        """Testa que o pico de memória fica estável quando o número de tarefas cresce de 1.000 para 4.000"""
+        self.verificar_memoria(1000, 4000)
+
+    @lento
+    def test_memoria_nao_cresce_com_10_mil_tarefas(self):
+        """Testa que o pico de memória fica estável quando o número de tarefas cresce de 1.000 para 10.000"""
+        self.verificar_memoria(1000, 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
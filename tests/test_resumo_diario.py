@@ -0,0 +1,113 @@
+"""
+Testes do resumo diário (ResumoDiario) mantido junto com as tarefas
+"""
+import unittest
+from datetime import date
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import ResumoDiario
+from App.Controllers.tarefas import TarefaController
+from App.Controllers.resumo_diario import ResumoDiarioController
+from tests.auxiliares import make_task, criar_usuario
+
+
+class TestResumoDiario(unittest.TestCase):
+    """Testes para ResumoDiarioController"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario(tipos=('Instalação', 'Manutenção'), colaboradores=('João', 'Maria'))
+
+        TarefaController._store_tasks([
+            make_task(1, '2025-01-05T08:00:00'),
+            make_task(2, '2025-01-05T23:30:00'),
+            make_task(3, '2025-01-05T12:00:00', colaborador=2),
+            make_task(4, '2025-01-20T09:00:00', tipo=2)
+        ], self.usuario_id)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def linhas(self):
+        """Retorna o resumo como {(dia, tipo, colaborador): quantidade}"""
+        return {
+            (linha.dia, linha.tipo_tarefa_id, linha.colaborador_id): linha.quantidade_tarefas
+            for linha in ResumoDiario.query.filter_by(usuario_id=self.usuario_id)
+        }
+
+    def test_resumo_criado_ao_gravar_tarefas(self):
+        """Testa que gravar tarefas agrupa o resumo por dia, tipo e colaborador"""
+        self.assertEqual(self.linhas(), {
+            (date(2025, 1, 5), 1, 1): 2,
+            (date(2025, 1, 5), 1, 2): 1,
+            (date(2025, 1, 20), 2, 1): 1
+        })
+
+        linha = db.session.get(ResumoDiario, (self.usuario_id, date(2025, 1, 5), 1, 1))
+        self.assertEqual(linha.faturamento_produto, 100.0)
+        self.assertEqual(linha.faturamento_servico, 200.0)
+        self.assertEqual(linha.custo_produto, 20.0)
+
+    def test_tarefa_movida_atualiza_os_dois_dias(self):
+        """Testa que mudar a data e o tipo de uma tarefa atualiza o dia antigo e o novo"""
+        TarefaController._store_tasks([make_task(4, '2025-01-05T10:00:00', tipo=1)], self.usuario_id)
+
+        self.assertEqual(self.linhas(), {
+            (date(2025, 1, 5), 1, 1): 3,
+            (date(2025, 1, 5), 1, 2): 1
+        })
+
+    def test_tarefas_removidas_saem_do_resumo(self):
+        """Testa que tarefas removidas na re-sincronização deixam de ser somadas"""
+        removidas = TarefaController._remove_missing_tasks(
+            self.usuario_id, date(2025, 1, 1), date(2025, 1, 31), {1, 4}
+        )
+
+        self.assertEqual(removidas, 2)
+        self.assertEqual(self.linhas(), {
+            (date(2025, 1, 5), 1, 1): 1,
+            (date(2025, 1, 20), 2, 1): 1
+        })
+
+    def test_totais_iguais_aos_das_tarefas(self):
+        """Testa que o resumo diário soma o mesmo que a consulta sobre as tarefas"""
+        for filters in ({}, {'tipo_tarefa': '2'}, {'colaborador': '2'}):
+            resumo = ResumoDiarioController.aggregate_totals(self.usuario_id, '2025-01-01', '2025-01-31', filters)
+            tarefas = TarefaController.aggregate_financial_totals(
+                self.usuario_id, '2025-01-01', '2025-01-31', dict(filters, servico='serv-1')
+            )
+            self.assertEqual(resumo, tarefas)
+
+        resumo = ResumoDiarioController.aggregate_totals(self.usuario_id, '2025-01-05', '2025-01-05')
+        self.assertEqual(resumo['quantidade_tarefas'], 3)
+        self.assertEqual(resumo['lucro_total'], 3 * 140.0)
+
+    def test_rebuild(self):
+        """Testa que o rebuild refaz o resumo a partir das tarefas"""
+        esperado = self.linhas()
+        ResumoDiario.query.delete()
+        db.session.commit()
+
+        ResumoDiarioController.rebuild(self.usuario_id)
+        db.session.commit()
+
+        self.assertEqual(self.linhas(), esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Testes do resumo financeiro calculado direto das tarefas (get_financial_summary)
+"""
+import unittest
+from sqlalchemy import event, text
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa
+from App.Controllers.tarefas import TarefaController
+from tests.auxiliares import make_task, criar_usuario
+
+
+class TestResumoFinanceiro(unittest.TestCase):
+    """Testes para get_financial_summary e aggregate_financial_totals"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario(
+            tipos=('Instalação', 'Manutenção'), colaboradores=('João', 'Maria'), produtos=('Cabo', 'Roteador')
+        )
+
+        TarefaController._store_tasks([
+            make_task(1, '2025-01-05T08:00:00'),
+            make_task(2, '2025-01-10T23:30:00', colaborador=2, produto='prod-2'),
+            make_task(3, '2025-01-20T12:00:00', tipo=2, servico='serv-2'),
+            make_task(4, '2025-02-01T09:00:00')
+        ], self.usuario_id)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_qualquer_periodo_sem_sincronizar(self):
+        """Testa que um período nunca sincronizado como tal é somado a partir das tarefas"""
+        resumo = TarefaController.get_financial_summary(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertEqual(resumo['quantidade_tarefas'], 3)
+        self.assertEqual(resumo['faturamento']['total'], 450.0)
+        self.assertEqual(resumo['faturamento']['produto'], 150.0)
+        self.assertEqual(resumo['faturamento']['servico'], 300.0)
+        self.assertEqual(resumo['lucro']['total'], 420.0)
+        self.assertAlmostEqual(resumo['faturamento']['porcentagem_servico'], 300 / 450 * 100)
+        self.assertAlmostEqual(resumo['lucro']['margem_lucro'], 420 / 450 * 100)
+
+    def test_data_final_inclui_o_dia_inteiro(self):
+        """Testa que tarefas no fim do último dia entram no período"""
+        resumo = TarefaController.get_financial_summary(self.usuario_id, '2025-01-10', '2025-01-10')
+
+        self.assertEqual(resumo['quantidade_tarefas'], 1)
+
+    def test_filtros(self):
+        """Testa os filtros de tipo, colaborador, produto e serviço"""
+        def quantidade(**filters):
+            return TarefaController.aggregate_financial_totals(
+                self.usuario_id, '2025-01-01', '2025-02-28', filters
+            )['quantidade_tarefas']
+
+        self.assertEqual(quantidade(tipo_tarefa='2'), 1)
+        self.assertEqual(quantidade(colaborador='2'), 1)
+        self.assertEqual(quantidade(produto='prod-2'), 1)
+        self.assertEqual(quantidade(servico='serv-1'), 3)
+        self.assertEqual(quantidade(produto='prod-1', servico='serv-2'), 1)
+        self.assertEqual(quantidade(produto='', colaborador=None), 4)
+
+    def test_uma_unica_consulta(self):
+        """Testa que o resumo é calculado com um único SELECT"""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            TarefaController.get_financial_summary(
+                self.usuario_id, '2025-01-01', '2025-01-31', {'colaborador': '1', 'produto': 'prod-1'}
+            )
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertEqual(len(statements), 1)
+
+    @unittest.skipUnless(os.environ.get('TEST_DATABASE_URL', 'sqlite').startswith('sqlite'), 'Plano de consulta do SQLite')
+    def test_consulta_usa_indice_usuario_data(self):
+        """Testa que a consulta do período usa o índice (usuario_id, data)"""
+        query = TarefaController.apply_task_filters(
+            db.session.query(Tarefa.id),
+            self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+        compiled = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+
+        plano = db.session.execute(text(f'EXPLAIN QUERY PLAN {compiled}')).fetchall()
+
+        self.assertTrue(any('ix_tarefa_usuario_data' in linha[-1] for linha in plano), plano)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Testes da sincronização incremental (SincronizacaoService)
+"""
+import unittest
+from unittest.mock import patch
+from datetime import date, datetime, timedelta
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa, PaginacaoTarefas
+from App.Controllers.tarefas import TarefaController
+from App.services.sincronizacao import SincronizacaoService
+from tests.auxiliares import make_task, criar_usuario
+
+
+def make_page(tasks):
+    """Monta o resultado de uma página de tarefas como gerado por _iter_task_pages"""
+    return {'success': True, 'message': 'ok', 'data': {'tasks': tasks, 'total_items': len(tasks)}}
+
+
+class TestSincronizacaoIncremental(unittest.TestCase):
+    """Testes para checkpoints, intervalos cobertos e intervalos pendentes"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+            'SYNC_JANELA_MUTAVEL_DIAS': 3
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_sem_checkpoint_baixa_periodo_inteiro(self):
+        """Testa que sem checkpoint todo o período está pendente"""
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(
+            self.usuario_id, date(2025, 1, 1), date(2025, 1, 31)
+        )
+
+        self.assertEqual(intervalos, [(date(2025, 1, 1), date(2025, 1, 31))])
+
+    def test_periodo_coberto_nao_baixa_nada(self):
+        """Testa que um período já sincronizado e fora da janela mutável não é baixado"""
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 1, 1), date(2025, 1, 31), sincronizado_em=datetime(2025, 3, 1)
+        )
+
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(
+            self.usuario_id, date(2025, 1, 10), date(2025, 1, 20)
+        )
+
+        self.assertEqual(intervalos, [])
+
+    def test_janela_mutavel_e_bordas(self):
+        """Testa que os dias fora da faixa e a janela mutável são baixados"""
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 1, 10), date(2025, 1, 20), sincronizado_em=datetime(2025, 1, 20, 12, 0)
+        )
+
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(
+            self.usuario_id, date(2025, 1, 5), date(2025, 1, 25)
+        )
+
+        self.assertEqual(intervalos, [
+            (date(2025, 1, 5), date(2025, 1, 9)),
+            (date(2025, 1, 18), date(2025, 1, 25))
+        ])
+
+    def test_sincronizacao_recente_vale_inteira(self):
+        """Testa que um intervalo recém-sincronizado não re-checa a janela mutável"""
+        agora = datetime(2025, 1, 20, 12, 0)
+        SincronizacaoService.registrar_cobertura(self.usuario_id, date(2025, 1, 10), date(2025, 1, 20), sincronizado_em=agora)
+
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(
+            self.usuario_id, date(2025, 1, 10), date(2025, 1, 20), agora=agora + timedelta(minutes=1)
+        )
+
+        self.assertEqual(intervalos, [])
+
+    def test_lacunas_entre_intervalos(self):
+        """Testa que só as lacunas entre vários intervalos cobertos são baixadas"""
+        sincronizado_em = datetime(2025, 6, 1)
+        SincronizacaoService.registrar_cobertura(self.usuario_id, date(2025, 1, 1), date(2025, 1, 10), sincronizado_em)
+        SincronizacaoService.registrar_cobertura(self.usuario_id, date(2025, 2, 1), date(2025, 2, 10), sincronizado_em)
+
+        intervalos = SincronizacaoService.calcular_intervalos_pendentes(
+            self.usuario_id, date(2025, 1, 5), date(2025, 2, 20)
+        )
+
+        self.assertEqual(intervalos, [
+            (date(2025, 1, 11), date(2025, 1, 31)),
+            (date(2025, 2, 11), date(2025, 2, 20))
+        ])
+
+    def test_intervalos_vizinhos_sao_unidos(self):
+        """Testa que intervalos vizinhos definitivos viram um só e sobreposições são recortadas"""
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 1, 1), date(2025, 1, 31), sincronizado_em=datetime(2025, 3, 1)
+        )
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 2, 1), date(2025, 2, 10), sincronizado_em=datetime(2025, 3, 2)
+        )
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 3, 1), date(2025, 3, 5), sincronizado_em=datetime(2025, 3, 5)
+        )
+        SincronizacaoService.registrar_cobertura(
+            self.usuario_id, date(2025, 3, 3), date(2025, 3, 10), sincronizado_em=datetime(2025, 3, 10)
+        )
+
+        coberturas = [
+            (c.cobertura_inicio, c.cobertura_fim) for c in SincronizacaoService.listar_coberturas(self.usuario_id)
+        ]
+        self.assertEqual(coberturas, [
+            (date(2025, 1, 1), date(2025, 2, 10)),
+            (date(2025, 3, 1), date(2025, 3, 2)),
+            (date(2025, 3, 3), date(2025, 3, 10))
+        ])
+
+    @patch('App.services.sincronizacao.ProdutoController.fetch_and_save_products')
+    def test_catalogo_em_cache(self, mock_fetch):
+        """Testa que o cadastro só é baixado novamente depois de expirar"""
+        mock_fetch.return_value = {'success': True, 'message': 'ok', 'data': {}}
+
+        SincronizacaoService.sincronizar_catalogo(self.usuario_id, 'produtos', incremental=True)
+        resultado = SincronizacaoService.sincronizar_catalogo(self.usuario_id, 'produtos', incremental=True)
+
+        self.assertTrue(resultado['data']['cached'])
+        self.assertEqual(mock_fetch.call_count, 1)
+
+        checkpoint = SincronizacaoService.get_checkpoint(self.usuario_id, 'produtos')
+        checkpoint.sincronizado_em = datetime.now() - timedelta(days=1)
+        db.session.commit()
+
+        SincronizacaoService.sincronizar_catalogo(self.usuario_id, 'produtos', incremental=True)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    @patch('App.services.sincronizacao.AuthController.validate_token')
+    @patch('App.Controllers.tarefas.TarefaController._iter_task_pages')
+    def test_segunda_consulta_nao_chama_api(self, mock_fetch, mock_validate):
+        """Testa que repetir ou estreitar uma consulta antiga não acessa a API"""
+        mock_validate.return_value = {'valid': True, 'access_token': 'bearer'}
+        mock_fetch.side_effect = lambda *args, **kwargs: (
+            page for page in [make_page([make_task(1, '2025-01-05'), make_task(2, '2025-01-06')])]
+        )
+
+        primeira = SincronizacaoService.sincronizar_tarefas(self.usuario_id, '2025-01-01', '2025-01-31')
+        segunda = SincronizacaoService.sincronizar_tarefas(self.usuario_id, '2025-01-01', '2025-01-31')
+        estreita = SincronizacaoService.sincronizar_tarefas(self.usuario_id, '2025-01-06', '2025-01-10')
+
+        self.assertTrue(primeira['success'])
+        self.assertEqual(primeira['data']['tasks_saved'], 2)
+        self.assertTrue(segunda['success'])
+        self.assertEqual(segunda['data']['intervalos_sincronizados'], [])
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(segunda['data']['financial_data']['faturamento_total'], 300.0)
+        self.assertEqual(estreita['data']['financial_data']['faturamento_total'], 150.0)
+
+    @patch('App.services.sincronizacao.AuthController.validate_token')
+    @patch('App.Controllers.tarefas.TarefaController._iter_task_pages')
+    def test_tarefa_removida_na_api(self, mock_fetch, mock_validate):
+        """Testa que tarefas que sumiram da API são removidas do período re-sincronizado"""
+        mock_validate.return_value = {'valid': True, 'access_token': 'bearer'}
+        TarefaController._store_tasks([make_task(1, '2025-01-05'), make_task(2, '2025-01-06')], self.usuario_id)
+
+        mock_fetch.side_effect = lambda *args, **kwargs: (page for page in [make_page([make_task(1, '2025-01-05')])])
+        resultado = SincronizacaoService.sincronizar_tarefas(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertEqual(resultado['data']['tasks_removed'], 1)
+        self.assertEqual([t.id for t in Tarefa.query.all()], [1])
+
+    @patch('App.services.sincronizacao.AuthController.validate_token')
+    @patch('App.Controllers.tarefas.TarefaController._iter_task_pages')
+    def test_continuacao_nao_remove_tarefas(self, mock_fetch, mock_validate):
+        """Testa que a continuação de uma paginação interrompida não remove as tarefas das páginas anteriores"""
+        mock_validate.return_value = {'valid': True, 'access_token': 'bearer'}
+        TarefaController._store_tasks([make_task(1, '2025-01-05'), make_task(2, '2025-01-06')], self.usuario_id)
+        db.session.add(PaginacaoTarefas(
+            usuario_id=self.usuario_id, data_inicial='2025-01-01', data_final='2025-01-31',
+            ultima_pagina=1, total_itens=3, atualizado_em=datetime.now()
+        ))
+        db.session.commit()
+
+        pagina = {'success': True, 'message': 'ok', 'data': {'tasks': [make_task(3, '2025-01-07')], 'total_items': 3}}
+        mock_fetch.side_effect = lambda *args, **kwargs: (page for page in [pagina])
+        resultado = SincronizacaoService.sincronizar_tarefas(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertEqual(mock_fetch.call_args.kwargs['start_page'], 2)
+        self.assertEqual(resultado['data']['tasks_removed'], 0)
+        self.assertEqual(sorted(t.id for t in Tarefa.query.all()), [1, 2, 3])
+        self.assertEqual(resultado['data']['financial_data']['faturamento_total'], 450.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Testes da sincronização de tarefas em fluxo (página da API -> gravação no banco)
+"""
+import unittest
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta
+import gc
+import logging
+import re
+import tracemalloc
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Tarefa, PaginacaoTarefas
+from App.Controllers.tarefas import TarefaController, TASKS_PAGE_SIZE
+from tests import lento
+from tests.auxiliares import make_task, fake_tasks_api, criar_usuario
+
+
+def tarefa_por_minuto(indice, filtro):
+    """Tarefa de índice `indice` para fake_tasks_api, uma por minuto a partir de 01/01/2025"""
+    return make_task(indice + 1, datetime(2025, 1, 1) + timedelta(minutes=indice), cliente=f'Cliente {indice}')
+
+
+@patch('App.Controllers.auth_api.AuthController.validate_token', Mock(return_value={'valid': True, 'access_token': 'validado'}))
+class TestSincronizacaoStreaming(unittest.TestCase):
+    """Testes para TarefaController._stream_tasks_to_db"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_grava_todas_as_paginas(self, mock_get):
+        """Testa que todas as páginas são gravadas e os totais somam o período inteiro"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 3 + 7, tarefa_por_minuto)
+
+        resultado = TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['tasks_saved'], TASKS_PAGE_SIZE * 3 + 7)
+        self.assertEqual(resultado['data']['calculations']['faturamento_total'], 150.0 * (TASKS_PAGE_SIZE * 3 + 7))
+        self.assertEqual(Tarefa.query.count(), TASKS_PAGE_SIZE * 3 + 7)
+        # O bearer é o devolvido pela validação, não o lido do banco antes dela
+        self.assertEqual(
+            {c.kwargs['headers']['Authorization'] for c in mock_get.call_args_list}, {'Bearer validado'}
+        )
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_paginas_anteriores_ao_erro_ficam_gravadas(self, mock_get):
+        """Testa que o erro de uma página não desfaz as páginas já gravadas"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, tarefa_por_minuto, failing_page=4)
+
+        resultado = TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertFalse(resultado['success'])
+        self.assertEqual(resultado['message'], 'Erro inesperado: 500')
+        self.assertEqual(Tarefa.query.count(), TASKS_PAGE_SIZE * 3)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_checkpoint_da_ultima_pagina_gravada(self, mock_get):
+        """Testa que a falha deixa gravados a última página concluída e o totalItems"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, tarefa_por_minuto, failing_page=4)
+
+        TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        checkpoint = PaginacaoTarefas.query.one()
+        self.assertEqual(checkpoint.usuario_id, self.usuario_id)
+        self.assertEqual((checkpoint.data_inicial, checkpoint.data_final), ('2025-01-01', '2025-01-31'))
+        self.assertEqual(checkpoint.ultima_pagina, 3)
+        self.assertEqual(checkpoint.total_itens, TASKS_PAGE_SIZE * 5)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_nova_tentativa_continua_da_pagina_com_falha(self, mock_get):
+        """Testa que a nova tentativa busca só a partir da página que falhou"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, tarefa_por_minuto, failing_page=4)
+        TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        mock_get.reset_mock()
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, tarefa_por_minuto)
+        resultado = TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        paginas = sorted(int(re.search(r'Page=(\d+)', c.args[0]).group(1)) for c in mock_get.call_args_list)
+        self.assertEqual(paginas, [4, 5])
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['tasks_processed'], TASKS_PAGE_SIZE * 2)
+        # Os totais cobrem o período inteiro, inclusive as páginas da tentativa anterior
+        self.assertEqual(resultado['data']['calculations']['faturamento_total'], 150.0 * TASKS_PAGE_SIZE * 5)
+        self.assertEqual(Tarefa.query.count(), TASKS_PAGE_SIZE * 5)
+        self.assertEqual(PaginacaoTarefas.query.count(), 0)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_total_alterado_recomeca_da_primeira_pagina(self, mock_get):
+        """Testa que a paginação recomeça se o totalItems mudou desde o checkpoint"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, tarefa_por_minuto, failing_page=4)
+        TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        mock_get.reset_mock()
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5 + 1, tarefa_por_minuto)
+        resultado = TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-01-31')
+
+        paginas = sorted(int(re.search(r'Page=(\d+)', c.args[0]).group(1)) for c in mock_get.call_args_list)
+        self.assertEqual(paginas, [1, 2, 3, 4, 4, 5, 6])
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['tasks_processed'], TASKS_PAGE_SIZE * 5 + 1)
+        self.assertEqual(PaginacaoTarefas.query.count(), 0)
+
+    def verificar_memoria(self, mock_get, pequeno, grande):
+        """Compara o pico de memória da sincronização de `grande` tarefas com o de `pequeno` (10x menos)"""
+
+        def pico(total_items):
+            mock_get.side_effect = fake_tasks_api(total_items, tarefa_por_minuto)
+            gc.collect()
+            tracemalloc.start()
+            try:
+                resultado = TarefaController.fetch_and_process_tasks(self.usuario_id, '2025-01-01', '2025-12-31')
+                return tracemalloc.get_traced_memory()[1], resultado
+            finally:
+                tracemalloc.stop()
+
+        nivel = logging.getLogger().level
+        logging.getLogger().setLevel(logging.WARNING)
+        try:
+            pico_pequeno, _ = pico(pequeno)
+            pico_grande, resultado = pico(grande)
+        finally:
+            logging.getLogger().setLevel(nivel)
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['tasks_processed'], grande)
+        # Crescimento linear daria ~10x; o pico deve ficar no mesmo patamar
+        self.assertLess(pico_grande, 2 * pico_pequeno, (pico_pequeno, pico_grande))
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_memoria_limitada(self, mock_get):
+        """Testa que o pico de memória de 5 mil tarefas fica no patamar do de 500"""
+        self.verificar_memoria(mock_get, 500, 5000)
+
+    @lento
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_memoria_limitada_100_mil_tarefas(self, mock_get):
+        """Testa que o pico de memória de 100 mil tarefas fica no patamar do de 10 mil"""
+        self.verificar_memoria(mock_get, 10000, 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
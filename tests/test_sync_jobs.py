@@ -0,0 +1,146 @@
+"""
+Testes dos jobs de sincronização em segundo plano (SyncJobService)
+"""
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+import tempfile
+import threading
+import time
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Usuario
+from App.services.jobs import SyncJobService, ETAPAS
+
+
+def fake_catalogo(user_id):
+    """Substituto dos métodos de sincronização de cadastros"""
+    return {'success': True, 'message': 'ok', 'data': {'saved': 0, 'updated': 0, 'errors': 0}}
+
+
+def fake_catalogo_lento(user_id):
+    """Substituto que demora e registra a thread usada"""
+    fake_catalogo_lento.threads.add(threading.get_ident())
+    time.sleep(0.2)
+    return fake_catalogo(user_id)
+
+
+def fake_tarefas(user_id, start_date=None, end_date=None, incremental=True, progress_callback=None):
+    """Substituto da sincronização de tarefas que informa três páginas"""
+    for pagina in range(1, 4):
+        progress_callback(pagina, 3)
+    return {'success': True, 'message': 'Tarefas sincronizadas', 'data': {'tasks_processed': 250}}
+
+
+@patch('App.services.sincronizacao.TipoTarefaController.fetch_and_save_task_types', side_effect=fake_catalogo)
+@patch('App.services.sincronizacao.ColaboradorController.fetch_and_save_collaborators', side_effect=fake_catalogo)
+@patch('App.services.sincronizacao.ServicoController.fetch_and_save_services', side_effect=fake_catalogo)
+@patch('App.services.sincronizacao.ProdutoController.fetch_and_save_products', side_effect=fake_catalogo)
+class TestSyncJobs(unittest.TestCase):
+    """Testes para a fila de jobs e o endpoint /sync/jobs/<id>"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        # Banco em arquivo: cada thread tem sua própria conexão, como em produção
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(self.tmp_dir.name, "test.db")}'
+        })
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        usuario = Usuario(chave_app='key', token_api='token', token_bearer='bearer', token_obtido_em=datetime.now())
+        db.session.add(usuario)
+        db.session.commit()
+        self.usuario_id = usuario.id
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmp_dir.cleanup()
+
+    def login(self, user_id):
+        """Marca a sessão do cliente de teste como autenticada"""
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = user_id
+            sess['authenticated'] = True
+
+    @patch('App.services.sincronizacao.SincronizacaoService.sincronizar_tarefas', side_effect=fake_tarefas)
+    def test_job_registra_progresso_das_etapas(self, *mocks):
+        """Testa que o job conclui todas as etapas e informa as páginas de tarefas"""
+        job_id = SyncJobService.enfileirar(self.usuario_id, '2025-01-01', '2025-01-31')
+        job = SyncJobService.aguardar(job_id, timeout=10)
+
+        self.assertEqual(job['status'], 'concluido')
+        self.assertEqual(set(job['etapas']), set(ETAPAS))
+        self.assertTrue(all(etapa['status'] == 'concluido' for etapa in job['etapas'].values()))
+        self.assertEqual(job['etapas']['tarefas']['paginas_concluidas'], 3)
+        self.assertEqual(job['etapas']['tarefas']['paginas_total'], 3)
+
+    @patch('App.services.sincronizacao.SincronizacaoService.sincronizar_tarefas', side_effect=RuntimeError('falhou'))
+    def test_job_com_erro(self, *mocks):
+        """Testa que uma exceção na sincronização marca o job com erro"""
+        job = SyncJobService.aguardar(SyncJobService.enfileirar(self.usuario_id), timeout=10)
+
+        self.assertEqual(job['status'], 'erro')
+        self.assertIn('falhou', job['mensagem'])
+
+    @patch('App.services.sincronizacao.SincronizacaoService.sincronizar_tarefas', side_effect=fake_tarefas)
+    def test_endpoint_de_status(self, *mocks):
+        """Testa o endpoint de progresso para o dono do job e para outros usuários"""
+        job_id = SyncJobService.enfileirar(self.usuario_id)
+        SyncJobService.aguardar(job_id, timeout=10)
+
+        self.login(self.usuario_id)
+        response = self.client.get(f'/sync/jobs/{job_id}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['job']['status'], 'concluido')
+        self.assertEqual(response.get_json()['job']['etapas_concluidas'], len(ETAPAS))
+
+        self.login(self.usuario_id + 1)
+        self.assertEqual(self.client.get(f'/sync/jobs/{job_id}').status_code, 404)
+
+    @patch('App.services.sincronizacao.SincronizacaoService.sincronizar_tarefas', side_effect=fake_tarefas)
+    def test_cadastros_em_paralelo_com_tempos(self, mock_tarefas, mock_produtos, mock_servicos, mock_colaboradores, mock_tipos):
+        """Testa que os quatro cadastros rodam ao mesmo tempo e os tempos são informados"""
+        fake_catalogo_lento.threads = set()
+        for mock in (mock_produtos, mock_servicos, mock_colaboradores, mock_tipos):
+            mock.side_effect = fake_catalogo_lento
+
+        job = SyncJobService.aguardar(SyncJobService.enfileirar(self.usuario_id, '2025-02-01'), timeout=10)
+
+        self.assertEqual(job['status'], 'concluido')
+        self.assertEqual(len(fake_catalogo_lento.threads), 4)
+        self.assertLess(job['tempos']['catalogos'], 0.6)
+        self.assertGreaterEqual(job['etapas']['produtos']['duracao_s'], 0.2)
+        self.assertEqual(set(job['tempos']), set(ETAPAS) | {'catalogos', 'total'})
+
+    @patch('App.View.filtro.filtrar.AuthController.validate_token', return_value={'valid': True})
+    @patch('App.services.jobs.SyncJobService.enfileirar', return_value='job-1')
+    def test_consulta_responde_com_job(self, mock_enfileirar, *mocks):
+        """Testa que /filtros/consulta enfileira a sincronização e responde na hora"""
+        self.login(self.usuario_id)
+
+        response = self.client.post('/filtros/consulta', json={'data_inicial': '2025-01-01', 'data_final': '2025-01-31'})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.get_json()['job_id'], 'job-1')
+        self.assertEqual(response.get_json()['status_url'], '/sync/jobs/job-1')
+        mock_enfileirar.assert_called_once_with(
+            self.usuario_id, start_date='2025-01-01', end_date='2025-01-31', incremental=True
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Testes da paginação paralela de tarefas do TarefaController
+"""
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App.Controllers.tarefas import TarefaController, TASKS_PAGE_SIZE
+from tests.auxiliares import fake_tasks_api
+
+
+class TestTarefaPaginacao(unittest.TestCase):
+    """Testes para _fetch_all_tasks_from_api"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.access_token = 'test_bearer_token'
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_paginas_mantem_ordem(self, mock_get):
+        """Testa que as páginas buscadas em paralelo são reunidas em ordem"""
+        total_items = TASKS_PAGE_SIZE * 7 + 30
+        mock_get.side_effect = fake_tasks_api(total_items, atraso=True)
+
+        resultado = TarefaController._fetch_all_tasks_from_api(
+            self.access_token, '2025-01-01', '2025-01-31', max_workers=4
+        )
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual([t['taskID'] for t in resultado['data']], list(range(total_items)))
+        self.assertEqual(mock_get.call_count, 8)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_pagina_unica(self, mock_get):
+        """Testa que uma página incompleta encerra a paginação"""
+        mock_get.side_effect = fake_tasks_api(10, atraso=True)
+
+        resultado = TarefaController._fetch_all_tasks_from_api(
+            self.access_token, '2025-01-01', '2025-01-31', max_workers=4
+        )
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(len(resultado['data']), 10)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('App.Controllers.tarefas.AuvoApiService.get')
+    def test_erro_em_pagina_intermediaria(self, mock_get):
+        """Testa que o erro de uma página é propagado"""
+        mock_get.side_effect = fake_tasks_api(TASKS_PAGE_SIZE * 5, failing_page=3, atraso=True)
+
+        resultado = TarefaController._fetch_all_tasks_from_api(
+            self.access_token, '2025-01-01', '2025-01-31', max_workers=2
+        )
+
+        self.assertFalse(resultado['success'])
+        self.assertEqual(resultado['message'], 'Erro inesperado: 500')
+
+
+if __name__ == '__main__':
+    unittest.main()
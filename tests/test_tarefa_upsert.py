@@ -0,0 +1,224 @@
+"""
+Testes da gravação em lote de tarefas (_process_and_save_tasks)
+"""
+import unittest
+from functools import partial
+from sqlalchemy import event, text
+from sqlalchemy.dialects import sqlite, postgresql, mysql
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Produto, TipoTarefa, Tarefa, TarefaItem
+from App.Models.tipos import descomprimir_json
+from App.Controllers.tarefas import TarefaController, TASK_UPSERT_COLUMNS
+from tests import auxiliares
+from tests.auxiliares import criar_usuario
+
+# Dois cabos por tarefa: custo 20,00 e lucro 130,00
+make_task = partial(auxiliares.make_task, quantidade=2)
+
+
+class TestTarefaUpsert(unittest.TestCase):
+    """Testes para o processamento em lote de tarefas"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.usuario_id = criar_usuario()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_insere_tarefas_com_calculos(self):
+        """Testa a criação de tarefas com os valores calculados"""
+        resultado = TarefaController._process_and_save_tasks(
+            [make_task(1), make_task(2)], self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+
+        self.assertTrue(resultado['success'])
+        self.assertEqual(resultado['data']['tasks_saved'], 2)
+        self.assertEqual(resultado['data']['tasks_updated'], 0)
+
+        tarefa = db.session.get(Tarefa, 1)
+        self.assertEqual(tarefa.valor_total, 150.0)
+        self.assertEqual(tarefa.custo_total, 20.0)
+        self.assertEqual(tarefa.lucro_bruto, 130.0)
+        self.assertEqual((tarefa.valor_produtos, tarefa.valor_servicos), (50.0, 100.0))
+        self.assertEqual(tarefa.detalhes_json['calculos']['faturamento_servico'], 100.0)
+        self.assertEqual(resultado['data']['calculations']['lucro_total'], 260.0)
+
+    def test_valores_gravados_em_centavos(self):
+        """Testa que os valores em dinheiro ficam no banco como centavos inteiros"""
+        TarefaController._process_and_save_tasks(
+            [make_task(1, valor_produto=0.1, valor_servico=0.2)], self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+
+        linha = db.session.execute(
+            text('SELECT valor_total, custo_total, lucro_bruto FROM tarefa WHERE id = 1')
+        ).one()
+        self.assertEqual(tuple(linha), (30, 2000, -1970))
+        self.assertEqual(db.session.get(Tarefa, 1).valor_total, 0.3)
+
+    def test_custo_unitario_fracionario(self):
+        """Testa que o custo unitário guarda frações de centavo: 0,125 x 4 custa 0,50, não 0,52"""
+        db.session.add(Produto(id='prod-2', usuario_id=self.usuario_id, nome='Parafuso', custo_unitario=0.125))
+        db.session.commit()
+
+        TarefaController._process_and_save_tasks(
+            [make_task(1, produto='prod-2', quantidade=4, valor_produto=1.0)], self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+
+        custo = db.session.execute(text("SELECT custo_unitario FROM produto WHERE id = 'prod-2'")).scalar()
+        self.assertEqual(custo, 1250)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Produto, 'prod-2').custo_unitario, 0.125)
+        self.assertEqual(db.session.get(Tarefa, 1).custo_total, 0.5)
+        self.assertEqual(TarefaItem.query.filter_by(tarefa_id=1, tipo='produto').one().custo, 0.5)
+
+    def test_detalhes_comprimidos_em_tabela_propria(self):
+        """Testa que o JSON da tarefa fica comprimido em tarefa_detalhes e só é lido quando acessado"""
+        TarefaController._process_and_save_tasks([make_task(1)], self.usuario_id, '2025-01-01', '2025-01-31')
+        db.session.expire_all()
+
+        blob = db.session.execute(text('SELECT dados FROM tarefa_detalhes WHERE tarefa_id = 1')).scalar()
+        self.assertEqual(descomprimir_json(blob)['task_original']['taskID'], 1)
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            tarefa = db.session.get(Tarefa, 1)
+            self.assertFalse(any('tarefa_detalhes' in statement for statement in statements))
+            self.assertEqual(tarefa.detalhes_json['calculos']['lucro_total'], 130.0)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertTrue(any('tarefa_detalhes' in statement for statement in statements))
+
+    def test_atualiza_tarefas_existentes(self):
+        """Testa que uma segunda sincronização atualiza as tarefas"""
+        TarefaController._process_and_save_tasks([make_task(1)], self.usuario_id, '2025-01-01', '2025-01-31')
+
+        resultado = TarefaController._process_and_save_tasks(
+            [make_task(1, valor_servico=300.0), make_task(2)], self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+
+        self.assertEqual(resultado['data']['tasks_saved'], 1)
+        self.assertEqual(resultado['data']['tasks_updated'], 1)
+
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Tarefa, 1).valor_total, 350.0)
+        self.assertEqual(Tarefa.query.count(), 2)
+
+    def test_itens_da_tarefa(self):
+        """Testa que produtos e serviços viram linhas de tarefa_item, substituídas a cada sincronização"""
+        TarefaController._process_and_save_tasks([make_task(1)], self.usuario_id, '2025-01-01', '2025-01-31')
+
+        itens = {item.tipo: item for item in TarefaItem.query.filter_by(tarefa_id=1)}
+        self.assertEqual(set(itens), {'produto', 'servico'})
+        self.assertEqual(itens['produto'].item_id, 'prod-1')
+        self.assertEqual(itens['produto'].quantidade, 2)
+        self.assertEqual(itens['produto'].custo, 20.0)
+        self.assertEqual(itens['servico'].faturamento, 100.0)
+
+        tarefa = make_task(1)
+        tarefa['services'] = []
+        TarefaController._process_and_save_tasks([tarefa], self.usuario_id, '2025-01-01', '2025-01-31')
+
+        self.assertEqual([item.tipo for item in TarefaItem.query.filter_by(tarefa_id=1)], ['produto'])
+
+    def test_rebuild_task_items(self):
+        """Testa que os itens são recriados a partir da tarefa original em detalhes_json"""
+        TarefaController._process_and_save_tasks([make_task(1), make_task(2)], self.usuario_id, '2025-01-01', '2025-01-31')
+        TarefaItem.query.delete()
+        db.session.commit()
+
+        self.assertEqual(TarefaController.rebuild_task_items(self.usuario_id), 2)
+        db.session.commit()
+
+        self.assertEqual(TarefaItem.query.count(), 4)
+
+    def test_backfill_task_totals(self):
+        """Testa que faturamento de produtos e serviços é preenchido a partir dos cálculos em JSON"""
+        TarefaController._process_and_save_tasks([make_task(1), make_task(2)], self.usuario_id, '2025-01-01', '2025-01-31')
+        db.session.execute(text('UPDATE tarefa SET valor_produtos = 0, valor_servicos = 0'))
+        db.session.commit()
+
+        self.assertEqual(TarefaController.backfill_task_totals(self.usuario_id), 2)
+        db.session.commit()
+        db.session.expire_all()
+
+        tarefa = db.session.get(Tarefa, 2)
+        self.assertEqual((tarefa.valor_produtos, tarefa.valor_servicos), (50.0, 100.0))
+
+    def test_colaborador_e_tipo_desconhecidos(self):
+        """Testa que colaborador desconhecido é ignorado e tipo desconhecido vira o padrão"""
+        resultado = TarefaController._process_and_save_tasks(
+            [make_task(1, colaborador=99), make_task(2, tipo=42)], self.usuario_id, '2025-01-01', '2025-01-31'
+        )
+
+        self.assertEqual(resultado['data']['tasks_saved'], 1)
+        self.assertEqual(resultado['data']['tasks_errors'], 1)
+        self.assertEqual(db.session.get(Tarefa, 2).tipo_tarefa_id, 0)
+        self.assertIsNotNone(TipoTarefa.query.filter_by(id=0, usuario_id=self.usuario_id).first())
+
+    def test_numero_de_consultas_constante(self):
+        """Testa que a quantidade de SQL não cresce com o número de tarefas"""
+
+        def count_statements(tasks):
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+            try:
+                TarefaController._process_and_save_tasks(tasks, self.usuario_id, '2025-01-01', '2025-01-31')
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+            return len(statements)
+
+        poucas = count_statements([make_task(i) for i in range(1, 11)])
+        muitas = count_statements([make_task(i) for i in range(1001, 1301)])
+
+        self.assertEqual(poucas, muitas)
+
+    def test_upsert_por_dialeto(self):
+        """Testa o upsert de SQLite, PostgreSQL e MySQL, sempre sem sobrescrever tarefa de outro usuário"""
+        for dialeto, modulo in (('sqlite', sqlite), ('postgresql', postgresql), ('mysql', mysql)):
+            stmt = TarefaController._upsert(
+                Tarefa.__table__, Tarefa.id, TASK_UPSERT_COLUMNS, where=(Tarefa.usuario_id == 7), dialect=dialeto
+            )
+            sql = str(stmt.compile(dialect=modulo.dialect()))
+
+            if dialeto == 'mysql':
+                self.assertIn('ON DUPLICATE KEY UPDATE', sql)
+                # Sem WHERE no MySQL: cada coluna mantém o valor atual se a tarefa for de outro usuário
+                for column in TASK_UPSERT_COLUMNS:
+                    self.assertIn(f'{column} = CASE WHEN (tarefa.usuario_id = ', sql)
+            else:
+                self.assertIn('ON CONFLICT (id) DO UPDATE', sql)
+                self.assertIn('WHERE tarefa.usuario_id = ', sql)
+
+        with self.assertRaises(NotImplementedError):
+            TarefaController._upsert(Tarefa.__table__, Tarefa.id, TASK_UPSERT_COLUMNS, dialect='mssql')
+
+
+if __name__ == '__main__':
+    unittest.main()
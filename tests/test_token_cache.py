@@ -0,0 +1,159 @@
+"""
+Testes do cache de tokens bearer (TokenCacheService) usado por AuthController.validate_token
+"""
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta
+from sqlalchemy import event
+import tempfile
+import threading
+import time
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from App import create_app, db
+from App.Models import Usuario
+from App.Controllers.auth_api import AuthController
+from App.services.token_cache import TokenCacheService
+from App.services.api_service import AuvoApiService
+from App.services.sincronizacao import SincronizacaoService
+
+
+def fake_login(*args, **kwargs):
+    """Substituto do GET de login da Auvo: demora um pouco e devolve um token novo"""
+    fake_login.chamadas += 1
+    time.sleep(0.2)
+    resposta = MagicMock(status_code=200)
+    resposta.json.return_value = {'result': {
+        'authenticated': True, 'accessToken': f'novo-{fake_login.chamadas}',
+        'expiration': None, 'created': None
+    }}
+    return resposta
+
+
+class TestTokenCache(unittest.TestCase):
+    """Testes para o cache em memória, a renovação antecipada e o single-flight"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        # Banco em arquivo: a renovação em segundo plano usa outra conexão
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(self.tmp_dir.name, "test.db")}'
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        fake_login.chamadas = 0
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.app_context.pop()
+        self.tmp_dir.cleanup()
+
+    def criar_usuario(self, idade_minutos):
+        """Cria o usuário com um token obtido há idade_minutos"""
+        usuario = Usuario(
+            chave_app='key', token_api='token', token_bearer='antigo',
+            token_obtido_em=datetime.now() - timedelta(minutes=idade_minutos)
+        )
+        db.session.add(usuario)
+        db.session.commit()
+        return usuario
+
+    def test_token_valido_sem_consultar_o_banco(self):
+        """Testa que, depois da primeira leitura, o token válido sai da memória"""
+        self.criar_usuario(idade_minutos=1)
+        self.assertEqual(AuthController.validate_token('key')['access_token'], 'antigo')
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            for _ in range(5):
+                self.assertTrue(AuthController.validate_token('key')['valid'])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+        self.assertEqual(statements, [])
+        self.assertFalse(AuthController.validate_token('outra-chave')['valid'])
+
+    @patch('App.Controllers.auth_api.AuvoApiService.get', side_effect=fake_login)
+    def test_token_expirado_e_renovado(self, mock_get):
+        """Testa que um token vencido é renovado em vez de falhar com 'Token expirado'"""
+        usuario = self.criar_usuario(idade_minutos=40)
+
+        resultado = AuthController.validate_token('key')
+
+        self.assertTrue(resultado['valid'])
+        self.assertEqual(resultado['access_token'], 'novo-1')
+        self.assertEqual(db.session.get(Usuario, usuario.id).token_bearer, 'novo-1')
+
+    @patch('App.Controllers.auth_api.AuvoApiService.get', side_effect=fake_login)
+    def test_renovacao_antecipada_em_segundo_plano(self, mock_get):
+        """Testa que o token perto de expirar é servido e renovado em segundo plano"""
+        self.criar_usuario(idade_minutos=27)
+
+        self.assertEqual(AuthController.validate_token('key')['access_token'], 'antigo')
+        TokenCacheService._get_executor().submit(lambda: None).result(timeout=5)
+
+        self.assertEqual(fake_login.chamadas, 1)
+        self.assertEqual(AuthController.validate_token('key')['access_token'], 'novo-1')
+
+    @patch('App.Controllers.auth_api.AuvoApiService.get', side_effect=fake_login)
+    def test_single_flight(self, mock_get):
+        """Testa que requisições simultâneas com o token vencido fazem um único login"""
+        self.criar_usuario(idade_minutos=40)
+        tokens = []
+
+        def validar():
+            with self.app.app_context():
+                tokens.append(AuthController.validate_token('key').get('access_token'))
+
+        threads = [threading.Thread(target=validar) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(fake_login.chamadas, 1)
+        self.assertEqual(tokens, ['novo-1'] * 5)
+
+    def test_sincronizacao_paralela_com_token_vencido(self):
+        """Testa que todos os cadastros sincronizados em paralelo usam o token renovado"""
+        self.criar_usuario(idade_minutos=120)
+        headers = {}
+
+        def fake_get(url, headers=None, timeout=None):
+            if 'login/' in url:
+                return fake_login()
+            endpoint = url.split('/v2/')[1].split('?')[0].rstrip('/')
+            fake_get.headers.setdefault(endpoint, set()).add(headers['Authorization'])
+            resposta = MagicMock(status_code=200)
+            resposta.json.return_value = {'result': {'entityList': [], 'pagedSearchReturnData': {'totalItems': 0}}}
+            return resposta
+
+        fake_get.headers = headers
+
+        with patch.object(AuvoApiService, 'get', side_effect=fake_get):
+            SincronizacaoService.sincronizar_tudo(
+                Usuario.query.first().id, '2025-01-01', '2025-01-31', incremental=False
+            )
+
+        self.assertEqual(fake_login.chamadas, 1)
+        self.assertEqual(set(headers), {'products', 'users', 'taskTypes', 'services', 'Tasks'})
+        for endpoint, enviados in headers.items():
+            self.assertEqual(enviados, {'Bearer novo-1'}, endpoint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,8 +17,10 @@ class TestDashboardController(unittest.TestCase):
     
     def setUp(self):
         """Configuração inicial para cada teste"""
-        self.app = create_app()
-        self.app.config['TESTING'] = True
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
         self.client = self.app.test_client()
         
         # Mock do usuário autenticado
@@ -269,8 +271,10 @@ class TestHomeController(unittest.TestCase):
     
     def setUp(self):
         """Configuração inicial para cada teste"""
-        self.app = create_app()
-        self.app.config['TESTING'] = True
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
         self.client = self.app.test_client()
     
     def test_home_route(self):
@@ -359,8 +363,10 @@ class TestViewIntegration(unittest.TestCase):
     
     def setUp(self):
         """Configuração inicial para testes de integração"""
-        self.app = create_app()
-        self.app.config['TESTING'] = True
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
         self.client = self.app.test_client()
     
     @patch('App.View.login.logar_user.AuthController')
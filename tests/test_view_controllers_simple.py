@@ -17,8 +17,10 @@ class TestDashboardControllerSimple(unittest.TestCase):
     
     def setUp(self):
         """Configuração inicial para cada teste"""
-        self.app = create_app()
-        self.app.config['TESTING'] = True
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'
+        })
         self.client = self.app.test_client()
         self.mock_user_id = 1
         